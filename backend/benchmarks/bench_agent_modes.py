@@ -0,0 +1,132 @@
+"""
+    end to end cost of a question in the two agent modes (LEDGER_AGENT_MODE):
+        two_agent -> AssetManager -> ask_db_manager -> DBManager loop -> DB tools
+        single    -> AssetManager -> DB tools
+
+    every question of a fixed set is run --repeat times per mode against the real DB and the real model,
+    reported per mode: latency (mean / p50 / p95), LLM calls, input / output tokens per question and failures.
+    the fast path and the answer / tool caches are switched off so every run really pays for the agents.
+
+    needs a working CEREBRAS_API_KEY (+ the other keys of core/config.py), the calls count against its rate limit
+
+    usage:
+        python -m backend.benchmarks.bench_agent_modes --repeat 3
+        python -m backend.benchmarks.bench_agent_modes --modes single --questions "what's my most expensive asset?"
+"""
+import argparse
+import statistics
+import threading
+import time
+import uuid
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from backend.src.core.settings import SETTINGS
+
+# measure the agents, not the shortcuts in front of them (set before anything builds the caches)
+SETTINGS.update({"LEDGER_FAST_PATH": False, "LEDGER_ANSWER_CACHE_SIZE": 0, "LEDGER_TOOL_CACHE_SIZE": 0})
+
+from backend.src.agents.asset_manager import AGENT_MODES, AssetManager
+from backend.src.agents.rate_limiter import llm_priority
+
+
+QUESTIONS = [
+    "What's my most expensive asset?",
+    "How much are all my assets worth?",
+    "How many electronics do I have?",
+    "What's the average value of my furniture?",
+    "How much is my MacBook worth?",
+    "Which of my assets are retired?",
+    "List my assets in the Electronics category with their values",
+    "What's my cheapest asset and what category is it in?",
+]
+
+
+class LLMCallCounter(BaseCallbackHandler):
+
+    "counts the model calls and the tokens of everything running under it (nested DBManager runs included)"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = self.input_tokens = self.output_tokens = 0
+
+    def on_llm_end(self, response, **kwargs):
+        usage = {}
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or usage
+
+        if not usage:
+            # older providers only fill llm_output
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            usage = {"input_tokens": token_usage.get("prompt_tokens", 0), "output_tokens": token_usage.get("completion_tokens", 0)}
+
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += usage.get("input_tokens", 0)
+            self.output_tokens += usage.get("output_tokens", 0)
+
+
+def _ask(manager, question):
+    "(seconds, llm calls, input tokens, output tokens, ok) of one stateless question"
+
+    counter = LLMCallCounter()
+    thread_id = str(uuid.uuid4())
+    config = {"configurable": {"thread_id": thread_id}, "callbacks": [counter]}
+
+    start = time.perf_counter()
+    try:
+        result = manager.agent.invoke({"messages": [{"role": "user", "content": question}]}, config=config)
+        ok = bool(result and result.get("messages") and result["messages"][-1].content)
+    except Exception as e:
+        print(f"  failed: {question!r}: {e}")
+        ok = False
+    finally:
+        manager.agent.checkpointer.delete_thread(thread_id)
+
+    return time.perf_counter() - start, counter.calls, counter.input_tokens, counter.output_tokens, ok
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run_mode(mode, questions, repeat):
+    manager = AssetManager(mode=mode)
+    runs = []
+
+    for _ in range(repeat):
+        for question in questions:
+            runs.append(_ask(manager, question))
+
+    latencies = [run[0] for run in runs]
+    return {
+        "mode": mode,
+        "questions": len(runs),
+        "mean_s": statistics.mean(latencies),
+        "p50_s": _percentile(latencies, 50),
+        "p95_s": _percentile(latencies, 95),
+        "llm_calls": statistics.mean(run[1] for run in runs),
+        "input_tokens": statistics.mean(run[2] for run in runs),
+        "output_tokens": statistics.mean(run[3] for run in runs),
+        "failures": sum(1 for run in runs if not run[4]),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=AGENT_MODES, default=list(AGENT_MODES))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--questions", nargs="+", default=QUESTIONS)
+    args = parser.parse_args()
+
+    # background priority, a benchmark never gets ahead of real users sharing the same LLM budget
+    with llm_priority("background"):
+        results = [run_mode(mode, args.questions, args.repeat) for mode in args.modes]
+
+    print(f"{'mode':<10} {'questions':>9} {'mean s':>8} {'p50 s':>8} {'p95 s':>8} {'llm calls':>10} {'in tok':>9} {'out tok':>9} {'failed':>7}")
+    for r in results:
+        print(f"{r['mode']:<10} {r['questions']:>9} {r['mean_s']:>8.2f} {r['p50_s']:>8.2f} {r['p95_s']:>8.2f} "
+              f"{r['llm_calls']:>10.1f} {r['input_tokens']:>9.0f} {r['output_tokens']:>9.0f} {r['failures']:>7}")
+    print("(llm calls / tokens are per question)")
@@ -0,0 +1,270 @@
+"""
+    offline load test of the agent pipeline, the LLM is the scripted stand-in (agents/fake_llm.py)
+
+    the whole app (backend/main.py: middlewares, routes, agents, tools, checkpointer, rate limiter) serves
+    --requests questions on /agent/query (in process through httpx ASGITransport) and on /ws/chat (one
+    socket per worker through the Starlette test client) with --concurrency callers at a time, every model
+    call costs --latency seconds and nothing ever leaves the box, so what's measured is OUR overhead.
+    reported per endpoint: throughput, p50 / p99 latency, failures, and where the time of a question goes:
+        graph build      -> compiling both agent graphs, cold (first AssetManager / DBManager) vs warm
+        model            -> the fake model calls (~ --latency each) incl. the rate limiter
+        db tools         -> the DB tools (query + result serialization + tool cache)
+        orchestration    -> everything else: graph steps, checkpointer, routing, HTTP / socket serialization
+    the fast path, the answer cache and the coalescing are off, every question runs the agents for real.
+
+    usage:
+        python -m backend.benchmarks.bench_agent_offline --requests 200 --concurrency 8 --latency 0.05
+        python -m backend.benchmarks.bench_agent_offline --mode single --latency 0 --endpoints query
+"""
+import argparse
+import asyncio
+import atexit
+import contextvars
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from backend.src.core.settings import SETTINGS
+
+_TMP = tempfile.mkdtemp(prefix="ledger-bench-")
+atexit.register(shutil.rmtree, _TMP, ignore_errors=True)
+
+# the fake model, no shortcut in front of the agents, a limiter that never throttles (its cost still counts)
+# and the sessions / limiter / logs in a scratch dir so the real ones stay untouched
+SETTINGS.update({
+    "LEDGER_AGENTS": True,
+    "LEDGER_LLM_PROVIDER": "fake",
+    "LEDGER_FAST_PATH": False,
+    "LEDGER_ANSWER_CACHE_SIZE": 0,
+    "LEDGER_COALESCE_QUERIES": False,
+    "LEDGER_LLM_RPM": 1e9,
+    "LEDGER_LLM_BURST": 1e9,
+    "LEDGER_LLM_MAX_QUEUE": 1_000_000,
+    "LEDGER_LLM_LIMITER_PATH": os.path.join(_TMP, "llm_limiter.db"),
+    "LEDGER_CHAT_MEMORY_PATH": os.path.join(_TMP, "checkpoints.db"),
+    "LEDGER_LOG_FILE": os.path.join(_TMP, "ledger.log"),
+})
+
+import httpx
+from fastapi.testclient import TestClient
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from backend.main import app
+from backend.src.agents import registry
+from backend.src.agents.asset_manager import AGENT_MODES, AssetManager
+from backend.src.agents.db_manager import DBManager
+from backend.src.clients import get_asset_manager_client, get_nvidia_client
+from backend.src.core.database import init_db
+
+
+QUESTIONS = [
+    "What's my most expensive asset?",
+    "How much are all my assets worth in total?",
+    "How many assets do I have?",
+    "What's the average value of my assets?",
+    "How much is my MacBook worth?",
+    "What's my cheapest asset?",
+    "List every asset I have",
+    "Hello there",
+]
+
+# the DB tools, ask_db_manager is only the wrapper around a whole DBManager run
+DB_TOOLS = {"search_assets_by_name_or_category", "get_all_assets", "get_asset_value_statistics"}
+
+
+class StageTimer(BaseCallbackHandler):
+
+    "total seconds spent in model calls / DB tools, over every run of the process (nested ones included)"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._starts = {}
+        self.model = self.tools = 0.0
+
+    def _start(self, run_id):
+        with self._lock:
+            self._starts[run_id] = time.perf_counter()
+
+    def _stop(self, run_id, stage):
+        with self._lock:
+            start = self._starts.pop(run_id, None)
+            if start is not None:
+                setattr(self, stage, getattr(self, stage) + time.perf_counter() - start)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start(run_id)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._stop(run_id, "model")
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._stop(run_id, "model")
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        if (serialized or {}).get("name") in DB_TOOLS or kwargs.get("name") in DB_TOOLS:
+            self._start(run_id)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._stop(run_id, "tools")
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._stop(run_id, "tools")
+
+    def reset(self):
+        with self._lock:
+            self._starts.clear()
+            self.model = self.tools = 0.0
+
+
+STAGES = StageTimer()
+
+# a context var whose default is the timer -> every run of every thread / task gets it as a callback
+_stage_timer = contextvars.ContextVar("ledger_bench_stage_timer", default=STAGES)
+register_configure_hook(_stage_timer, inheritable=True)
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def graph_build():
+    "(cold, warm) seconds to get both agents ready"
+
+    registry.clear_compiled_agents()
+
+    start = time.perf_counter()
+    AssetManager(), DBManager()
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    AssetManager(), DBManager()
+    return cold, time.perf_counter() - start
+
+
+async def _query_load(questions, concurrency):
+    latencies, failures = [], 0
+    pending = list(reversed(questions))
+
+    async def worker(client):
+        nonlocal failures
+        while pending:
+            question = pending.pop()
+            start = time.perf_counter()
+            try:
+                response = await client.post("/agent/query", json={"question": question})
+                ok = response.status_code == 200 and bool(response.json())
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            failures += not ok
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+
+    return latencies, failures
+
+
+def query_load(questions, concurrency):
+    return asyncio.run(_query_load(questions, concurrency))
+
+
+def ws_load(questions, concurrency):
+    latencies, failures = [], 0
+    pending = list(reversed(questions))
+    lock = threading.Lock()
+
+    def worker(client):
+        nonlocal failures
+        with client.websocket_connect("/ws/chat") as socket:
+            while True:
+                with lock:
+                    if not pending:
+                        return
+                    question = pending.pop()
+
+                start = time.perf_counter()
+                socket.send_text(question)
+                while True:
+                    event = socket.receive_json()
+                    if event["type"] == "answer":
+                        break
+                elapsed = time.perf_counter() - start
+
+                with lock:
+                    latencies.append(elapsed)
+                    failures += not event.get("answer")
+
+    with TestClient(app) as client:
+        threads = [threading.Thread(target=worker, args=(client,)) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return latencies, failures
+
+
+ENDPOINTS = {"query": ("/agent/query", query_load), "ws": ("/ws/chat", ws_load)}
+
+
+def run(endpoint, questions, concurrency):
+    STAGES.reset()
+    path, load = ENDPOINTS[endpoint]
+
+    start = time.perf_counter()
+    latencies, failures = load(questions, concurrency)
+    wall = time.perf_counter() - start
+
+    total = sum(latencies)
+    n = len(latencies)
+    return {
+        "endpoint": path,
+        "requests": n,
+        "req_s": n / wall,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "failures": failures,
+        # per question, the stages overlap between concurrent questions but not inside one
+        "model_ms": STAGES.model / n * 1000,
+        "tools_ms": STAGES.tools / n * 1000,
+        "orchestration_ms": max(0.0, total - STAGES.model - STAGES.tools) / n * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds every fake model call takes")
+    parser.add_argument("--mode", choices=AGENT_MODES, default=SETTINGS['LEDGER_AGENT_MODE'])
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--questions", nargs="+", default=QUESTIONS)
+    args = parser.parse_args()
+
+    SETTINGS['LEDGER_AGENT_MODE'] = args.mode
+    # what the app's lifespan does, httpx's ASGITransport never runs it
+    init_db()
+    # the clients are process singletons, the latency can still be changed on them
+    for client in (get_nvidia_client(), get_asset_manager_client()):
+        client.latency = args.latency
+
+    cold, warm = graph_build()
+    questions = [args.questions[i % len(args.questions)] for i in range(args.requests)]
+
+    # a few untimed questions so the first measured ones don't pay for the lazy imports / first connections
+    query_load(args.questions, 1)
+
+    results = [run(endpoint, questions, args.concurrency) for endpoint in args.endpoints]
+
+    print(f"\nmode {args.mode}, {args.requests} questions per endpoint, {args.concurrency} concurrent, fake model latency {args.latency * 1000:.0f} ms")
+    print(f"graph build: {cold * 1000:.1f} ms cold, {warm * 1000:.2f} ms warm\n")
+    print(f"{'endpoint':<14} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'failed':>7} {'model ms':>9} {'db tools ms':>12} {'orchestration ms':>17}")
+    for r in results:
+        print(f"{r['endpoint']:<14} {r['req_s']:>8.1f} {r['p50_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['failures']:>7} "
+              f"{r['model_ms']:>9.1f} {r['tools_ms']:>12.1f} {r['orchestration_ms']:>17.1f}")
+    print("(model / db tools / orchestration are per question)")
@@ -0,0 +1,72 @@
+"""
+    per-request orchestration overhead of getting an AssetManager + DBManager ready to run,
+    before (compile both graphs on every request) vs after (shared compiled graphs from the registry)
+
+    no LLM call is made here, we only measure the python / graph compilation side so dummy keys are fine
+
+    usage:
+        python -m backend.benchmarks.bench_agent_registry --iterations 200
+"""
+import argparse
+import os
+import time
+
+# the agents import the clients which need the keys to exist (they're never used here)
+for var in ("CEREBRAS_API_KEY", "LANGSMITH_API_KEY", "LANGSMITH_PROJECT"):
+    os.environ.setdefault(var, "benchmark")
+os.environ.setdefault("LANGSMITH_TRACING", "false")
+
+from langchain.agents import create_agent
+from langgraph.checkpoint.memory import InMemorySaver
+
+from backend.src.agents.asset_manager import AssetManager
+from backend.src.agents.db_manager import DBManager
+from backend.src.agents.registry import clear_compiled_agents
+
+
+def _before():
+    # what every request used to pay: two fresh create_agent() compilations
+    for manager in (AssetManager, DBManager):
+        create_agent(
+            model=manager_llm[manager],
+            system_prompt=manager_prompt[manager],
+            tools=manager_tools[manager],
+            middleware=manager_middleware[manager],
+            checkpointer=InMemorySaver() if manager is AssetManager else None
+        )
+
+
+def _after():
+    AssetManager()
+    DBManager()
+
+
+def _time(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    asset_manager, db_manager = AssetManager(), DBManager()
+    manager_llm = {AssetManager: asset_manager.llm, DBManager: db_manager.llm}
+    manager_prompt = {AssetManager: asset_manager.sys_prompt, DBManager: db_manager.sys_prompt}
+    manager_tools = {AssetManager: asset_manager.tools, DBManager: db_manager.tools}
+    manager_middleware = {AssetManager: asset_manager.mem_limit, DBManager: []}
+
+    clear_compiled_agents()
+    cold = _time(_after, 1)
+
+    before = _time(_before, args.iterations)
+    after = _time(_after, args.iterations)
+
+    print(f"iterations                     : {args.iterations}")
+    print(f"before (compile per request)   : {before:8.3f} ms / request")
+    print(f"after  (first, cold registry)  : {cold:8.3f} ms")
+    print(f"after  (shared compiled graphs): {after:8.3f} ms / request")
+    print(f"speedup                        : {before / after:8.1f}x")
@@ -0,0 +1,105 @@
+"""
+    rows/s of the asset list responses, ORM + AssetResponse path vs the column tuples + orjson one (LEDGER_FAST_JSON)
+
+    on a synthetic DB of --rows assets, for every --sizes page size, both paths are timed --repeat times:
+        service + encode -> the AssetService read and the JSON bytes, no HTTP (what the agent tools pay too)
+        route /assets/   -> GET /assets/?limit=N through FastAPI in process (httpx ASGITransport)
+        route /page      -> GET /assets/page?limit=N, same
+    the old path is the ORM query, an AssetResponse per row and FastAPI's response_model serialization,
+    the new one selects the columns as tuples and encodes them straight to bytes into a raw Response.
+    reported per case: median ms and rows/s of each path and the speedup.
+
+    usage:
+        python -m backend.benchmarks.bench_asset_json --rows 10000 --sizes 100 1000 5000
+        python -m backend.benchmarks.bench_asset_json --db /tmp/assets_1m.db --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+from unittest.mock import patch
+
+import httpx
+
+from backend.benchmarks.bench_service import QUIET_LOGGER , Fixture , _app , _atimed , _timed
+from backend.benchmarks.synthetic import build_db
+from backend.src.core.settings import SETTINGS
+from backend.src.schemas.asset import AssetResponse
+from backend.src.services import asset_json
+from backend.src.services.assets_service import AssetService
+
+
+def _encode_old(fx: Fixture, size):
+    with fx.read_sessions() as db:
+        assets, _ = AssetService(db, QUIET_LOGGER).get_all_assets(0, size)
+        return json.dumps([AssetResponse.model_validate(asset).model_dump(mode="json") for asset in assets]).encode()
+
+
+def _encode_new(fx: Fixture, size):
+    with fx.read_sessions() as db:
+        rows, _ = AssetService(db, QUIET_LOGGER).get_all_assets(0, size, as_rows=True)
+        return asset_json.dumps(asset_json.as_dicts(rows))
+
+
+def _median_ms(timings):
+    return statistics.median(timings) * 1000
+
+
+def run(fx: Fixture, sizes, repeat, warmup):
+    results = []
+
+    async def route(client, url, fast):
+        with patch.dict(SETTINGS, {"LEDGER_FAST_JSON": fast}):
+            async def call(i):
+                response = await client.get(url)
+                if response.status_code != 200:
+                    raise RuntimeError(f"GET {url} -> {response.status_code} {response.text[:200]}")
+            return await _atimed(call, repeat, warmup)
+
+    async def routes(size):
+        transport = httpx.ASGITransport(app=_app(fx))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, url in [("route /assets/", f"/assets/?limit={size}"), ("route /page", f"/assets/page?limit={size}")]:
+                # the page route caps limit at 1000
+                if name == "route /page" and size > 1000:
+                    continue
+                old = await route(client, url, False)
+                new = await route(client, url, True)
+                results.append((name, size, _median_ms(old), _median_ms(new)))
+
+    for size in sizes:
+        old = _timed(lambda i: _encode_old(fx, size), repeat, warmup)
+        new = _timed(lambda i: _encode_new(fx, size), repeat, warmup)
+        results.append(("service + encode", size, _median_ms(old), _median_ms(new)))
+
+        asyncio.run(routes(size))
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="size of the synthetic DB (ignored with --db)")
+    parser.add_argument("--db", help="run on this already built DB (python -m backend.benchmarks.synthetic)")
+    parser.add_argument("--profile", choices=["default", "wal"], help="SQLite profile (defaults to LEDGER_SQLITE_PROFILE)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db
+        if path is None:
+            path = os.path.join(tmp, "bench.db")
+            print(f"building a synthetic DB of {args.rows:,} assets...")
+            build_db(path, args.rows).dispose()
+
+        fx = Fixture(path, args.profile)
+        results = run(fx, args.sizes, args.repeat, args.warmup)
+
+    print(f"\n{fx.rows:,} assets, {args.repeat} runs per case, encoder: {'orjson' if asset_json.orjson else 'stdlib json'}\n")
+    print(f"{'case':<20}{'rows':>7}{'old ms':>10}{'old rows/s':>13}{'new ms':>10}{'new rows/s':>13}{'speedup':>9}")
+    for name, size, old, new in results:
+        print(f"{name:<20}{size:>7,}{old:>10.2f}{size / old * 1000:>13,.0f}{new:>10.2f}{size / new * 1000:>13,.0f}{old / new:>8.1f}x")
@@ -0,0 +1,332 @@
+"""
+    microbenchmarks of the service layer and of the /assets routes, with regression gates
+
+    a synthetic DB of --rows assets is built (benchmarks/synthetic.py, or --db to reuse one built before),
+    then every AssetService method is timed on its own (reads, searches, stats, writes, bulk / export) and
+    every /assets route goes through the whole FastAPI stack in process (httpx ASGITransport, no socket),
+    --repeat times each after --warmup untimed runs. reported per case: median, p95 and ops/s.
+
+    baselines are per row count in benchmarks/baselines/service_<rows>.json (--save-baseline writes it),
+    a case whose median gets more than --threshold slower than its baseline (and at least --min-delta-ms,
+    sub-millisecond cases jitter too much otherwise) is a regression and the run exits with 1.
+    the baselines are machine specific, save your own before comparing on another box.
+
+    usage:
+        python -m backend.benchmarks.bench_service --rows 10000 --save-baseline
+        python -m backend.benchmarks.bench_service --rows 10000 --threshold 0.2
+        python -m backend.benchmarks.bench_service --db /tmp/assets_1m.db --filter route
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from itertools import islice
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import func , select
+from sqlalchemy.orm import sessionmaker
+
+from backend.benchmarks.synthetic import build_db , generate_rows
+from backend.src.api.v1 import assets
+from backend.src.core.database import get_db , get_engine , get_read_db , _profile
+from backend.src.models.asset import Asset
+from backend.src.schemas.asset import AssetCreate , AssetUpdate
+from backend.src.services.assets_service import AssetService
+from backend.src.services.cache import LRUCache
+from backend.src.services.pagination import CURSOR_COLUMN , PAGE_ORDER , encode_cursor
+
+
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# the service logs every call, measure the queries not the log handlers
+QUIET_LOGGER = logging.getLogger("ledger.bench")
+QUIET_LOGGER.setLevel(logging.CRITICAL)
+
+
+def _timed(fn, repeat, warmup):
+    for i in range(warmup):
+        fn(i)
+
+    timings = []
+    for i in range(warmup, warmup + repeat):
+        start = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def _atimed(fn, repeat, warmup):
+    for i in range(warmup):
+        await fn(i)
+
+    timings = []
+    for i in range(warmup, warmup + repeat):
+        start = time.perf_counter()
+        await fn(i)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _checked(result):
+    "a benchmark of an error path is worthless, fail loud"
+    value, error = result
+    if error:
+        raise RuntimeError(error)
+    return value
+
+
+class Fixture:
+
+    "the DB under test + a few handles the cases pick their arguments from"
+
+    def __init__(self, path, profile):
+        self.path = path
+        writer = get_engine(path=path, profile=profile)
+        reader = get_engine(read_only=True, path=path, profile=profile) if _profile(profile) == "wal" else writer
+
+        self.sessions = sessionmaker(autocommit=False, autoflush=False, bind=writer)
+        self.read_sessions = sessionmaker(autocommit=False, autoflush=False, bind=reader)
+
+        with self.read_sessions() as db:
+            self.rows = db.scalar(select(func.count()).select_from(Asset))
+            # a deterministic spread of ids to read / write
+            self.ids = list(db.scalars(select(Asset.id).order_by(Asset.id).limit(1000)))
+            middle = db.execute(select(Asset.id, CURSOR_COLUMN).order_by(*PAGE_ORDER).offset(self.rows // 2).limit(1)).first()
+            self.deep_cursor = encode_cursor(middle[1], middle[0])
+            self.category = db.scalar(select(Asset.category).limit(1))
+
+        # ids created by the write cases, updated / deleted by the following ones
+        self.created = []
+        self.cache = LRUCache(max_size=len(self.ids))
+
+    def id(self, i):
+        return self.ids[i % len(self.ids)]
+
+    def read(self, method, *args, cache=None, **kwargs):
+        with self.read_sessions() as db:
+            return _checked(getattr(AssetService(db, QUIET_LOGGER, cache), method)(*args, **kwargs))
+
+    def write(self, method, *args, **kwargs):
+        with self.sessions() as db:
+            return _checked(getattr(AssetService(db, QUIET_LOGGER), method)(*args, **kwargs))
+
+
+def service_cases(fx: Fixture):
+    "(name, fn(i)) for every AssetService method, the write cases run in order (create -> update -> delete)"
+
+    new_asset = AssetCreate(name="Bench Laptop X1", category="Electronics", value=1234.5, quantity=1, status="Active")
+    # generated once, only the ids change per run so the timing is the insert and not the generator
+    template = list(generate_rows(1000, seed=10_000))
+    bulk_rows = lambda i: [{**row, "id": f"bench-{i}-{n}"} for n, row in enumerate(template)]
+
+    def export(i):
+        with fx.read_sessions() as db:
+            for _ in islice(AssetService(db, QUIET_LOGGER).iter_asset_rows(batch_size=1000), 10):
+                pass
+
+    def create(i):
+        fx.created.append(fx.write("create_asset", new_asset).id)
+
+    return [
+        ("get_data_version", lambda i: fx.read("get_data_version")),
+        ("get_asset_by_id", lambda i: fx.read("get_asset_by_id", fx.id(i), cached=False)),
+        ("get_asset_by_id cached", lambda i: fx.read("get_asset_by_id", fx.id(i % 10), cache=fx.cache)),
+        ("get_all_assets first 100", lambda i: fx.read("get_all_assets", 0, 100)),
+        ("get_all_assets offset rows/2", lambda i: fx.read("get_all_assets", fx.rows // 2, 100)),
+        ("get_assets_page first 100", lambda i: fx.read("get_assets_page", None, 100)),
+        ("get_assets_page cursor rows/2", lambda i: fx.read("get_assets_page", fx.deep_cursor, 100)),
+        ("search_asset name", lambda i: fx.read("search_asset", "MacBook", 100)),
+        ("search_asset category", lambda i: fx.read("search_asset", "jewel", 100)),
+        ("search_asset short (LIKE)", lambda i: fx.read("search_asset", "HP", 100)),
+        ("get_max_value", lambda i: fx.read("get_max_value")),
+        ("get_max_value category", lambda i: fx.read("get_max_value", fx.category)),
+        ("get_min_value", lambda i: fx.read("get_min_value")),
+        ("get_asset_values_mean", lambda i: fx.read("get_asset_values_mean")),
+        ("get_value_statistics category+status", lambda i: fx.read("get_value_statistics", fx.category, "Active")),
+        ("get_categories", lambda i: fx.read("get_categories")),
+        ("iter_asset_rows 10k", export),
+        ("create_asset", create),
+        ("update_asset", lambda i: fx.write("update_asset", AssetUpdate(value=100.0 + i), fx.created[i])),
+        ("delete_asset", lambda i: fx.write("delete_asset", fx.created[i])),
+        ("bulk_create_assets 1000", lambda i: fx.write("bulk_create_assets", bulk_rows(i))),
+    ]
+
+
+def _app(fx: Fixture) -> FastAPI:
+    "the /assets router alone on the DB under test (the route cost, not the middlewares of main.py)"
+
+    app = FastAPI()
+    app.include_router(router=assets.router, prefix="/assets")
+
+    def db():
+        with fx.sessions() as session:
+            yield session
+
+    def read_db():
+        with fx.read_sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = db
+    app.dependency_overrides[get_read_db] = read_db
+    return app
+
+
+def route_cases(client: httpx.AsyncClient, fx: Fixture):
+    "(name, async fn(i)) for every /assets route, same order rule as service_cases"
+
+    created = []
+    body = {"name": "Bench Monitor 27", "category": "Electronics", "value": 399.0, "quantity": 1, "status": "Active"}
+    ndjson = "\n".join(json.dumps({**body, "name": f"Bench Import {n}"}) for n in range(100)) + "\n"
+
+    async def call(method, url, expected, **kwargs):
+        response = await client.request(method, url, **kwargs)
+        if response.status_code != expected:
+            raise RuntimeError(f"{method} {url} -> {response.status_code} {response.text[:200]}")
+        return response
+
+    async def create(i):
+        created.append((await call("POST", "/assets/", 201, json=body)).json()["id"])
+
+    etag = {}
+
+    async def not_modified(i):
+        if "value" not in etag:
+            etag["value"] = (await call("GET", "/assets/?limit=100", 200)).headers["etag"]
+        await call("GET", "/assets/?limit=100", 304, headers={"If-None-Match": etag["value"]})
+
+    cases = [
+        ("route GET /assets/", lambda i: call("GET", "/assets/?limit=100", 200)),
+        ("route GET /assets/ 304", not_modified),
+        ("route GET /assets/page", lambda i: call("GET", "/assets/page?limit=100", 200)),
+        ("route GET /assets/page deep", lambda i: call("GET", "/assets/page", 200, params={"limit": 100, "cursor": fx.deep_cursor})),
+        ("route GET /assets/{id}", lambda i: call("GET", f"/assets/{fx.id(i)}", 200)),
+        ("route GET /assets/stats", lambda i: call("GET", "/assets/stats", 200, params={"category": fx.category})),
+        ("route GET /assets/cache/stats", lambda i: call("GET", "/assets/cache/stats", 200)),
+        ("route POST /assets/", create),
+        ("route PUT /assets/{id}", lambda i: call("PUT", f"/assets/{created[i]}", 200, json={"value": 500.0 + i})),
+        ("route DELETE /assets/{id}", lambda i: call("DELETE", f"/assets/{created[i]}", 204)),
+        ("route POST /assets/import 100", lambda i: call("POST", "/assets/import?format=ndjson", 200, content=ndjson)),
+    ]
+
+    # the full export only while it stays a microbenchmark
+    if fx.rows <= 100_000:
+        cases.append(("route GET /assets/export", lambda i: call("GET", "/assets/export?format=ndjson", 200)))
+
+    return cases
+
+
+def _summary(timings):
+    ordered = sorted(timings)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 4),
+        "ops_s": round(len(ordered) / sum(ordered), 1) if sum(ordered) else 0.0,
+    }
+
+
+def run(fx: Fixture, repeat, warmup, name_filter=None):
+    results = {}
+    keep = lambda name: not name_filter or name_filter in name
+
+    for name, fn in service_cases(fx):
+        if keep(name):
+            results[name] = _summary(_timed(fn, repeat, warmup))
+
+    async def routes():
+        transport = httpx.ASGITransport(app=_app(fx))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, fn in route_cases(client, fx):
+                if keep(name):
+                    results[name] = _summary(await _atimed(fn, repeat, warmup))
+
+    asyncio.run(routes())
+    return results
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    "[(case, baseline median, median)] of every case slower than its baseline by more than the threshold"
+
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        limit = max(base["median_ms"] * (1 + threshold), base["median_ms"] + min_delta_ms)
+        if result["median_ms"] > limit:
+            regressions.append((name, base["median_ms"], result["median_ms"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="size of the synthetic DB (ignored with --db)")
+    parser.add_argument("--db", help="run on this already built DB (python -m backend.benchmarks.synthetic), it gets written to")
+    parser.add_argument("--profile", choices=["default", "wal"], help="SQLite profile (defaults to LEDGER_SQLITE_PROFILE)")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--filter", help="only the cases whose name contains this")
+    parser.add_argument("--baseline", help="baseline file (default benchmarks/baselines/service_<rows>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown of a median over its baseline (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="slowdowns smaller than this are never regressions")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db
+        if path is None:
+            path = os.path.join(tmp, "bench.db")
+            print(f"building a synthetic DB of {args.rows:,} assets...")
+            build_db(path, args.rows).dispose()
+
+        fx = Fixture(path, args.profile)
+        results = run(fx, args.repeat, args.warmup, args.filter)
+
+    print(f"\n{fx.rows:,} assets, {args.repeat} runs per case\n")
+    print(f"{'case':<40}{'median ms':>12}{'p95 ms':>12}{'ops/s':>12}")
+    for name, result in results.items():
+        print(f"{name:<40}{result['median_ms']:>12.3f}{result['p95_ms']:>12.3f}{result['ops_s']:>12,.0f}")
+
+    baseline_path = args.baseline or os.path.join(BASELINES_DIR, f"service_{fx.rows}.json")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "rows": fx.rows,
+                "machine": f"{platform.platform()} / {platform.processor() or platform.machine()}",
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "cases": results,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\nbaseline saved to {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"\nno baseline at {baseline_path} (run with --save-baseline first), nothing to compare")
+        return 0
+
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline["cases"], args.threshold, args.min_delta_ms)
+    if not regressions:
+        print(f"\nno regression over {baseline_path} (threshold {args.threshold:.0%})")
+        return 0
+
+    print(f"\n{len(regressions)} regression(s) over {baseline_path} (threshold {args.threshold:.0%}):")
+    for name, base, now in regressions:
+        print(f"  {name:<40}{base:>10.3f} ms -> {now:>10.3f} ms ({now / base - 1:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
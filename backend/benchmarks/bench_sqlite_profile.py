@@ -0,0 +1,129 @@
+"""
+    mixed read / write throughput of the SQLite storage profiles (LEDGER_SQLITE_PROFILE)
+
+    every profile gets its own fresh DB file (with the FTS / stats / version triggers like the real one)
+    seeded with --rows assets, then --readers threads keep doing a get by id + a page of 50 while
+    --writers threads keep updating random assets for --seconds. reported per profile: reads/s, writes/s,
+    p95 read latency and how many operations failed ("database is locked"...)
+
+    usage:
+        python -m backend.benchmarks.bench_sqlite_profile --rows 20000 --readers 8 --writers 2 --seconds 5
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime , timezone
+from unittest.mock import MagicMock
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.core.database import get_db_base , get_engine
+from backend.src.models.asset import Asset
+from backend.src.models.asset_search import ensure_search_index
+from backend.src.models.asset_stats import ensure_value_stats
+from backend.src.models.asset_version import ensure_data_version
+from backend.src.schemas.asset import AssetUpdate
+from backend.src.services.assets_service import AssetService
+
+
+def _setup(path, profile, rows):
+    writer = get_engine(path=path, profile=profile)
+    reader = get_engine(read_only=True, path=path, profile=profile) if profile == "wal" else writer
+
+    get_db_base().metadata.create_all(bind=writer)
+    ensure_search_index(writer)
+    ensure_value_stats(writer)
+    ensure_data_version(writer)
+
+    ids = [str(uuid.uuid4()) for _ in range(rows)]
+    with writer.begin() as conn:
+        conn.execute(insert(Asset), [
+            {"id": asset_id, "name": f"Asset {i}", "category": f"Category {i % 20}", "value": float(i % 5000 + 1),
+             "quantity": 1.0, "status": "Active", "created_at": datetime.now(timezone.utc)}
+            for i, asset_id in enumerate(ids)
+        ])
+
+    return writer, reader, ids
+
+
+def _worker(session_factory, job, deadline, stats, lock):
+    ops, errors, latencies = 0, 0, []
+
+    while time.perf_counter() < deadline:
+        db = session_factory()
+        start = time.perf_counter()
+        try:
+            ok = job(AssetService(db, MagicMock()))
+        except Exception:
+            ok = False
+        finally:
+            db.close()
+
+        latencies.append(time.perf_counter() - start)
+        ops += ok
+        errors += not ok
+
+    with lock:
+        stats["ops"] += ops
+        stats["errors"] += errors
+        stats["latencies"].extend(latencies)
+
+
+def run(profile, rows, readers, writers, seconds):
+    with tempfile.TemporaryDirectory() as tmp:
+        writer, reader, ids = _setup(os.path.join(tmp, "bench.db"), profile, rows)
+        read_sessions, write_sessions = sessionmaker(bind=reader), sessionmaker(bind=writer)
+
+        def read(service):
+            _, error = service.get_asset_by_id(random.choice(ids))
+            page, page_error = service.get_assets_page(limit=50)
+            return error is None and page_error is None
+
+        def write(service):
+            _, error = service.update_asset(AssetUpdate(value=random.uniform(1, 5000)), random.choice(ids))
+            return error is None
+
+        lock = threading.Lock()
+        read_stats = {"ops": 0, "errors": 0, "latencies": []}
+        write_stats = {"ops": 0, "errors": 0, "latencies": []}
+        deadline = time.perf_counter() + seconds
+
+        threads = [threading.Thread(target=_worker, args=(read_sessions, read, deadline, read_stats, lock)) for _ in range(readers)]
+        threads += [threading.Thread(target=_worker, args=(write_sessions, write, deadline, write_stats, lock)) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        writer.dispose()
+        reader.dispose()
+
+    latencies = sorted(read_stats["latencies"]) or [0.0]
+    return {
+        "reads/s": read_stats["ops"] / seconds,
+        "writes/s": write_stats["ops"] / seconds,
+        "p95 read ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "errors": read_stats["errors"] + write_stats["errors"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--profiles", nargs="+", default=["default", "wal"])
+    args = parser.parse_args()
+
+    print(f"{args.rows} assets, {args.readers} readers, {args.writers} writers, {args.seconds}s per profile\n")
+    print(f"{'profile':<10}{'reads/s':>12}{'writes/s':>12}{'p95 read ms':>14}{'errors':>10}")
+
+    for profile in args.profiles:
+        result = run(profile, args.rows, args.readers, args.writers, args.seconds)
+        print(f"{profile:<10}{result['reads/s']:>12.0f}{result['writes/s']:>12.0f}{result['p95 read ms']:>14.2f}{result['errors']:>10}")
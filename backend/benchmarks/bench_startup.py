@@ -0,0 +1,82 @@
+"""
+    startup cost of a worker, with and without the agent stack (LEDGER_AGENTS)
+
+    every run is a fresh python process (nothing cached in sys.modules) that imports backend.main, then
+    runs the app's startup (the lifespan: init_db) the way uvicorn would. reported per configuration
+    (median over --repeat runs): import time, startup time, peak RSS, modules loaded and whether any of
+    LangChain / LangGraph / LangSmith / the Cerebras client got imported.
+
+    usage:
+        python -m backend.benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+CHILD = """
+import asyncio, json, resource, sys, time
+
+start = time.perf_counter()
+from backend.main import app
+imported = time.perf_counter()
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        pass
+
+asyncio.run(startup())
+started = time.perf_counter()
+
+print(json.dumps({
+    "import_s": imported - start,
+    "startup_s": started - imported,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "agent_stack": sorted({name.split(".")[0] for name in sys.modules} & set(AGENT_PACKAGES)),
+}))
+"""
+
+AGENT_PACKAGES = ["langchain", "langchain_core", "langgraph", "langsmith", "langchain_cerebras", "openai"]
+
+CONFIGS = {
+    "agents": {"LEDGER_AGENTS": "true"},
+    "crud-only": {"LEDGER_AGENTS": "false"},
+}
+
+
+def run_once(env_overrides):
+    env = {**os.environ, **env_overrides}
+    child = f"AGENT_PACKAGES = {AGENT_PACKAGES!r}\n" + CHILD
+
+    result = subprocess.run([sys.executable, "-c", child], env=env, capture_output=True, text=True, check=True)
+    # the app might print its own lines, ours is the last one
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(name, env_overrides, repeat):
+    runs = [run_once(env_overrides) for _ in range(repeat)]
+    return {
+        "config": name,
+        "import_s": statistics.median(r["import_s"] for r in runs),
+        "startup_s": statistics.median(r["startup_s"] for r in runs),
+        "rss_mb": statistics.median(r["rss_mb"] for r in runs),
+        "modules": statistics.median(r["modules"] for r in runs),
+        "agent_stack": runs[-1]["agent_stack"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    args = parser.parse_args()
+
+    results = [run(name, CONFIGS[name], args.repeat) for name in args.configs]
+
+    print(f"{'config':<10} {'import s':>9} {'startup s':>10} {'rss MB':>8} {'modules':>8}  agent stack loaded")
+    for r in results:
+        print(f"{r['config']:<10} {r['import_s']:>9.2f} {r['startup_s']:>10.3f} {r['rss_mb']:>8.0f} {r['modules']:>8.0f}  {', '.join(r['agent_stack']) or '-'}")
@@ -0,0 +1,112 @@
+"""
+    memory / throughput of the DB tools over a long run of tool calls (scoped sessions, db_manager_tools.py)
+
+    --calls tool calls (search / stats / all assets in turn, the tool cache off so every call hits the DB)
+    on a synthetic DB of --rows assets, one more asset written through the API session every --write-every
+    calls. every --report calls it prints the calls/s, the live python heap (tracemalloc, after a gc) and the RSS: with a
+    session per call both stay flat, with the old module global session the identity map kept every row
+    ever loaded. --snapshot runs the calls in batches of 10 inside tool_snapshot() (wal profile).
+
+    usage:
+        python -m backend.benchmarks.bench_tool_sessions --calls 1000000 --report 100000
+        python -m backend.benchmarks.bench_tool_sessions --calls 100000 --profile wal --snapshot
+"""
+import argparse
+import gc
+import logging
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.benchmarks.synthetic import build_db
+from backend.src.core.database import get_engine
+from backend.src.core.settings import SETTINGS
+from backend.src.schemas.asset import AssetCreate
+from backend.src.services.assets_service import AssetService
+from backend.src.utils.tools import db_manager_tools
+
+
+CALLS = [
+    (db_manager_tools.search_assets_by_name_or_category, {"query": "macbook"}),
+    (db_manager_tools.get_asset_value_statistics, {"metric": "max"}),
+    (db_manager_tools.get_asset_value_statistics, {"metric": "total", "category": "Electronics"}),
+    (db_manager_tools.get_all_assets, {}),
+]
+
+
+# a MagicMock logger would keep every call (and every payload) it ever got, a real one that drops everything
+QUIET_LOGGER = logging.getLogger("ledger.bench")
+QUIET_LOGGER.setLevel(logging.CRITICAL)
+
+
+def _rss_mb():
+    # ru_maxrss is the peak, good enough to see it never climbs
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(path, calls, report, write_every, profile, snapshot):
+    writer = get_engine(path=path, profile=profile)
+    reader = get_engine(read_only=True, path=path, profile=profile) if profile == "wal" else writer
+    # the app's writer connects at startup (init_db) and switches the file to WAL, do the same before any reader
+    writer.connect().close()
+    api = AssetService(sessionmaker(bind=writer)(), QUIET_LOGGER)
+    new_asset = AssetCreate(name="Bench Laptop", category="Electronics", value=999.0, quantity=1, status="Active")
+
+    patches = [
+        patch.object(db_manager_tools, "ToolSessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=reader)),
+        # plain functions, a MagicMock would keep every call it ever got
+        patch.object(db_manager_tools, "get_tool_cache", lambda: None),
+        patch.object(db_manager_tools, "get_session_logger", lambda: QUIET_LOGGER),
+        patch.dict(SETTINGS, {"LEDGER_TOOL_SNAPSHOT": snapshot, "LEDGER_SQLITE_PROFILE": profile}),
+    ]
+    for p in patches:
+        p.start()
+
+    tracemalloc.start()
+    print(f"{'calls':>10} {'calls/s':>9} {'heap MB':>9} {'peak RSS MB':>12}")
+
+    try:
+        start = time.perf_counter()
+        done = 0
+        while done < calls:
+            batch = 10 if snapshot else 1
+            with db_manager_tools.tool_snapshot():
+                for _ in range(batch):
+                    tool, args = CALLS[done % len(CALLS)]
+                    tool.invoke(args)
+                    done += 1
+
+                    if write_every and done % write_every == 0:
+                        api.create_asset(new_asset)
+
+                    if done % report == 0:
+                        # LangChain leaves small reference cycles behind every tool run, only count what's live
+                        gc.collect()
+                        heap, _ = tracemalloc.get_traced_memory()
+                        print(f"{done:>10,} {done / (time.perf_counter() - start):>9,.0f} {heap / 2**20:>9.1f} {_rss_mb():>12.0f}")
+    finally:
+        tracemalloc.stop()
+        for p in patches:
+            p.stop()
+        api.db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--report", type=int, default=10_000)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--write-every", type=int, default=100)
+    parser.add_argument("--profile", choices=["default", "wal"], default="wal")
+    parser.add_argument("--snapshot", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        build_db(path, args.rows).dispose()
+        run(path, args.calls, args.report, args.write_every, args.profile, args.snapshot)
@@ -0,0 +1,146 @@
+"""
+    synthetic assets DB for the benchmarks
+
+    bulk loads --rows realistic looking assets (10k ... 10M) into a fresh SQLite file with the exact schema
+    init_db() gives the real one: the table + its indexes, the FTS index, the value stats and the data version
+    (triggers included). names are brand + product + model number, values are skewed towards the cheap end of a per category
+    range, statuses / quantities / purchase dates are skewed like a real ledger, everything is seeded so two
+    runs with the same --rows / --seed produce the same data.
+
+    the rows go in first with the secondary indexes dropped and without the triggers, then the indexes are
+    rebuilt and the side structures created (their first creation backfills from the table), which is way
+    faster than paying every trigger / index for every row.
+
+    usage:
+        python -m backend.benchmarks.synthetic --rows 1000000 --out /tmp/assets_1m.db
+"""
+import argparse
+import os
+import random
+import time
+import uuid
+from datetime import datetime , timedelta , timezone
+
+from sqlalchemy import create_engine , event , insert
+
+from backend.src.core.database import get_db_base
+from backend.src.models import asset_stats , asset_version  # noqa: F401 (registers their tables)
+from backend.src.models.asset import Asset
+from backend.src.models.asset_search import ensure_search_index
+from backend.src.models.asset_stats import ensure_value_stats
+from backend.src.models.asset_version import ensure_data_version
+
+
+# category -> (brands, products, typical value range)
+CATALOG = {
+    "Electronics": (["Apple", "Dell", "Lenovo", "Samsung", "Sony", "LG", "HP"], ["MacBook Pro", "Laptop", "Monitor", "Tablet", "Phone", "Headphones", "Camera"], (80, 4000)),
+    "Furniture": (["Herman Miller", "IKEA", "Steelcase", "Knoll"], ["Chair", "Desk", "Bookshelf", "Sofa", "Cabinet"], (50, 2500)),
+    "Hardware": (["NVIDIA", "AMD", "Intel", "Cisco", "Synology"], ["GPU", "Server", "Switch", "NAS", "Router"], (150, 40000)),
+    "Vehicles": (["Toyota", "Tesla", "Ford", "Honda"], ["Sedan", "Van", "Pickup", "Scooter"], (1500, 90000)),
+    "Jewelry": (["Cartier", "Tiffany", "Rolex", "Omega"], ["Watch", "Ring", "Necklace", "Bracelet"], (200, 60000)),
+    "Precious Metals": (["PAMP", "Perth Mint", "Royal Mint"], ["Ounce of Gold", "Ounce of Silver", "Gold Bar", "Platinum Coin"], (25, 70000)),
+    "Office Supplies": (["Staples", "3M", "Brother", "Canon"], ["Printer", "Shredder", "Projector", "Whiteboard"], (20, 1500)),
+    "Real Estate": (["Downtown", "Lakeside", "Suburban", "Coastal"], ["Apartment", "Parking Spot", "Storage Unit", "Office"], (10000, 900000)),
+}
+
+STATUSES = (["Active", "In Use", "Maintenance", "Reserved", "Retired", "Sold"], [45, 30, 8, 7, 7, 3])
+
+
+def generate_rows(rows: int, seed: int = 42, start: datetime | None = None):
+    "yield `rows` asset dicts ready for insert(Asset), deterministic for a given seed"
+
+    rng = random.Random(seed)
+    categories = list(CATALOG)
+    start = start or datetime(2020, 1, 1, tzinfo=timezone.utc)
+    # created_at grows with the row number like in real life (keyset pagination sorts on it)
+    step = timedelta(days=5 * 365) / max(rows, 1)
+
+    for i in range(rows):
+        category = rng.choice(categories)
+        brands, products, (low, high) = CATALOG[category]
+        created_at = start + step * i
+
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "name": f"{rng.choice(brands)} {rng.choice(products)} {rng.choice('ABCDEFGHKMPRSTVXZ')}{rng.randint(1, 999)}",
+            "category": category,
+            # skewed towards the cheap end of the range
+            "value": round(low + (high - low) * rng.random() ** 3, 2),
+            "quantity": float(rng.choices([1, 2, 3, 5, 10], [70, 15, 7, 5, 3])[0]),
+            "status": rng.choices(*STATUSES)[0],
+            "purchase_date": (created_at - timedelta(days=rng.randint(0, 720))).replace(tzinfo=None),
+            "created_at": created_at,
+        }
+
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_db(path: str, rows: int, seed: int = 42, batch_size: int = 50_000, verbose: bool = False):
+    "create `path` with `rows` synthetic assets + every side structure, returns its (default profile) engine"
+
+    if os.path.exists(path):
+        raise FileExistsError(f"{path} already exists, the generator only builds fresh DBs")
+
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def bulk_load_pragmas(dbapi_connection, connection_record):
+        # a throwaway benchmark DB: no need to survive a crash while loading
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA journal_mode = MEMORY")
+        cursor.close()
+
+    get_db_base().metadata.create_all(bind=engine)
+    indexes = list(Asset.__table__.indexes)
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for index in indexes:
+            index.drop(conn)
+
+    loaded = 0
+    for batch in _batches(generate_rows(rows, seed), batch_size):
+        with engine.begin() as conn:
+            conn.execute(insert(Asset), batch)
+        loaded += len(batch)
+        if verbose:
+            print(f"\r{loaded:,} / {rows:,} rows ({loaded / (time.perf_counter() - started):,.0f} rows/s)", end="", flush=True)
+
+    if verbose:
+        print("\nbuilding the indexes, the search index and the stats...")
+
+    with engine.begin() as conn:
+        for index in indexes:
+            index.create(conn)
+
+    ensure_search_index(engine)
+    ensure_value_stats(engine)
+    ensure_data_version(engine)
+
+    if verbose:
+        print(f"done in {time.perf_counter() - started:.1f}s -> {path} ({os.path.getsize(path) / 2**20:,.0f} MiB)")
+
+    # the load pragmas were only for the load
+    engine.dispose()
+    return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--out", required=True, help="path of the SQLite file to create (must not exist)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    build_db(args.out, args.rows, seed=args.seed, batch_size=args.batch_size, verbose=True)
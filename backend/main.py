@@ -1,14 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.src.core.database import get_db_base , get_db , engine
-from backend.src.api.v1 import assets , chat , sockets
+from backend.src.core.database import init_db , engine , read_engine , async_engine , async_read_engine
+from backend.src.core.settings import SETTINGS
+from backend.src.utils.logger import RequestIdMiddleware
+from backend.src.utils import metrics
 
-Base = get_db_base()
 
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # the tables / indexes / side structures are created when the server starts, not when this module is imported
+    init_db()
+    yield
 
-app = FastAPI(title="THE Ledger API")
+
+app = FastAPI(title="THE Ledger API", lifespan=lifespan)
 
 origins = [
     "http://localhost",
@@ -23,11 +31,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
+# every log line written while serving a request carries its id
+app.add_middleware(RequestIdMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
+# SQL timings per engine (with the default profile the read engines are the same objects)
+metrics.instrument_engine(engine, "main")
+metrics.instrument_engine(async_engine.sync_engine, "async")
+if read_engine is not engine:
+    metrics.instrument_engine(read_engine, "read")
+    metrics.instrument_engine(async_read_engine.sync_engine, "async_read")
+
+# the async routes are opt-in (LEDGER_ASYNC_ROUTES=true) ... same API just no threadpool hop per request
+if SETTINGS['LEDGER_ASYNC_ROUTES']:
+    from backend.src.api.v1 import assets_async as assets
+else:
+    from backend.src.api.v1 import assets
+
 app.include_router(router= assets.router , prefix="/assets", tags=["Assets"])
-app.include_router(router=chat.router, prefix="/agent" , tags=["Agent"])
-app.include_router(router=sockets.router, prefix="/ws" , tags=["Agent Web Sockets"])
+
+# the agent routes pull in LangChain / LangGraph / the LLM client, a CRUD-only worker (LEDGER_AGENTS=false)
+# never imports any of it. even with them on, the clients / config / checkpointer / graphs are built on the first question
+if SETTINGS['LEDGER_AGENTS']:
+    from backend.src.api.v1 import chat , sockets
+
+    app.include_router(router=chat.router, prefix="/agent" , tags=["Agent"])
+    app.include_router(router=sockets.router, prefix="/ws" , tags=["Agent Web Sockets"])
 
 
 @app.get("/health")
@@ -36,4 +68,10 @@ def health_check():
 
 @app.get("/")
 def main():
-    return {"status" : "up and running twin"}
\ No newline at end of file
+    return {"status" : "up and running twin"}
+
+
+# Prometheus scrape endpoint (routes, SQL, LLM calls, rate limiter), see utils/metrics.py
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
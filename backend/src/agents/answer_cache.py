@@ -0,0 +1,83 @@
+import unicodedata
+from functools import lru_cache
+
+from backend.src.core.settings import SETTINGS
+from backend.src.services.cache import LRUCache
+from backend.src.utils.logger import get_session_logger
+
+
+"""
+    cache of the DBManager answers
+
+    "what's my most expensive asset?" asked 50 times over the same data is the same answer 50 times,
+    so the answer is cached under (assets data version, normalized question). the version moves on
+    every write to the assets table (models/asset_version.py) so a write invalidates every cached answer
+    at once without anybody having to remember to clear anything, the old entries just never match
+    again and age out of the LRU.
+
+    the version is read BEFORE the DBManager runs, a write landing while it runs then files the answer
+    under the old version which nobody asks for anymore, it can't serve stale data.
+    an answer built on a failed DB tool call ("error with the DB...") is never cached, same as the tools
+    never memoize their errors.
+"""
+
+
+def normalize_query(query: str) -> str:
+    "same question typed a bit differently -> same key (case, spacing, trailing ?/!/.)"
+    query = unicodedata.normalize("NFKC", query).casefold()
+    return " ".join(query.split()).rstrip("?!. ")
+
+
+def current_data_version():
+    "(version, updated_at) of the assets table or None if we can't tell (then nothing gets cached)"
+
+    # imported here so importing this module doesn't open the DB
+    from backend.src.core.database import ReadSessionLocal
+    from backend.src.services.assets_service import AssetService
+
+    with ReadSessionLocal() as db:
+        data_version, error = AssetService(db, get_session_logger()).get_data_version()
+
+    return None if error else data_version
+
+
+@lru_cache(maxsize=None)
+def get_answer_cache():
+    "the process wide answer cache, None when LEDGER_ANSWER_CACHE_SIZE=0"
+
+    if SETTINGS['LEDGER_ANSWER_CACHE_SIZE'] <= 0:
+        return None
+
+    return LRUCache(max_size=SETTINGS['LEDGER_ANSWER_CACHE_SIZE'], ttl_seconds=SETTINGS['LEDGER_ANSWER_CACHE_TTL'])
+
+
+def cached_answer(query: str, run, cache = None, data_version = current_data_version):
+    """
+        run(query) unless the same question was already answered on the same data,
+        failed runs (None) are never cached so they get retried next time, and neither are the answers
+        of a run where a DB tool failed (they only report the error)
+    """
+
+    # imported here, same as current_data_version
+    from backend.src.utils.tools.db_manager_tools import tool_failures
+
+    cache = cache if cache is not None else get_answer_cache()
+    version = data_version() if cache is not None else None
+
+    if version is None:
+        return run(query)
+
+    key = f"{version[0]}:{version[1]}:{normalize_query(query)}"
+
+    answer = cache.get(key)
+    if answer is not None:
+        get_session_logger().info("DB manager answer served from the cache")
+        return answer
+
+    with tool_failures() as failures:
+        answer = run(query)
+
+    if answer is not None and not failures:
+        cache.set(key, answer)
+
+    return answer
@@ -1,20 +1,50 @@
+import asyncio
+import threading
 from typing import Any
-from langchain.agents import create_agent , AgentState
+import uuid
+from langchain.agents import AgentState
 from langchain.agents.middleware import before_model
-from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.runtime import Runtime
-from langchain.messages import RemoveMessage
+from langchain.messages import AIMessage, HumanMessage, RemoveMessage
 from langgraph.graph.message import REMOVE_ALL_MESSAGES
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.runnables import RunnableConfig
 from langsmith import traceable
 
+from backend.src.agents.answer_cache import current_data_version, normalize_query
+from backend.src.agents.fast_path import try_fast_path
+from backend.src.agents.memory import get_session_checkpointer
+from backend.src.agents.rate_limiter import RateLimitExceeded, get_llm_rate_limiter
+from backend.src.agents.registry import get_compiled_agent
+from backend.src.agents.single_flight import get_query_flights
 from backend.src.clients import get_asset_manager_client
+from backend.src.core.settings import SETTINGS
+from backend.src.utils.logger import get_session_logger
 from backend.src.utils.tools.asset_manager_tools import ask_db_manager
+from backend.src.utils.tools.db_manager_tools import search_assets_by_name_or_category, get_all_assets, get_asset_value_statistics, tool_snapshot
+
+
+"""
+    LEDGER_AGENT_MODE picks how the AssetManager gets to the data:
+        two_agent -> through `ask_db_manager`, a second full agent loop (DBManager) per data question
+        single    -> the DB tools (db_manager_tools.py) are handed to the AssetManager itself,
+                     one agent loop, no second model round trips
+    benchmarks/bench_agent_modes.py compares both on the same questions
+"""
+
+AGENT_MODES = ("two_agent", "single")
+
+DB_TOOLS = [search_assets_by_name_or_category, get_all_assets, get_asset_value_statistics]
+
 
 class AssetManager:
 
-    def __init__(self):
-        self.tools = [ask_db_manager]
+    def __init__(self, mode : str | None = None):
+        self.mode = mode or SETTINGS['LEDGER_AGENT_MODE']
+        if self.mode not in AGENT_MODES:
+            raise ValueError(f"Unknown LEDGER_AGENT_MODE: {self.mode!r} (one of {', '.join(AGENT_MODES)})")
+
+        self.tools = DB_TOOLS if self.mode == "single" else [ask_db_manager]
         self.mem_limit = [trim_messages]
         self.llm = get_asset_manager_client()
         self.sys_prompt = self._sys_prompt()
@@ -23,20 +53,57 @@ class AssetManager:
 
 
     def _sys_prompt(self) -> str:
+        if self.mode == "single":
+            role = [
+                "- You read the asset database yourself, through the read-only database tools below.\n",
+                "- You may request asset data ONLY through those tools.\n\n",
+            ]
+            tool_policy = [
+                "1. You are allowed to use the database tools ONLY if:\n",
+                "   - The user explicitly asks about their assets, asset values, categories, totals, statistics, or asset-related information.\n\n",
+                "   AVAILABLE TOOLS:\n",
+                "   - `search_assets_by_name_or_category`: find specific items (e.g. 'MacBook', 'Electronics').\n",
+                "   - `get_asset_value_statistics`: max, min, mean, total or count, optionally for a single category.\n",
+                "   - `get_all_assets`: every stored asset, ONLY when the question can't be answered by the two tools above.\n\n",
+            ]
+            after_tool = [
+                "4. Once a tool returns the data you need:\n",
+                "   - You MUST immediately use that information to answer the user.\n",
+                "   - You MUST NOT call any additional tools unless the returned data is not enough to answer.\n\n",
+            ]
+            example = [
+                "Action: Call `search_assets_by_name_or_category` with \"MacBook\".\n",
+            ]
+        else:
+            role = [
+                "- You do NOT access databases directly.\n",
+                "- You may request asset data ONLY through the provided tool.\n\n",
+            ]
+            tool_policy = [
+                "1. You are allowed to use the tool `ask_db_manager` ONLY if:\n",
+                "   - The user explicitly asks about their assets, asset values, categories, totals, statistics, or asset-related information.\n\n",
+            ]
+            after_tool = [
+                "4. Once you receive a response from `ask_db_manager`:\n",
+                "   - You MUST immediately use that information to answer the user.\n",
+                "   - You MUST NOT call any additional tools.\n\n",
+            ]
+            example = [
+                "Action: Call `ask_db_manager` with a concise query.\n",
+            ]
+
         sys_prompt = "".join([
             'You are "THE-Ledger", a professional, reliable Asset Manager AI.\n\n',
             "ROLE:\n",
             "- You interact directly with the user.\n",
             "- You help users understand and manage their assets.\n",
-            "- You do NOT access databases directly.\n",
-            "- You may request asset data ONLY through the provided tool.\n\n",
+            *role,
             "PRIMARY GOAL:\n",
             "Provide clear, correct, and concise answers to the user.\n",
             "Use tools ONLY when absolutely necessary.\n\n",
             "---\n\n",
             "TOOL USAGE POLICY (STRICT — FOLLOW EXACTLY):\n\n",
-            "1. You are allowed to use the tool `ask_db_manager` ONLY if:\n",
-            "   - The user explicitly asks about their assets, asset values, categories, totals, statistics, or asset-related information.\n\n",
+            *tool_policy,
             "2. You MUST NOT use any tool if:\n",
             "   - The user is greeting you.\n",
             "   - The user is chatting casually.\n",
@@ -49,9 +116,7 @@ class AssetManager:
             "   - Respond politely.\n",
             "   - NOT call any tools.\n",
             "   - End your response without asking follow-up questions.\n\n",
-            "4. Once you receive a response from `ask_db_manager`:\n",
-            "   - You MUST immediately use that information to answer the user.\n",
-            "   - You MUST NOT call any additional tools.\n\n",
+            *after_tool,
             "---\n\n",
             "BEHAVIOR RULES:\n\n",
             "- Think carefully before using a tool.\n",
@@ -61,7 +126,7 @@ class AssetManager:
             "---\n\n",
             "EXAMPLES:\n\n",
             'User: "How much is my MacBook worth?"\n',
-            "Action: Call `ask_db_manager` with a concise query.\n",
+            *example,
             "Then: Answer the user using the returned data and STOP.\n\n",
             'User: "No thanks, stop here."\n',
             "Action: Respond politely and STOP. Do NOT use any tools.\n"
@@ -70,39 +135,186 @@ class AssetManager:
 
 
     def _create_agent(self):
-        "a method to create the agent"
+        "a method to get the (shared) compiled agent, it only gets compiled the first time"
 
 
-        agent = create_agent(
+        agent = get_compiled_agent(
             model= self.llm,
             system_prompt= self.sys_prompt,
             tools= self.tools,
             middleware=self.mem_limit,
-            checkpointer=InMemorySaver()
+            checkpointer=get_session_checkpointer()
 
         )
 
         return agent
-    
-    def run_query(self, user_query : str):
-        "a method to invoke the agent and execute the user query"
+
+    def run_query(self, user_query : str, session_id : str | None = None):
+        """
+            a method to invoke the agent and execute the user query
+            with a session_id the conversation is remembered (and continued) under that id,
+            without one the query is stateless and its thread is thrown away right after
+            raises RateLimitExceeded when the LLM queue is over budget (fast path answers never are)
+            and whatever made the agent run fail (it's logged first)
+            identical stateless questions running at the same time share one agent run (agents/single_flight.py)
+        """
+
+        answer = try_fast_path(user_query, self.mode)
+        if answer is not None:
+            self._remember(user_query, answer, session_id)
+            return answer
+
+        if session_id is None and SETTINGS['LEDGER_COALESCE_QUERIES']:
+            # the same stateless question already running on the same data -> wait for that run instead
+            data_version = current_data_version()
+            if data_version is not None:
+                key = (self.mode, data_version, normalize_query(user_query))
+                return get_query_flights().do(key, lambda: self._run_agent(user_query, None))
+
+        return self._run_agent(user_query, session_id)
+
+    def _run_agent(self, user_query : str, session_id : str | None):
+        "the actual agent run behind run_query"
+
+        self._admit()
+
+        thread_id = session_id or str(uuid.uuid4())
 
         try:
-            config: RunnableConfig = {"configurable": {"thread_id": "1"}}
-            result = self.agent.invoke(
-                {"messages": [{"role" : "user" , "content" : user_query}]},
-                config=config
-            )
+            config: RunnableConfig = {"configurable": {"thread_id": thread_id}}
+            # with LEDGER_TOOL_SNAPSHOT every tool of this run (the DBManager's included) sees the same data
+            with tool_snapshot():
+                result = self.agent.invoke(
+                    {"messages": [{"role" : "user" , "content" : user_query}]},
+                    config=config
+                )
+
 
-           
             if result and "messages" in result:
                 answer = result["messages"][-1].content
                 return answer
             else:
                 return None
-        except Exception as e:
-            print("damn shit happened")
-            return None
+        except Exception:
+            # logged here, raised for the route (500) and for every caller coalesced on this run
+            get_session_logger().exception("the agent run failed")
+            raise
+        finally:
+            if session_id is None:
+                self.agent.checkpointer.delete_thread(thread_id)
+
+    def _admit(self):
+        "raises RateLimitExceeded when the shared LLM queue is over budget, better a fast 429 than a caller hanging"
+
+        retry_after = get_llm_rate_limiter().retry_after()
+        if retry_after is not None:
+            raise RateLimitExceeded(retry_after)
+
+    def _remember(self, user_query : str, answer : str, session_id : str | None):
+        "a fast path answer never went through the agent, write the exchange into the session so follow ups still have it"
+
+        if session_id is None:
+            return
+
+        try:
+            config: RunnableConfig = {"configurable": {"thread_id": session_id}}
+            self.agent.update_state(
+                config,
+                {"messages": [HumanMessage(content=user_query), AIMessage(content=answer)]},
+                as_node="model"
+            )
+        except Exception:
+            get_session_logger().warning("couldn't save the fast path answer in the session", exc_info=True)
+
+    async def astream_query(self, user_query : str, session_id : str | None = None):
+        """
+            the streaming twin of run_query, runs the agent through its async API and yields
+            small JSON-ready events as they happen:
+                {"type": "token", "content": ...}        -> a partial token from the model
+                {"type": "tool_start", "tool": ...}      -> the model decided to call a tool
+                {"type": "tool_end", "tool": ...}        -> the tool returned
+                {"type": "answer", "answer": ..., "sources": []} -> the final answer (always the last event)
+                {"type": "error", "status": 500, "message": ...} -> the run failed, instead of the answer
+            session_id works the same way as in run_query
+            closing / cancelling the generator stops the run, no more LLM calls are made for it
+        """
+
+        answer = await asyncio.to_thread(try_fast_path, user_query, self.mode)
+        if answer is not None:
+            await asyncio.to_thread(self._remember, user_query, answer, session_id)
+            yield {"type": "answer", "answer": answer, "sources": []}
+            return
+
+        await asyncio.to_thread(self._admit)
+
+        thread_id = session_id or str(uuid.uuid4())
+        stop = threading.Event()
+        answer, failed = None, False
+
+        try:
+            config: RunnableConfig = {"configurable": {"thread_id": thread_id}, "callbacks": [StopWhenCancelled(stop)]}
+            stream = self.agent.astream(
+                {"messages": [{"role" : "user" , "content" : user_query}]},
+                config=config,
+                stream_mode=["messages", "updates"]
+            )
+
+            with tool_snapshot():
+                async for mode, chunk in stream:
+
+                    if mode == "messages":
+                        message, metadata = chunk
+                        # only the tokens of this agent's own model node, tool outputs come through the updates below
+                        if metadata.get("langgraph_node") == "model" and isinstance(message.content, str) and message.content:
+                            yield {"type": "token", "content": message.content}
+                        continue
+
+                    for node, update in chunk.items():
+                        for message in (update or {}).get("messages", []):
+                            if node == "model":
+                                for tool_call in getattr(message, "tool_calls", None) or []:
+                                    yield {"type": "tool_start", "tool": tool_call["name"]}
+                                answer = message.content
+                            elif node == "tools":
+                                yield {"type": "tool_end", "tool": message.name}
+
+        except Exception:
+            get_session_logger().exception("the streamed agent run failed")
+            failed = True
+        finally:
+            # also runs when the consumer went away (cancelled / closed), whatever still runs for this
+            # question in a tool thread (the DBManager loop) stops at its next model call
+            stop.set()
+            if session_id is None:
+                await self.agent.checkpointer.adelete_thread(thread_id)
+
+        if failed:
+            yield {"type": "error", "status": 500, "message": "Sorry, I couldn't answer that right now, please try again."}
+            return
+
+        yield {"type": "answer", "answer": answer, "sources": []}
+
+
+class QueryCancelled(Exception):
+    "the streaming consumer of this question is gone"
+
+
+class StopWhenCancelled(BaseCallbackHandler):
+
+    "fails every model call started once `stop` is set (nested DBManager runs included) so they never spend LLM quota"
+
+    raise_error = True
+
+    def __init__(self, stop: threading.Event):
+        self.stop = stop
+
+    def on_chat_model_start(self, *args, **kwargs):
+        if self.stop.is_set():
+            raise QueryCancelled()
+
+    def on_llm_start(self, *args, **kwargs):
+        if self.stop.is_set():
+            raise QueryCancelled()
 
 
 @before_model
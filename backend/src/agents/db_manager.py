@@ -8,6 +8,7 @@ from langgraph.graph.message import REMOVE_ALL_MESSAGES
 from langchain_core.runnables import RunnableConfig
 from langsmith import traceable
 
+from backend.src.agents.registry import get_compiled_agent
 from backend.src.clients import get_nvidia_client
 from backend.src.utils.tools.db_manager_tools import search_assets_by_name_or_category, get_all_assets, get_asset_value_statistics
 
@@ -31,7 +32,7 @@ class DBManager:
             
             "AVAILABLE TOOLS:\n",
             "- `search_assets_by_name_or_category`: Use for finding specific items (e.g., 'MacBook', 'Electronics').\n",
-            "- `get_asset_value_statistics`: Use for max, min, or mean calculations.\n",
+            "- `get_asset_value_statistics`: Use for max, min, mean, total or count calculations, optionally for a single category.\n",
             "- `get_all_assets`: if the user didn't specify a specific name for an asset or category then use this tool to get all the stored assets and answer the user query from it.\n\n",
             
             "CHAIN OF THOUGHT REASONING:\n",
@@ -50,10 +51,10 @@ class DBManager:
 
 
     def _create_agent(self):
-        "a method to create the agent"
+        "a method to get the (shared) compiled agent, it only gets compiled the first time"
 
 
-        agent = create_agent(
+        agent = get_compiled_agent(
             model= self.llm,
             system_prompt= self.sys_prompt,
             tools= self.tools,
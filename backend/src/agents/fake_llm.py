@@ -0,0 +1,136 @@
+import asyncio
+import json
+import re
+import time
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+
+"""
+    a local stand-in for the Cerebras chat model (LEDGER_LLM_PROVIDER=fake), no network, no quota
+
+    it replays a script instead of thinking, so a question always takes the same tool calls and the
+    agents / tools / checkpointer / routes around it can be load tested offline (benchmarks/bench_agent_offline.py).
+    a script is a list of rules, the first one whose regex matches the user question AND whose tools are
+    all bound to this model wins (so one script drives both agents, the AssetManager only has
+    `ask_db_manager` in two_agent mode while the DBManager has the DB tools):
+        {"match": "how much is my (?P<name>.+?) worth", "tool": "search_assets_by_name_or_category",
+         "args": {"query": "{name}"}, "answer": "Here is what I found: {result}"}
+    "steps": [{"tool": ..., "args": ...}, ...] instead of tool / args replays a sequence of tool calls,
+    the args / answer are formatted with the regex groups + {question} (+ {result}, the last tool output).
+    a rule without tool / steps answers right away. every call sleeps `latency` + `per_token_latency`
+    per output token so the model side of a request still costs roughly what it should.
+"""
+
+DEFAULT_SCRIPT = [
+    {"match": r"^\W*(hi|hello|hey|thanks|thank you|no thanks|stop|bye|goodbye)\b.*",
+     "answer": "Happy to help, let me know if you need anything about your assets."},
+    {"match": r".*\b(most expensive|most valuable|highest|max)\b.*", "tool": "get_asset_value_statistics", "args": {"metric": "max"}},
+    {"match": r".*\b(cheapest|least valuable|lowest|min)\b.*", "tool": "get_asset_value_statistics", "args": {"metric": "min"}},
+    {"match": r".*\b(average|mean)\b.*", "tool": "get_asset_value_statistics", "args": {"metric": "mean"}},
+    {"match": r".*\bhow many\b.*", "tool": "get_asset_value_statistics", "args": {"metric": "count"}},
+    {"match": r".*\b(total|all my assets worth|all of my assets worth)\b.*", "tool": "get_asset_value_statistics", "args": {"metric": "total"}},
+    {"match": r".*\bhow much is my (?P<name>.+?) worth\b.*", "tool": "search_assets_by_name_or_category", "args": {"query": "{name}"}},
+    {"match": r".*\b(list|every|all)\b.*", "tool": "get_all_assets", "args": {}},
+    {"match": r".*", "tool": "ask_db_manager", "args": {"query": "{question}"}, "answer": "{result}"},
+    {"match": r".*", "answer": "I can only help with questions about your assets."},
+]
+
+DEFAULT_ANSWER = "Here is what I found: {result}"
+
+
+def load_script(path: str = "") -> list:
+    "the rules in the JSON file at `path`, the built-in DEFAULT_SCRIPT when there's none"
+
+    if not path:
+        return DEFAULT_SCRIPT
+
+    with open(path, encoding="utf-8") as f:
+        script = json.load(f)
+
+    if not isinstance(script, list) or not all(isinstance(rule, dict) and "match" in rule for rule in script):
+        raise ValueError(f"{path} isn't a fake LLM script (a JSON list of rules with a \"match\" regex)")
+    return script
+
+
+def _tokens(text: str) -> int:
+    # ~4 chars a token is close enough for usage metrics / latency
+    return max(1, len(text) // 4)
+
+
+class _Values(dict):
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+class ScriptedChatModel(BaseChatModel):
+
+    "replays `script` (see DEFAULT_SCRIPT), deterministic and stateless so one instance serves every request"
+
+    model_name: str = "scripted"
+    script: list = DEFAULT_SCRIPT
+    latency: float = 0.0
+    per_token_latency: float = 0.0
+    max_result_chars: int = 500
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        names = [convert_to_openai_tool(tool)["function"]["name"] for tool in tools]
+        return self.bind(tool_names=names, **kwargs)
+
+    def _rule(self, question: str, tool_names: list):
+        for rule in self.script:
+            match = re.fullmatch(rule["match"], question.strip(), flags=re.IGNORECASE | re.DOTALL)
+            if match is None:
+                continue
+            steps = rule.get("steps") or ([{"tool": rule["tool"], "args": rule.get("args", {})}] if "tool" in rule else [])
+            if all(step["tool"] in tool_names for step in steps):
+                return rule, steps, _Values(match.groupdict(default=""), question=question)
+        return None, [], _Values(question=question)
+
+    def _reply(self, messages: list, tool_names: list) -> AIMessage:
+        # the turn we're in starts at the last user message
+        start = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=0)
+        turn = messages[start:]
+        question = turn[0].content if turn and isinstance(turn[0].content, str) else ""
+
+        rule, steps, values = self._rule(question, tool_names)
+        done = sum(1 for m in turn if isinstance(m, AIMessage) and m.tool_calls)
+
+        if done < len(steps):
+            step = steps[done]
+            args = {key: value.format_map(values) if isinstance(value, str) else value for key, value in step.get("args", {}).items()}
+            return AIMessage(content="", tool_calls=[{"name": step["tool"], "args": args, "id": f"call_{start}_{done}"}])
+
+        results = [m.content for m in turn if isinstance(m, ToolMessage)]
+        values["result"] = str(results[-1])[:self.max_result_chars] if results else ""
+        template = (rule or {}).get("answer", DEFAULT_ANSWER)
+        return AIMessage(content=template.format_map(values))
+
+    def _result(self, messages: list, tool_names: list):
+        message = self._reply(messages, tool_names)
+        input_tokens = sum(_tokens(str(m.content)) for m in messages)
+        output_tokens = _tokens(message.content or json.dumps(message.tool_calls))
+        message.usage_metadata = {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+        delay = self.latency + self.per_token_latency * output_tokens
+        return ChatResult(generations=[ChatGeneration(message=message)]), delay
+
+    def _generate(self, messages, stop: Optional[list] = None, run_manager=None, tool_names: list = (), **kwargs: Any) -> ChatResult:
+        result, delay = self._result(messages, list(tool_names))
+        if delay:
+            time.sleep(delay)
+        return result
+
+    async def _agenerate(self, messages, stop: Optional[list] = None, run_manager=None, tool_names: list = (), **kwargs: Any) -> ChatResult:
+        result, delay = self._result(messages, list(tool_names))
+        if delay:
+            await asyncio.sleep(delay)
+        return result
@@ -0,0 +1,180 @@
+import re
+import threading
+from typing import Optional
+
+from backend.src.agents.answer_cache import normalize_query
+from backend.src.core.settings import SETTINGS
+from backend.src.utils.logger import get_session_logger
+
+
+"""
+    deterministic fast path in front of AssetManager.run_query
+
+    "what's my most expensive asset?", "average value", "how many electronics do I have" don't need two
+    chained 70B agents, the answer is one AssetService call away. the patterns below recognize those
+    questions (optionally scoped to one category), call the service and fill a template.
+
+    it only answers when it's sure: anything it doesn't fully recognize (an unknown word where the category
+    should be, a second question glued to the first, a DB error...) returns None and the agents take over
+    like before. switch it off with LEDGER_FAST_PATH=false.
+"""
+
+_PREFIX = r"(?:(?:what(?:'s| is| are)|whats|which(?:'s| is)?|tell me|show me|give me|find|get)\s+)?(?:the\s+|my\s+)*"
+
+_INTENTS = [
+    ("max", re.compile(_PREFIX + r"(?:most (?:valuable|expensive)|priciest|highest valued?|max(?:imum)? valued?)\b(?P<rest>.*)")),
+    ("max", re.compile(_PREFIX + r"(?:highest|max(?:imum)?|biggest) (?:asset )?value\b(?P<rest>.*)")),
+    ("min", re.compile(_PREFIX + r"(?:least (?:valuable|expensive)|cheapest|lowest valued?|min(?:imum)? valued?)\b(?P<rest>.*)")),
+    ("min", re.compile(_PREFIX + r"(?:lowest|min(?:imum)?|smallest) (?:asset )?value\b(?P<rest>.*)")),
+    ("mean", re.compile(_PREFIX + r"(?:average|mean|avg)(?: asset)? (?:value|price|worth)\b(?P<rest>.*)")),
+    ("total", re.compile(_PREFIX + r"(?:total|combined)(?: asset)? (?:value|worth)\b(?P<rest>.*)")),
+    ("total", re.compile(r"how much (?:are|is) (?P<rest>.*?) worth(?: in total| altogether)?")),
+    ("count", re.compile(r"how many (?P<rest>.*?)(?: do i (?:have|own)| have i got| i (?:have|own)| are there)?")),
+    ("count", re.compile(_PREFIX + r"(?:number|count) of (?P<rest>.*)")),
+]
+
+# words around the category that don't change the question ("my electronics assets" == "electronics")
+_FILLER = {"my", "the", "all", "of", "in", "from", "under", "category", "asset", "assets", "item", "items",
+           "thing", "things", "one", "ones", "i", "have", "own", "do"}
+
+ALL = ""
+
+# agent runs a question answered here doesn't make, per LEDGER_AGENT_MODE:
+# two_agent -> the AssetManager run + the DBManager run it asks, single -> just the AssetManager one
+AGENT_RUNS = {"two_agent": 2, "single": 1}
+
+
+def _words(text: str) -> str:
+    # plural insensitive, "laptops" and "Laptop" are the same category
+    words = [word for word in re.findall(r"[\w&'-]+", text.casefold()) if word not in _FILLER]
+    return " ".join(word[:-1] if len(word) > 3 and word.endswith("s") else word for word in words)
+
+
+def resolve_scope(rest: str, categories) -> Optional[str]:
+    "ALL, one of `categories`, or None when the leftover words aren't a category we know (-> not sure)"
+
+    wanted = _words(rest)
+    if not wanted:
+        return ALL
+
+    for category in categories:
+        if _words(category) == wanted:
+            return category
+
+    return None
+
+
+def match_intent(query: str):
+    "(intent, rest of the question) or None"
+    query = normalize_query(query)
+
+    for intent, pattern in _INTENTS:
+        match = pattern.fullmatch(query)
+        if match:
+            return intent, match.group("rest")
+
+    return None
+
+
+class FastPathStats:
+
+    "how many questions the fast path answered vs handed over to the agents"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.answered = self.fell_back = self.agent_runs_saved = 0
+        self.by_intent = {}
+
+    def record(self, intent: Optional[str], mode: str = "two_agent"):
+        with self._lock:
+            if intent is None:
+                self.fell_back += 1
+            else:
+                self.answered += 1
+                self.agent_runs_saved += AGENT_RUNS[mode]
+                self.by_intent[intent] = self.by_intent.get(intent, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.answered + self.fell_back
+            return {
+                "answered": self.answered,
+                "fell_back": self.fell_back,
+                "hit_rate": round(self.answered / total, 4) if total else 0.0,
+                # each agent run skipped is 2+ LLM calls
+                "agent_runs_saved": self.agent_runs_saved,
+                "by_intent": dict(self.by_intent),
+            }
+
+
+FAST_PATH_STATS = FastPathStats()
+
+
+def _money(value: float) -> str:
+    return f"{value:,.2f}"
+
+
+def _nothing_found(error: str, scope: str) -> Optional[str]:
+    # an empty ledger is a real answer, an empty category we just resolved means something raced, ask the agents
+    return "You don't have any assets recorded yet." if "not found" in error.lower() and not scope else None
+
+
+def _answer(intent: str, scope: str, asset_service) -> Optional[str]:
+    where = f" in {scope}" if scope else ""
+
+    if intent in ("max", "min"):
+        getter = asset_service.get_max_value if intent == "max" else asset_service.get_min_value
+        asset, error = getter(category=scope or None)
+        if error:
+            return _nothing_found(error, scope)
+        adjective = "most" if intent == "max" else "least"
+        return f"Your {adjective} valuable asset{where} is {asset.name} ({asset.category}), worth {_money(asset.value)}."
+
+    stats, error = asset_service.get_value_statistics(category=scope or None)
+
+    if error:
+        return _nothing_found(error, scope)
+
+    if intent == "mean":
+        return f"The average value of your {stats['count']} assets{where} is {_money(stats['mean'])}."
+    if intent == "total":
+        return f"Your {stats['count']} assets{where} are worth {_money(stats['total'])} in total."
+    # the stats count rows, not units (quantity), so don't pass it off as "how many laptops you own"
+    return f"You have {stats['count']} asset records{where}."
+
+
+def try_fast_path(query: str, mode: Optional[str] = None) -> Optional[str]:
+    "the templated answer, or None if the agents have to handle this one. `mode` is the asking AssetManager's (for the stats)"
+
+    if not SETTINGS['LEDGER_FAST_PATH']:
+        return None
+
+    logger = get_session_logger()
+    matched = match_intent(query)
+    answer = None
+
+    if matched is not None:
+        intent, rest = matched
+
+        # imported here so importing this module doesn't open the DB
+        from backend.src.core.database import ReadSessionLocal
+        from backend.src.services.assets_service import AssetService
+
+        try:
+            with ReadSessionLocal() as db:
+                asset_service = AssetService(db, logger)
+                categories, error = asset_service.get_categories()
+                scope = None if error else resolve_scope(rest, categories)
+
+                if scope is not None:
+                    answer = _answer(intent, scope, asset_service)
+        except Exception as e:
+            logger.warning(f"fast path failed, handing over to the agents: {e}")
+            answer = None
+
+    FAST_PATH_STATS.record(matched[0] if answer is not None else None, mode or SETTINGS['LEDGER_AGENT_MODE'])
+
+    if answer is not None:
+        logger.info(f"fast path answered a '{matched[0]}' question")
+
+    return answer
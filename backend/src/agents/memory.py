@@ -0,0 +1,246 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    copy_checkpoint,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from backend.src.core.settings import SETTINGS
+
+
+"""
+    the Asset Manager memory, one conversation (LangGraph thread) per client session id.
+
+    - the checkpoints themselves live in SQLite (WAL) so a conversation survives restarts and
+      every worker process sees the same conversations
+    - only the latest checkpoint of a conversation is kept (older ones are pruned on every write)
+      and sessions idle for longer than the TTL or over the max sessions count get evicted,
+      so the DB doesn't grow forever
+    - in front of that there's a small in-memory LRU of the latest checkpoint per session so the
+      hot conversations don't pay for deserializing their whole history on every message. the LRU
+      entry is only trusted if its checkpoint id still matches what's in the DB (another worker might
+      have written to that conversation in the meantime). LangGraph mutates the checkpoint it loaded
+      while it runs, so the LRU hands out (and keeps) copies, never the tuple it holds
+"""
+
+
+def _detached(entry: CheckpointTuple) -> CheckpointTuple:
+    "a copy of `entry` the caller can mutate without touching the cached one (lists like messages included)"
+
+    checkpoint = copy_checkpoint(entry.checkpoint)
+    checkpoint["channel_values"] = {
+        channel: value.copy() if isinstance(value, list) else value
+        for channel, value in checkpoint["channel_values"].items()
+    }
+    return entry._replace(checkpoint=checkpoint, metadata=dict(entry.metadata), pending_writes=list(entry.pending_writes or []))
+
+
+class SessionCheckpointer(BaseCheckpointSaver):
+
+    def __init__(self, path: str, ttl_seconds: float, max_sessions: int, cache_size: int, evict_every: int = 100):
+
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.saver = SqliteSaver(conn)
+        super().__init__(serde=self.saver.serde)
+
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.cache_size = cache_size
+        self.evict_every = evict_every
+
+        self._cache = OrderedDict()   # thread_id -> latest CheckpointTuple
+        self._cache_lock = threading.Lock()
+        self._puts = 0
+
+        with self.saver.cursor() as cur:
+            cur.execute("PRAGMA busy_timeout=30000")
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    thread_id TEXT PRIMARY KEY,
+                    checkpoint_id TEXT,
+                    last_seen REAL NOT NULL
+                )
+                """
+            )
+            cur.execute("CREATE INDEX IF NOT EXISTS ix_sessions_last_seen ON sessions (last_seen)")
+
+    # ------------------------------------------------------------------ the LRU front
+
+    def _cache_get(self, thread_id: str) -> Optional[CheckpointTuple]:
+        with self._cache_lock:
+            entry = self._cache.get(thread_id)
+            if entry is not None:
+                self._cache.move_to_end(thread_id)
+        return entry and _detached(entry)
+
+    def _cache_set(self, thread_id: str, entry: CheckpointTuple):
+        entry = _detached(entry)
+        with self._cache_lock:
+            self._cache[thread_id] = entry
+            self._cache.move_to_end(thread_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_drop(self, thread_id: str):
+        with self._cache_lock:
+            self._cache.pop(thread_id, None)
+
+    @staticmethod
+    def _is_latest_lookup(config: RunnableConfig) -> bool:
+        configurable = config["configurable"]
+        return not configurable.get("checkpoint_id") and not configurable.get("checkpoint_ns")
+
+    # ------------------------------------------------------------------ sync API
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+
+        if not self._is_latest_lookup(config):
+            return self.saver.get_tuple(config)
+
+        thread_id = str(config["configurable"]["thread_id"])
+        cached = self._cache_get(thread_id)
+
+        if cached is not None:
+            with self.saver.cursor(transaction=False) as cur:
+                row = cur.execute("SELECT checkpoint_id FROM sessions WHERE thread_id = ?", (thread_id,)).fetchone()
+            if row and row[0] == cached.config["configurable"]["checkpoint_id"]:
+                return cached
+
+        checkpoint_tuple = self.saver.get_tuple(config)
+        if checkpoint_tuple is not None:
+            self._cache_set(thread_id, checkpoint_tuple)
+        return checkpoint_tuple
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        return self.saver.list(config, filter=filter, before=before, limit=limit)
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+
+        new_config = self.saver.put(config, checkpoint, metadata, new_versions)
+
+        thread_id = str(new_config["configurable"]["thread_id"])
+        checkpoint_ns = new_config["configurable"]["checkpoint_ns"]
+        checkpoint_id = new_config["configurable"]["checkpoint_id"]
+
+        with self.saver.cursor() as cur:
+            # keep the latest checkpoint only (checkpoint ids are time ordered)
+            cur.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+            cur.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+            if not checkpoint_ns:
+                cur.execute(
+                    "INSERT OR REPLACE INTO sessions (thread_id, checkpoint_id, last_seen) VALUES (?, ?, ?)",
+                    (thread_id, checkpoint_id, time.time()),
+                )
+
+        if not checkpoint_ns:
+            # what get_tuple() would have loaded back from the DB, minus the round trip
+            self._cache_set(thread_id, CheckpointTuple(
+                config=new_config,
+                checkpoint=checkpoint,
+                metadata=get_checkpoint_metadata(config, metadata),
+                parent_config={"configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": config["configurable"].get("checkpoint_id"),
+                }} if config["configurable"].get("checkpoint_id") else None,
+                pending_writes=[],
+            ))
+
+        self._puts += 1
+        if self._puts % self.evict_every == 0:
+            self.evict()
+
+        return new_config
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        self.saver.put_writes(config, writes, task_id, task_path)
+        # the cached tuple doesn't know about these pending writes, let the next read go to the DB
+        self._cache_drop(str(config["configurable"]["thread_id"]))
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.saver.delete_thread(thread_id)
+        with self.saver.cursor() as cur:
+            cur.execute("DELETE FROM sessions WHERE thread_id = ?", (str(thread_id),))
+        self._cache_drop(str(thread_id))
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        return self.saver.get_next_version(current, channel)
+
+    # ------------------------------------------------------------------ eviction
+
+    def evict(self) -> int:
+        "drop the sessions that expired (TTL) and the oldest ones over max_sessions, returns how many got dropped"
+
+        with self.saver.cursor(transaction=False) as cur:
+            expired = [row[0] for row in cur.execute(
+                "SELECT thread_id FROM sessions WHERE last_seen < ?", (time.time() - self.ttl_seconds,)
+            )]
+            overflow = [row[0] for row in cur.execute(
+                "SELECT thread_id FROM sessions ORDER BY last_seen DESC LIMIT -1 OFFSET ?", (self.max_sessions,)
+            )]
+
+        evicted = set(expired) | set(overflow)
+        for thread_id in evicted:
+            self.delete_thread(thread_id)
+
+        return len(evicted)
+
+    # ------------------------------------------------------------------ async API
+    # SQLite is local and every call here is short so a thread hop is all we need to keep the loop free
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        checkpoints = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for checkpoint_tuple in checkpoints:
+            yield checkpoint_tuple
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+@lru_cache(maxsize=None)
+def get_session_checkpointer() -> SessionCheckpointer:
+    "the one checkpointer shared by every AssetManager in this process"
+
+    path = SETTINGS['LEDGER_CHAT_MEMORY_PATH']
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    return SessionCheckpointer(
+        path=path,
+        ttl_seconds=SETTINGS['LEDGER_CHAT_SESSION_TTL'],
+        max_sessions=SETTINGS['LEDGER_CHAT_MAX_SESSIONS'],
+        cache_size=SETTINGS['LEDGER_CHAT_CACHE_SIZE'],
+    )
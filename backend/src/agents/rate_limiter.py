@@ -0,0 +1,274 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional
+
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from backend.src.core.settings import SETTINGS
+from backend.src.utils.metrics import LIMITER_QUEUED, LIMITER_REJECTED, LIMITER_WAIT
+
+
+"""
+    the one LLM rate limiter shared by every model client
+
+    both clients hit the same Cerebras account, so they have to draw from the same budget:
+    - the budget is a token bucket (LEDGER_LLM_RPM, burst LEDGER_LLM_BURST) stored in a small SQLite file,
+      every worker process on the box refills / spends the same row (BEGIN IMMEDIATE) so N workers
+      together still stay under the provider limit
+    - inside a process the model calls waiting for a token are a priority queue, interactive chat
+      goes before background jobs (see llm_priority), same priority -> first come first served
+    - /agent/query asks `retry_after()` before starting a question, when the queue is already longer
+      than LEDGER_LLM_MAX_QUEUE or the estimated wait is over LEDGER_LLM_MAX_QUEUE_WAIT it answers
+      429 + Retry-After right away instead of letting the caller hang
+"""
+
+PRIORITIES = {"interactive": 0, "background": 1}
+
+# how often an async waiter that isn't at the head of the queue checks whether it moved up
+ASYNC_POLL_INTERVAL = 0.05
+
+_priority = contextvars.ContextVar("llm_priority", default="interactive")
+
+
+@contextmanager
+def llm_priority(priority: str):
+    "every model call made inside this block (nested agents / tools included) waits with this priority"
+
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority: {priority!r} (one of {', '.join(PRIORITIES)})")
+
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RateLimitExceeded(Exception):
+
+    "the LLM queue is over budget, come back in `retry_after` seconds"
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"LLM rate limit exceeded, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class SQLiteTokenBucket:
+
+    "a token bucket whose state lives in SQLite so several processes can share it"
+
+    def __init__(self, path: str, rate_per_second: float, capacity: float, name: str = "llm"):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.name = name
+
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS token_buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+            self.conn.execute("INSERT OR IGNORE INTO token_buckets (name, tokens, updated) VALUES (?, ?, ?)", (name, capacity, time.time()))
+
+    def _refilled(self, now: float):
+        tokens, updated = self.conn.execute("SELECT tokens, updated FROM token_buckets WHERE name = ?", (self.name,)).fetchone()
+        # wall clock on purpose (shared between processes), never refill backwards if it jumps
+        return min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+
+    def try_acquire(self) -> float:
+        "take a token: 0 when we got one, otherwise the seconds until one should be there"
+
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                tokens = self._refilled(now)
+
+                wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+                if not wait:
+                    tokens -= 1
+
+                self.conn.execute("UPDATE token_buckets SET tokens = ?, updated = ? WHERE name = ?", (tokens, now, self.name))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+        return wait
+
+    def available(self) -> float:
+        "tokens in the bucket right now (nothing is taken)"
+        with self._lock:
+            return self._refilled(time.time())
+
+
+class PriorityRateLimiter(BaseRateLimiter):
+
+    "LangChain rate limiter over a shared bucket, the waiting calls are served by priority"
+
+    def __init__(self, bucket: SQLiteTokenBucket, max_queue: int, max_queue_wait: float):
+        self.bucket = bucket
+        self.max_queue = max_queue
+        self.max_queue_wait = max_queue_wait
+
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+
+        self.acquired = self.rejected = 0
+        self.total_wait = self.max_wait = 0.0
+        self._recent_waits = deque(maxlen=1000)
+        self._per_priority = {priority: 0 for priority in PRIORITIES}
+
+    def _enqueue(self):
+        priority = _priority.get()
+        entry = (PRIORITIES[priority], next(self._seq))
+
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            LIMITER_QUEUED.set(len(self._queue))
+            # a more urgent call might just have jumped ahead of the one sleeping at the head
+            self._cond.notify_all()
+
+        return priority, entry
+
+    def _dequeue(self, entry):
+        with self._cond:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+            LIMITER_QUEUED.set(len(self._queue))
+            self._cond.notify_all()
+
+    def _at_head(self, entry) -> bool:
+        with self._cond:
+            return self._queue[0] == entry
+
+    def _served(self, priority: str, start: float):
+        waited = time.perf_counter() - start
+
+        with self._cond:
+            self.acquired += 1
+            self._per_priority[priority] += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self._recent_waits.append(waited)
+
+        LIMITER_WAIT.observe(waited, priority=priority)
+
+    # only the queue bookkeeping happens under self._cond, the bucket's SQLite transaction (which can sit
+    # in another process's write lock for the busy timeout) is always done without it
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        start = time.perf_counter()
+        priority, entry = self._enqueue()
+
+        try:
+            while True:
+                with self._cond:
+                    while self._queue[0] != entry:
+                        if not blocking:
+                            return False
+                        # sleep until the queue moves (notify_all)
+                        self._cond.wait()
+
+                wait = self.bucket.try_acquire()
+                if not wait:
+                    break
+                if not blocking:
+                    return False
+
+                with self._cond:
+                    # until the token should be there, or earlier when a more urgent call jumps ahead
+                    self._cond.wait(timeout=wait)
+        finally:
+            self._dequeue(entry)
+
+        self._served(priority, start)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        # same queue as acquire (so priorities hold across sync and async callers), but the waiting is
+        # asyncio.sleep polling instead of a parked executor thread per waiter. only the head of the queue
+        # hops to a thread, for the SQLite transaction, so the loop never waits on the bucket's lock
+        start = time.perf_counter()
+        priority, entry = self._enqueue()
+
+        try:
+            while True:
+                if not self._at_head(entry):
+                    if not blocking:
+                        return False
+                    await asyncio.sleep(ASYNC_POLL_INTERVAL)
+                    continue
+
+                wait = await asyncio.to_thread(self.bucket.try_acquire)
+                if not wait:
+                    break
+                if not blocking:
+                    return False
+                await asyncio.sleep(min(wait, ASYNC_POLL_INTERVAL))
+        finally:
+            self._dequeue(entry)
+
+        self._served(priority, start)
+        return True
+
+    def retry_after(self) -> Optional[float]:
+        "None when a new question can start now, otherwise the seconds the caller should wait (and it's counted as rejected)"
+
+        with self._cond:
+            queued = len(self._queue)
+
+        # the calls already waiting go first, then this one
+        estimated_wait = max(0.0, (queued + 1 - self.bucket.available()) / self.bucket.rate)
+
+        if queued < self.max_queue and estimated_wait <= self.max_queue_wait:
+            return None
+
+        with self._cond:
+            self.rejected += 1
+        LIMITER_REJECTED.inc()
+
+        return max(1.0, math.ceil(estimated_wait))
+
+    def stats(self) -> dict:
+        with self._cond:
+            waits = sorted(self._recent_waits)
+            return {
+                "queued": len(self._queue),
+                "acquired": self.acquired,
+                "rejected": self.rejected,
+                "acquired_by_priority": dict(self._per_priority),
+                "mean_wait_s": round(self.total_wait / self.acquired, 4) if self.acquired else 0.0,
+                "p95_wait_s": round(waits[int(0.95 * (len(waits) - 1))], 4) if waits else 0.0,
+                "max_wait_s": round(self.max_wait, 4),
+            }
+
+
+@lru_cache(maxsize=None)
+def get_llm_rate_limiter() -> PriorityRateLimiter:
+    "the limiter every model client of this process shares (and through its SQLite file, every process)"
+
+    path = SETTINGS['LEDGER_LLM_LIMITER_PATH']
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    bucket = SQLiteTokenBucket(
+        path=path,
+        rate_per_second=SETTINGS['LEDGER_LLM_RPM'] / 60,
+        capacity=SETTINGS['LEDGER_LLM_BURST'],
+    )
+
+    return PriorityRateLimiter(
+        bucket,
+        max_queue=SETTINGS['LEDGER_LLM_MAX_QUEUE'],
+        max_queue_wait=SETTINGS['LEDGER_LLM_MAX_QUEUE_WAIT'],
+    )
@@ -0,0 +1,59 @@
+import threading
+from langchain.agents import create_agent
+
+
+"""
+    compiling an agent graph (create_agent) is way more expensive than running the python around it,
+    and a compiled graph is stateless (the state lives in the checkpointer under a thread_id) so it's
+    totally fine to share one graph between concurrent requests.
+
+    so instead of compiling a new graph for every AssetManager() / DBManager() we keep one compiled graph
+    per (model, tools, prompt, checkpointer) for the whole process and hand the same one to everybody
+"""
+
+_compiled_agents = {}
+_lock = threading.Lock()
+
+
+def _model_key(llm):
+    # the clients are lru_cached singletons anyway but keying on the model config keeps this honest
+    return (type(llm).__name__, getattr(llm, "model_name", None), getattr(llm, "temperature", None))
+
+
+def get_compiled_agent(model, system_prompt: str, tools: list, middleware: list = (), checkpointer=None):
+    "return the shared compiled graph for this model / tool set, compiling it the first time only"
+
+    key = (
+        _model_key(model),
+        tuple(tool.name for tool in tools),
+        tuple(getattr(m, "name", type(m).__name__) for m in middleware),
+        system_prompt,
+        # the graph is bound to its checkpointer, another store must never get this one's sessions
+        # (the cached graph keeps the checkpointer alive so its id can't be reused meanwhile)
+        id(checkpointer),
+    )
+
+    agent = _compiled_agents.get(key)
+    if agent is not None:
+        return agent
+
+    with _lock:
+        # someone else might have compiled it while we were waiting on the lock
+        agent = _compiled_agents.get(key)
+        if agent is None:
+            agent = create_agent(
+                model=model,
+                system_prompt=system_prompt,
+                tools=tools,
+                middleware=list(middleware),
+                checkpointer=checkpointer
+            )
+            _compiled_agents[key] = agent
+
+    return agent
+
+
+def clear_compiled_agents():
+    "drop every compiled graph (handy for tests and benchmarks)"
+    with _lock:
+        _compiled_agents.clear()
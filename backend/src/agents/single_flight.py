@@ -0,0 +1,77 @@
+import threading
+from functools import lru_cache
+
+
+"""
+    single flight for the stateless agent questions
+
+    a dashboard widget (or 20 users) asking the same question at the same time used to start 20 agent
+    runs, 20 times the LLM quota for one answer. identical questions in flight at the same moment now
+    share one run: the first caller (the leader) runs it, everybody arriving while it runs just waits
+    for that result. once it's done the key is gone, the next caller starts a fresh run.
+
+    the key is (agent mode, data version, normalized question) so a write landing in between never
+    hands an answer computed on older data to someone who asked after it. questions with a session_id
+    are never coalesced, their answer depends on the conversation.
+"""
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+
+    "run fn once per key among concurrent callers, everybody gets the leader's result (or exception)"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.executions = self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executions += 1
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        return flight.result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+            }
+
+
+@lru_cache(maxsize=None)
+def get_query_flights() -> SingleFlight:
+    "the single flight group of the stateless AssetManager questions of this process"
+    return SingleFlight()
@@ -0,0 +1,228 @@
+from fastapi import APIRouter , Depends , HTTPException , status , Query , Request , Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List , Optional
+
+
+from backend.src.core.settings import SETTINGS
+from backend.src.core.database import get_async_db , get_async_read_db
+from backend.src.schemas.asset import AssetCreate, AssetUpdate, AssetResponse, AssetPage, AssetStats, AssetImportReport
+from backend.src.services.assets_service_async import AsyncAssetService
+from backend.src.services import asset_io , asset_json
+from backend.src.services.cache import get_asset_cache
+from backend.src.utils.logger import get_session_logger
+from backend.src.utils import etag
+
+router = APIRouter()
+
+
+"""
+    same routes as assets.py but fully async, these run on the event loop itself instead of
+    Starlette's threadpool so one worker can keep a lot of requests in flight while SQLite does its thing
+    (switch them on with LEDGER_ASYNC_ROUTES=true)
+"""
+
+
+# creating a new asset enpoint
+@router.post("/", response_model= AssetResponse , status_code=status.HTTP_201_CREATED)
+async def create_asset(asset : AssetCreate , db : AsyncSession = Depends(get_async_db)):
+    logger  = get_session_logger()
+
+    asset_service = AsyncAssetService(db , logger , get_asset_cache())
+
+    new_asset, error = await asset_service.create_asset(asset)
+
+    if error:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to create asset: {error}")
+
+    return new_asset
+
+
+# get all the assets
+@router.get("/", response_model=List[AssetResponse])
+async def get_all_assets(request : Request , response : Response , skip : int = 0 , limit : int = 100 , db: AsyncSession = Depends(get_async_read_db)):
+
+    logger = get_session_logger()
+
+    asset_service = AsyncAssetService(db , logger , get_asset_cache())
+
+    # conditional GET, a matching ETag is answered before the assets are even queried
+    headers = etag.for_version(await asset_service.get_data_version(), "list", skip, limit)
+    if headers and etag.is_not_modified(request, headers):
+        return etag.not_modified_response(headers)
+
+    fast = SETTINGS['LEDGER_FAST_JSON']
+    assets, error = await asset_service.get_all_assets(skip , limit , as_rows=fast)
+
+    if error:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR , detail=f"Failed to get assets: {error}")
+
+    # column tuples straight to JSON bytes, the response_model above still documents the body
+    if fast:
+        return asset_json.response(asset_json.as_dicts(assets), headers)
+
+    response.headers.update(headers or {})
+    return assets
+
+
+# get a page of assets with cursor (keyset) pagination, deep pages cost the same as the first one
+@router.get("/page", response_model=AssetPage)
+async def get_assets_page(request : Request , response : Response , cursor : Optional[str] = None , limit : int = Query(100, ge=1, le=1000) , db: AsyncSession = Depends(get_async_read_db)):
+
+    logger = get_session_logger()
+
+    asset_service = AsyncAssetService(db , logger , get_asset_cache())
+
+    headers = etag.for_version(await asset_service.get_data_version(), "page", cursor, limit)
+    if headers and etag.is_not_modified(request, headers):
+        return etag.not_modified_response(headers)
+
+    fast = SETTINGS['LEDGER_FAST_JSON']
+    page, error = await asset_service.get_assets_page(cursor , limit , as_rows=fast)
+
+    if error:
+        if "invalid cursor" in error.lower():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST , detail="Invalid cursor")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR , detail=f"Failed to get assets: {error}")
+
+    assets, next_cursor = page
+
+    if fast:
+        return asset_json.response({"items": asset_json.as_dicts(assets), "next_cursor": next_cursor, "has_more": next_cursor is not None}, headers)
+
+    response.headers.update(headers or {})
+    return {"items": assets, "next_cursor": next_cursor, "has_more": next_cursor is not None}
+
+
+# value statistics (count / total / mean / min / max), for everything or one category / status
+@router.get("/stats", response_model=AssetStats)
+async def get_asset_stats(category : Optional[str] = None , status_name : Optional[str] = Query(None, alias="status") , db: AsyncSession = Depends(get_async_read_db)):
+
+    logger = get_session_logger()
+
+    asset_service = AsyncAssetService(db , logger , get_asset_cache())
+
+    stats, error = await asset_service.get_value_statistics(category=category , status=status_name)
+
+    if error:
+        if "not found" in error.lower():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND , detail="No assets to compute statistics for")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR , detail=f"Failed to get statistics: {error}")
+
+    return stats
+
+
+# hit / miss counters of the asset read cache
+@router.get("/cache/stats")
+async def get_cache_stats():
+
+    cache = get_asset_cache()
+
+    if cache is None:
+        return {"backend": "off"}
+
+    return cache.stats()
+
+
+# bulk import from a streamed NDJSON / CSV body, validated and inserted batch by batch
+@router.post("/import", response_model=AssetImportReport)
+async def import_assets(request : Request , format : Optional[str] = Query(None, pattern="^(ndjson|csv)$") , batch_size : int = Query(asset_io.IMPORT_BATCH_SIZE, ge=1, le=10000) , db : AsyncSession = Depends(get_async_db)):
+
+    logger = get_session_logger()
+
+    asset_service = AsyncAssetService(db , logger , get_asset_cache())
+
+    format = asset_io.detect_format(format , request.headers.get("content-type"))
+    report = asset_io.new_import_report()
+
+    async for batch in asset_io.iter_import_batches(request.stream(), format, batch_size):
+
+        rows, errors = asset_io.validate_batch(batch)
+
+        inserted, error = (0, None)
+        if rows:
+            inserted, error = await asset_service.bulk_create_assets(rows)
+
+        asset_io.add_batch_to_report(report, rows, inserted, errors, error)
+
+    logger.info(f"Imported {report['inserted']} assets ({report['failed']} rejected)")
+    return report
+
+
+# export every asset as NDJSON / CSV, streamed so it runs in constant memory whatever the table size
+@router.get("/export")
+async def export_assets(format : str = Query("ndjson", pattern="^(ndjson|csv)$") , db : AsyncSession = Depends(get_async_read_db)):
+
+    logger = get_session_logger()
+
+    asset_service = AsyncAssetService(db , logger , get_asset_cache())
+
+    async def body():
+        yield asset_io.export_header(format)
+        async for rows in asset_service.iter_asset_rows():
+            yield asset_io.encode_rows(rows, format)
+
+    logger.info(f"Exporting the assets as {format}")
+    return StreamingResponse(
+        body(),
+        media_type=asset_io.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="assets.{format}"'},
+    )
+
+
+# get an asset by UUID
+@router.get("/{asset_id}", response_model=AssetResponse)
+async def get_asset(request : Request , response : Response , asset_id: str , db : AsyncSession = Depends(get_async_read_db)):
+
+    logger = get_session_logger()
+    asset_service = AsyncAssetService(db , logger , get_asset_cache())
+
+    data_version = await asset_service.get_data_version()
+    headers = etag.for_version(data_version, "asset", asset_id)
+    # checked before we know the asset exists, so `*` mustn't turn a 404 into a 304
+    if headers and etag.is_not_modified(request, headers, wildcard=False):
+        return etag.not_modified_response(headers)
+
+    # the same version validates the cached copy, a stale one never goes out under the new ETag
+    asset, error = await asset_service.get_asset_by_id(asset_id, data_version=data_version[0])
+
+    if error:
+        if "not found" in error.lower():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Asset with ID {asset_id} not found")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR , detail=f"Error retrieving asset: {error}")
+
+    response.headers.update(headers or {})
+    return asset
+
+
+#delete an asset
+@router.delete("/{asset_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_asset(asset_id : str , db : AsyncSession = Depends(get_async_db)):
+    logger = get_session_logger()
+    asset_service = AsyncAssetService(db , logger , get_asset_cache())
+
+    _, error = await asset_service.delete_asset(asset_id)
+
+    if error:
+        if "not found" in error.lower():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND , detail="Asset not found")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR , detail=f"Error deleting asset: {error}")
+
+    return None
+
+
+# update an asset
+@router.put("/{asset_id}" , response_model= AssetResponse)
+async def update_asset(asset_id : str , asset_update : AssetUpdate , db : AsyncSession = Depends(get_async_db)):
+
+    logger = get_session_logger()
+    asset_service = AsyncAssetService(db , logger , get_asset_cache())
+
+    updated_asset, error = await asset_service.update_asset(asset_update , asset_id)
+
+    if error:
+        if "not found" in error.lower():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND , detail="Asset not found")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR , detail=f"Error updating asset: {error}")
+
+    return updated_asset
@@ -1,16 +1,31 @@
+import asyncio
+import json
+from contextlib import aclosing
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional
 from langsmith import traceable
 
 from backend.src.agents.asset_manager import AssetManager
-from backend.src.utils.logger import get_session_logger
+from backend.src.agents.answer_cache import get_answer_cache
+from backend.src.agents.fast_path import FAST_PATH_STATS
+from backend.src.agents.rate_limiter import RateLimitExceeded, get_llm_rate_limiter
+from backend.src.agents.single_flight import get_query_flights
+from backend.src.utils.logger import get_session_logger, payload
 
 
 router = APIRouter()
 
 
+def _too_many(retry_after: float) -> HTTPException:
+    return HTTPException(status_code=429, detail="Too many questions right now, please retry later",
+                         headers={"Retry-After": str(int(retry_after))})
+
+
 class ChatQuery(BaseModel):
     question: str
+    session_id: Optional[str] = Field(None, description="send the same id again to continue a conversation, leave it out for a one-off question")
 
 
 @router.post("/query")
@@ -19,13 +34,90 @@ def query_agent(query: ChatQuery):
     try:
         logger = get_session_logger()
         asset_manager = AssetManager()
-        logger.info(f"running user query : {query.question}")
-        response = asset_manager.run_query(query.question)
+        logger.info("running user query : %s", payload(query.question))
+        response = asset_manager.run_query(query.question, session_id=query.session_id)
 
         logger.info(f"replying with {response[:10]}")
         return response
-      
-            
+
+    except RateLimitExceeded as e:
+        logger.warning(f"LLM queue over budget, asking the client to retry in {e.retry_after:.0f}s")
+        raise _too_many(e.retry_after)
+
     except Exception as e:
         logger.error("Opps something bad happended at the chat route")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+# same question as /query but answered as Server-Sent Events while the agent works:
+#   event: token        data: {"type": "token", "content": "..."}
+#   event: tool_start   data: {"type": "tool_start", "tool": "..."}   (and tool_end)
+#   event: answer       data: {"type": "answer", "answer": "...", "sources": []}   always the last one
+#   event: error        data: {"type": "error", "status": 500, "message": "..."}   instead of the answer when the run failed
+# when the LLM queue is over budget the request gets the same 429 + Retry-After as /query before any
+# stream starts. if it goes over budget between that check and the agent run, the headers are already
+# out, so the stream is a single `error` event + the SSE `retry:` hint. a client closing the connection
+# cancels the agent run
+@router.post("/query/stream")
+async def stream_query_agent(query: ChatQuery):
+    logger = get_session_logger()
+    asset_manager = AssetManager()
+    logger.info("streaming user query : %s", payload(query.question))
+
+    # it reads the shared bucket (SQLite), not on the event loop
+    retry_after = await asyncio.to_thread(get_llm_rate_limiter().retry_after)
+    if retry_after is not None:
+        logger.warning(f"LLM queue over budget, asking the stream client to retry in {retry_after:.0f}s")
+        raise _too_many(retry_after)
+
+    async def events():
+        try:
+            async with aclosing(asset_manager.astream_query(query.question, session_id=query.session_id)) as stream:
+                async for event in stream:
+                    yield _sse(event)
+
+        except RateLimitExceeded as e:
+            logger.warning(f"LLM queue over budget, asking the stream client to retry in {e.retry_after:.0f}s")
+            yield f"retry: {int(e.retry_after * 1000)}\n" + _sse({"type": "error", "status": 429, "retry_after": e.retry_after})
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # the client went away -> aclosing already stopped the agent run
+            logger.warning("stream client disconnected, agent run cancelled")
+            raise
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+# hit / miss counters of the DB manager answer cache
+@router.get("/cache/stats")
+def answer_cache_stats():
+
+    cache = get_answer_cache()
+
+    if cache is None:
+        return {"backend": "off"}
+
+    return cache.stats()
+
+
+# how many questions the fast path answered without the agents
+@router.get("/fast-path/stats")
+def fast_path_stats():
+    return FAST_PATH_STATS.stats()
+
+
+# queue depth / wait times / rejections of the shared LLM rate limiter
+@router.get("/limiter/stats")
+def llm_limiter_stats():
+    return get_llm_rate_limiter().stats()
+
+
+# how many stateless questions shared an agent run with an identical one already in flight
+@router.get("/coalescing/stats")
+def coalescing_stats():
+    return get_query_flights().stats()
@@ -1,5 +1,9 @@
+from contextlib import aclosing
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from typing import Optional
+import uuid
 from backend.src.agents.asset_manager import AssetManager
+from backend.src.agents.rate_limiter import RateLimitExceeded
 from backend.src.utils.logger import get_session_logger
 import json
 
@@ -8,38 +12,70 @@ router = APIRouter()
 
 """
     this endpoint here is an extra one from me but anyway I though it seems really convinient to add it
-    so basically we are spinning up a WebSocket connection between the client and the server 
-    and once we get the client req we give it to the agent and then respond back with the agent answer
+    so basically we are spinning up a WebSocket connection between the client and the server
+    and once we get the client req we give it to the agent and then stream the agent answer back
+
+    the agent runs through its async API so the event loop (and every other socket / HTTP request) stays free
+    while the LLM is thinking, and the client gets JSON frames as they happen:
+        {"type": "token", "content": "..."}           partial tokens
+        {"type": "tool_start" | "tool_end", "tool": "..."}   tool progress
+        {"type": "answer", "answer": "...", "sources": []}   the final answer (same shape as before)
+        {"type": "error", "status": 500, "message": "..."}   instead of the answer when the agent run failed
+        {"type": "error", "status": 429, "retry_after": ..., "message": "..."}   the LLM queue is over budget,
+                                                             the socket stays open, ask again in retry_after seconds
+
+    the whole connection is one conversation (memory included), pass ?session_id=... to pick it up again
+    later, and a frame can also be JSON like {"question": "...", "session_id": "..."} instead of plain text
 """
 
+
+def _parse_frame(frame: str, session_id: str):
+    "plain text frames are just the question, JSON frames can also carry their own session id"
+    try:
+        data = json.loads(frame)
+    except ValueError:
+        return frame, session_id
+
+    if isinstance(data, dict) and "question" in data:
+        return data["question"], data.get("session_id") or session_id
+    return frame, session_id
+
+
 @router.websocket("/chat")
-async def websocket_endpoint(websocket: WebSocket):
-    
+async def websocket_endpoint(websocket: WebSocket, session_id: Optional[str] = None):
+
     await websocket.accept()
-    
+    logger = get_session_logger()
+    session_id = session_id or str(uuid.uuid4())
+
     try:
         while True:
-            
-            
+
+
             user_text = await websocket.receive_text()
-            
+            question, frame_session_id = _parse_frame(user_text, session_id)
+
             asset_manager = AssetManager()
-            logger = get_session_logger()
-
-            agent_response_str = asset_manager.run_query(user_text)
-            
-            
-            response_data = {
-                    "answer": agent_response_str,
-                    "sources": []
-                }
-            
-            logger.info("replying to the client through the socket connection")
-            await websocket.send_json(response_data)
-            
+
+            try:
+                # aclosing -> a send failing on a disconnect stops the agent run right away, not whenever the GC gets to it
+                async with aclosing(asset_manager.astream_query(question, session_id=frame_session_id)) as stream:
+                    async for event in stream:
+
+                        if event["type"] == "answer":
+                            logger.info("replying to the client through the socket connection")
+
+                        await websocket.send_json(event)
+
+            except RateLimitExceeded as e:
+                # over budget is temporary, tell the client when to ask again and keep the conversation open
+                logger.warning(f"LLM queue over budget, asking the socket client to retry in {e.retry_after:.0f}s")
+                await websocket.send_json({"type": "error", "status": 429, "retry_after": e.retry_after,
+                                           "message": f"Too many questions right now, please ask again in {e.retry_after:.0f}s."})
+
     except WebSocketDisconnect:
         logger.warning("Socket Client disconnected")
-    except Exception as e:
-        logger.error(f"smth really bad happended at the socket connection error : {e}")
-        await websocket.send_json({"answer": f"Error: {str(e)}", "sources": []})
-        await websocket.close()
\ No newline at end of file
+    except Exception:
+        logger.exception("smth really bad happended at the socket connection")
+        await websocket.send_json({"type": "error", "status": 500, "message": "Sorry, something went wrong, please reconnect."})
+        await websocket.close()
@@ -1,31 +1,47 @@
 from langchain_cerebras import ChatCerebras
-from langchain_core.rate_limiters import InMemoryRateLimiter
 from functools import lru_cache
 from langsmith import Client as LangSmithClient
 
-from backend.src.core.config import CONFIG
+from backend.src.agents.fake_llm import ScriptedChatModel, load_script
+from backend.src.agents.rate_limiter import get_llm_rate_limiter
+from backend.src.core.config import get_config
+from backend.src.core.settings import SETTINGS
+from backend.src.utils.llm_metrics import LLMMetricsHandler
+
+
+def _fake_client(agent: str) -> ScriptedChatModel:
+    "the offline stand-in (LEDGER_LLM_PROVIDER=fake), same limiter / metrics as the real client"
+
+    print(f"--- Initializing the scripted fake LLM ({agent}) ---")
+
+    return ScriptedChatModel(
+            model_name=f"scripted-{agent}",
+            script=load_script(SETTINGS['LEDGER_FAKE_LLM_SCRIPT']),
+            latency=SETTINGS['LEDGER_FAKE_LLM_LATENCY'],
+            per_token_latency=SETTINGS['LEDGER_FAKE_LLM_TOKEN_LATENCY'],
+            rate_limiter=get_llm_rate_limiter(),
+            callbacks=[LLMMetricsHandler(agent)]
+        )
+
 
 # a model client to power the agent
 @lru_cache(maxsize=None)
 def get_nvidia_client()-> ChatCerebras:
 
+    if SETTINGS['LEDGER_LLM_PROVIDER'] == "fake":
+        return _fake_client("db_manager")
+
     print("--- Initializing LLM Client LLama 3 ---")
 
     try:
 
-        
-        rate_limiter_cerebras = InMemoryRateLimiter(
-                requests_per_second= 30 / 60,  # with Cerebras I'm getting 30 RPM max 
-                check_every_n_seconds=0.1,  
-                max_bucket_size=1
-            )
-
-
         model = ChatCerebras(
                 model="llama-3.3-70b",
                 temperature = 0,
-                api_key = CONFIG['CEREBRAS_API_KEY'],
-                rate_limiter= rate_limiter_cerebras
+                api_key = get_config()['CEREBRAS_API_KEY'],
+                # same Cerebras account as the asset manager -> same budget (see agents/rate_limiter.py)
+                rate_limiter= get_llm_rate_limiter(),
+                callbacks=[LLMMetricsHandler("db_manager")]
             )
 
         return model
@@ -38,24 +54,20 @@ def get_nvidia_client()-> ChatCerebras:
 @lru_cache(maxsize=None)
 def get_asset_manager_client()-> ChatCerebras:
 
+    if SETTINGS['LEDGER_LLM_PROVIDER'] == "fake":
+        return _fake_client("asset_manager")
+
     print("--- Initializing LLM Client LLama 3 ---")
 
     try:
 
 
-        
-        
-        rate_limiter_cerebras = InMemoryRateLimiter(
-                requests_per_second= 30 / 60,  # with Cerebras I'm getting 30 RPM max 
-                check_every_n_seconds=0.1,  
-                max_bucket_size=1
-            )
-
         model = ChatCerebras(
                 model="llama-3.3-70b",
                 temperature = 0.7,
-                api_key = CONFIG['CEREBRAS_API_KEY'],
-                rate_limiter= rate_limiter_cerebras
+                api_key = get_config()['CEREBRAS_API_KEY'],
+                rate_limiter= get_llm_rate_limiter(),
+                callbacks=[LLMMetricsHandler("asset_manager")]
             )
 
 
@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from functools import lru_cache
 from typing import Dict
 
 def load_environment() -> Dict[str, str]:
@@ -27,9 +28,12 @@ def load_environment() -> Dict[str, str]:
     
     return config
 
-# Initialize and export all configs
-try:
-    CONFIG = load_environment()
-except ValueError as e:
-    print(f"Configuration error: {str(e)}")
-    raise
\ No newline at end of file
+# loaded (and validated) the first time a model client is built and not at import time,
+# so a CRUD-only worker (LEDGER_AGENTS=false) or the fake LLM never need the keys
+@lru_cache(maxsize=None)
+def get_config() -> Dict[str, str]:
+    try:
+        return load_environment()
+    except ValueError as e:
+        print(f"Configuration error: {str(e)}")
+        raise
@@ -1,26 +1,112 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine , event
 from sqlalchemy.orm import sessionmaker , declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine , async_sessionmaker , AsyncSession
 import os
 
+from backend.src.core.settings import SETTINGS
+
 
 
 # tbh I chose sqlite just for simplicity but it's not recommended to use it in prod 
+# (if you still do, at least run it with LEDGER_SQLITE_PROFILE=wal)
+
+"""
+    storage profiles (LEDGER_SQLITE_PROFILE):
+        default -> what we always had, one engine with SQLite's default pragmas (rollback journal) for everything
+        wal     -> WAL + tuned pragmas (synchronous=NORMAL, busy timeout, mmap, page cache). the reads go through
+                   a pool of read only connections (get_read_db) and the writes through ONE writer connection
+                   (get_db) so writers queue up in the pool instead of failing with "database is locked",
+                   and thanks to WAL the readers never wait for them
+"""
+
+PROFILES = ("default", "wal")
+
+
+def get_db_path():
+    BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(BASE_DIR, 'db', 'assets.db')
+
+
+def _url(driver: str, path: str, read_only: bool) -> str:
+    if read_only:
+        # a URI filename so SQLite itself refuses any write on these connections
+        return f"{driver}:///file:{path}?mode=ro&uri=true"
+    return f"{driver}:///{path}"
+
+
+def _wal_pragmas(read_only: bool):
+    pragmas = [
+        ("busy_timeout", int(SETTINGS['LEDGER_SQLITE_BUSY_TIMEOUT'] * 1000)),
+        # with WAL a crash can only lose the last transactions, never corrupt the DB
+        ("synchronous", "NORMAL"),
+        ("mmap_size", SETTINGS['LEDGER_SQLITE_MMAP_SIZE']),
+        # negative -> KiB instead of pages
+        ("cache_size", -SETTINGS['LEDGER_SQLITE_CACHE_KB']),
+        ("temp_store", "MEMORY"),
+    ]
+
+    if read_only:
+        return pragmas + [("query_only", "ON")]
+
+    # journal_mode is stored in the DB file itself, the writer sets it and every connection follows
+    return [("journal_mode", "WAL")] + pragmas
+
 
+def _use_wal_profile(engine, read_only: bool):
+    "run the pragmas on every new connection of `engine` (a sync Engine, pass async_engine.sync_engine)"
 
-def get_engine():
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        if not read_only:
+            # we emit BEGIN ourselves below, pysqlite's implicit transactions would get in the way
+            dbapi_connection.isolation_level = None
+
+        cursor = dbapi_connection.cursor()
+        for name, value in _wal_pragmas(read_only):
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+    if not read_only:
+        @event.listens_for(engine, "begin")
+        def on_begin(conn):
+            # take the write lock right away, a deferred transaction that upgrades to a write
+            # gets SQLITE_BUSY straight away instead of waiting on the busy timeout
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _profile(profile):
+    profile = profile or SETTINGS['LEDGER_SQLITE_PROFILE']
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown LEDGER_SQLITE_PROFILE: {profile!r} (one of {', '.join(PROFILES)})")
+    return profile
+
+
+def get_engine(read_only = False, path = None, profile = None):
 
     # the DB URI (ik normally this should be stored in the .env file along with the pass and username)
     # but since I'm already using sqlite it doesn't really matter... however this should be done with any other DB
-    BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    SQLALCHEMY_DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'db', 'assets.db')}"
+    path = path or get_db_path()
 
-    # let's create the Engine
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+    if _profile(profile) == "default":
+        # let's create the Engine (read_only or not, it's the same one engine for everything)
+        return create_engine(_url("sqlite", path, False), connect_args={"check_same_thread": False})
 
+    if read_only:
+        engine = create_engine(_url("sqlite", path, True), connect_args={"check_same_thread": False},
+                               pool_size=SETTINGS['LEDGER_SQLITE_READERS'], max_overflow=0)
+    else:
+        # a single connection -> the writes are serialized by the pool itself
+        engine = create_engine(_url("sqlite", path, False), connect_args={"check_same_thread": False},
+                               pool_size=1, max_overflow=0)
+
+    _use_wal_profile(engine, read_only)
     return engine
 
 engine = get_engine()
+read_engine = get_engine(read_only=True) if _profile(None) == "wal" else engine
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 def get_db():
     
@@ -33,8 +119,79 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+
+    # same as get_db() but for the routes that only read (the read only pool with the wal profile)
+    db = ReadSessionLocal()
+
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_async_engine(read_only = False, path = None, profile = None):
+
+    # same DB file but through aiosqlite so the async routes never block the event loop
+    # (aiosqlite runs every connection on its own thread so no check_same_thread here)
+    path = path or get_db_path()
+
+    if _profile(profile) == "default":
+        return create_async_engine(_url("sqlite+aiosqlite", path, False))
+
+    if read_only:
+        async_engine = create_async_engine(_url("sqlite+aiosqlite", path, True),
+                                           pool_size=SETTINGS['LEDGER_SQLITE_READERS'], max_overflow=0)
+    else:
+        async_engine = create_async_engine(_url("sqlite+aiosqlite", path, False), pool_size=1, max_overflow=0)
+
+    _use_wal_profile(async_engine.sync_engine, read_only)
+    return async_engine
+
+async_engine = get_async_engine()
+async_read_engine = get_async_engine(read_only=True) if _profile(None) == "wal" else async_engine
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+
+    # the async twin of get_db()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+
+    # the async twin of get_read_db()
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
 Base = declarative_base()
 def get_db_base():
     # return the shared Singleton Base
     return Base
 
+
+def init_db():
+
+    # the models have to be imported for their tables to be registered on Base
+    from backend.src.models import asset, asset_stats, asset_version  # noqa: F401
+    from backend.src.models.asset_search import ensure_search_index
+    from backend.src.models.asset_stats import ensure_value_stats
+    from backend.src.models.asset_version import ensure_data_version
+
+    # create_all only creates the indexes of the tables it creates itself so an existing DB
+    # (like the one in db/) would never get the new ones, hence the 2nd loop
+    Base.metadata.create_all(bind=engine)
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    # the SQLite side structures that live next to the tables (FTS index, stats / version triggers)
+    ensure_search_index(engine)
+    ensure_value_stats(engine)
+    ensure_data_version(engine)
+
@@ -0,0 +1,75 @@
+import os
+from dotenv import load_dotenv
+from typing import Any, Dict
+
+
+# unlike config.py nothing in here is required... these are just tuning knobs / feature switches
+# so every var has a default and a missing one never stops the app from starting
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _as_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def load_settings() -> Dict[str, Any]:
+    """Load the optional settings and fall back to the defaults when they're not set"""
+    load_dotenv()
+
+    # var : (default, caster, description)
+    optional_vars = {
+        'LEDGER_ASYNC_ROUTES': ('false', _as_bool, 'serve /assets with the async (aiosqlite) service'),
+        'LEDGER_CHAT_MEMORY_PATH': (os.path.join(BASE_DIR, 'db', 'checkpoints.db'), str, 'SQLite file holding the chat sessions'),
+        'LEDGER_CHAT_SESSION_TTL': ('86400', float, 'seconds a chat session can stay idle before it gets evicted'),
+        'LEDGER_CHAT_MAX_SESSIONS': ('10000', int, 'max chat sessions kept on disk (oldest evicted first)'),
+        'LEDGER_CHAT_CACHE_SIZE': ('1000', int, 'chat sessions kept in the in-memory LRU'),
+        'LEDGER_FAST_JSON': ('true', _as_bool, 'list / page / search responses as column tuples encoded straight to JSON (orjson), no ORM objects'),
+        'LEDGER_ASSET_CACHE': ('memory', str.lower, 'asset read cache backend: memory, redis or off'),
+        'LEDGER_ASSET_CACHE_TTL': ('60', float, 'seconds an asset stays in the read cache'),
+        'LEDGER_ASSET_CACHE_SIZE': ('10000', int, 'max assets kept in the in-memory read cache'),
+        'LEDGER_ANSWER_CACHE_SIZE': ('1000', int, 'DB manager answers kept in the cache, 0 switches it off'),
+        'LEDGER_ANSWER_CACHE_TTL': ('600', float, 'seconds a cached DB manager answer stays valid'),
+        'LEDGER_TOOL_CACHE_SIZE': ('512', int, 'DB manager tool results kept in the cache, 0 switches it off'),
+        'LEDGER_TOOL_CACHE_TTL': ('600', float, 'seconds a cached tool result stays valid'),
+        'LEDGER_TOOL_SNAPSHOT': ('false', _as_bool, 'every DB tool call of one agent run reads the same snapshot (wal profile only)'),
+        'LEDGER_LLM_RPM': ('30', float, 'LLM requests per minute shared by every model client and worker (Cerebras quota)'),
+        'LEDGER_LLM_BURST': ('1', float, 'LLM requests that can go out back to back before the RPM kicks in'),
+        'LEDGER_LLM_LIMITER_PATH': (os.path.join(BASE_DIR, 'db', 'llm_limiter.db'), str, 'SQLite file holding the shared LLM token bucket'),
+        'LEDGER_LLM_MAX_QUEUE': ('32', int, 'LLM calls allowed to wait for a token before /agent/query answers 429'),
+        'LEDGER_LLM_MAX_QUEUE_WAIT': ('60', float, 'estimated seconds of LLM queue wait before /agent/query answers 429'),
+        'LEDGER_AGENTS': ('true', _as_bool, 'serve the agent routes (/agent, /ws), false -> a CRUD-only worker that never loads the LLM stack'),
+        'LEDGER_LLM_PROVIDER': ('cerebras', str.lower, 'cerebras, or fake for the scripted offline stand-in (agents/fake_llm.py)'),
+        'LEDGER_FAKE_LLM_SCRIPT': ('', str, 'JSON script the fake LLM replays, empty -> the built-in one'),
+        'LEDGER_FAKE_LLM_LATENCY': ('0.05', float, 'seconds every fake LLM call takes'),
+        'LEDGER_FAKE_LLM_TOKEN_LATENCY': ('0', float, 'extra seconds per output token of a fake LLM call'),
+        'LEDGER_AGENT_MODE': ('two_agent', str.lower, 'two_agent (AssetManager -> DBManager) or single (AssetManager calls the DB tools itself)'),
+        'LEDGER_COALESCE_QUERIES': ('true', _as_bool, 'identical stateless questions in flight at the same time share one agent run'),
+        'LEDGER_FAST_PATH': ('true', _as_bool, 'answer simple stat/lookup questions from templates without the agents'),
+        'LEDGER_LOG_FILE': (os.path.join(BASE_DIR, 'logs', 'ledger.log'), str, 'log file (rotated, the old ones get a .1, .2 ... suffix)'),
+        'LEDGER_LOG_FORMAT': ('json', str.lower, 'log records as json lines or plain text'),
+        'LEDGER_LOG_LEVEL': ('INFO', str.upper, 'minimum level written to the log file'),
+        'LEDGER_LOG_MAX_BYTES': ('10485760', int, 'size at which the log file is rotated'),
+        'LEDGER_LOG_ROTATE_WHEN': ('', str, 'rotate by time instead of size: midnight, H, D, W0...'),
+        'LEDGER_LOG_BACKUPS': ('5', int, 'rotated log files kept, older ones are deleted'),
+        'LEDGER_REDIS_URL': ('redis://localhost:6379/0', str, 'redis used when LEDGER_ASSET_CACHE=redis'),
+        'LEDGER_SQLITE_PROFILE': ('default', str.lower, 'SQLite storage profile: default or wal (WAL + read pool + single writer)'),
+        'LEDGER_SQLITE_READERS': ('8', int, 'read only connections in the pool (wal profile)'),
+        'LEDGER_SQLITE_BUSY_TIMEOUT': ('5', float, 'seconds a connection waits on a lock before "database is locked" (wal profile)'),
+        'LEDGER_SQLITE_MMAP_SIZE': ('268435456', int, 'bytes of the DB file memory mapped (wal profile)'),
+        'LEDGER_SQLITE_CACHE_KB': ('65536', int, 'page cache per connection in KiB (wal profile)'),
+    }
+
+    settings = {}
+    for var, (default, caster, description) in optional_vars.items():
+        value = os.getenv(var, default)
+        try:
+            settings[var] = caster(value)
+        except ValueError:
+            raise ValueError(f"Invalid value for optional environment variable: {var} ({description}) got {value!r}")
+
+    return settings
+
+
+SETTINGS = load_settings()
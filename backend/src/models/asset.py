@@ -1,4 +1,4 @@
-from sqlalchemy import Column , String , DateTime , Float
+from sqlalchemy import Column , String , DateTime , Float , Index
 from sqlalchemy.sql import func
 import uuid
 
@@ -21,4 +21,13 @@ class Asset(base):
     purchase_date = Column(DateTime , nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # the sort key of the keyset (cursor) pagination
+        Index("ix_assets_created_at_id", "created_at", "id"),
+        # max / min lookups, overall and per scope (also what the stats triggers use to find the next min / max)
+        Index("ix_assets_value", "value"),
+        Index("ix_assets_category_value", "category", "value"),
+        Index("ix_assets_status_value", "status", "value"),
+    )
+
 
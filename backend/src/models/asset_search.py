@@ -0,0 +1,93 @@
+from sqlalchemy import text
+import sys
+
+
+"""
+    full text search index over assets.name / assets.category
+
+    it's an SQLite FTS5 table with the trigram tokenizer, so any substring of 3+ chars (prefixes included)
+    is an index lookup instead of the LIKE '%q%' full table scan. it's an "external content" table
+    (the text itself stays in assets, FTS only keeps the index) and the triggers below keep it in sync
+    with every insert / update / delete no matter who writes (sync service, async service, bulk import...)
+
+    heads up: it's keyed on the implicit rowid of assets, a VACUUM can renumber those so run
+        python -m backend.src.models.asset_search rebuild
+    after one (or whenever you think the index drifted)
+"""
+
+SEARCH_TABLE = "assets_fts"
+
+_CREATE_TABLE = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+    name, category,
+    content='assets', content_rowid='rowid',
+    tokenize='trigram'
+)
+"""
+
+_CREATE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS assets_fts_after_insert AFTER INSERT ON assets BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, name, category) VALUES (new.rowid, new.name, new.category);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS assets_fts_after_delete AFTER DELETE ON assets BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, category) VALUES ('delete', old.rowid, old.name, old.category);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS assets_fts_after_update AFTER UPDATE OF name, category ON assets BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, category) VALUES ('delete', old.rowid, old.name, old.category);
+        INSERT INTO {SEARCH_TABLE}(rowid, name, category) VALUES (new.rowid, new.name, new.category);
+    END
+    """,
+]
+
+
+def ensure_search_index(engine) -> bool:
+    """
+        create the FTS table + triggers if they're not there yet (and index the existing rows),
+        returns False if this SQLite build has no FTS5 / trigram support (search falls back to LIKE then)
+    """
+
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SEARCH_TABLE}
+        ).first()
+
+        try:
+            conn.execute(text(_CREATE_TABLE))
+        except Exception as e:
+            print(f"Full text search is disabled, SQLite doesn't support FTS5 trigram here: {e}")
+            return False
+
+        for trigger in _CREATE_TRIGGERS:
+            conn.execute(text(trigger))
+
+        if not exists:
+            # a brand new index over an existing table, fill it up
+            conn.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"))
+
+    return True
+
+
+def rebuild_search_index(engine):
+    "re-index every asset from scratch"
+
+    with engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"))
+        conn.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')"))
+
+
+if __name__ == "__main__":
+
+    from backend.src.core.database import engine
+
+    if sys.argv[1:] != ["rebuild"]:
+        print("usage: python -m backend.src.models.asset_search rebuild")
+        sys.exit(1)
+
+    ensure_search_index(engine)
+    rebuild_search_index(engine)
+    print("Search index rebuilt.")
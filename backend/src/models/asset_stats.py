@@ -0,0 +1,148 @@
+from sqlalchemy import Column , String , Float , Integer , text
+import sys
+
+from backend.src.core.database import get_db_base
+
+
+base = get_db_base()
+
+
+"""
+    pre-aggregated value statistics (count / sum / min / max) of the assets, overall and per category / status
+
+    the rows are maintained by SQLite triggers on every insert / update / delete of assets (same idea as the
+    FTS index in asset_search.py) so every writer keeps them right, and reading the stats is a primary key
+    lookup no matter how big the table is:
+        scope = 'all'       key = ''
+        scope = 'category'  key = <category>
+        scope = 'status'    key = <status>
+
+    count / total are updated incrementally. min / max are too, except when the current min / max row goes
+    away, then that scope's min / max is looked up again through the (scope column, value) index which is
+    an index seek and not a scan.
+
+    if it ever drifts (float sums, manual edits to the DB file...) run
+        python -m backend.src.models.asset_stats rebuild
+"""
+
+
+class AssetValueStats(base):
+
+    __tablename__ = "asset_value_stats"
+
+    scope = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0.0)
+    min_value = Column(Float, nullable=True)
+    max_value = Column(Float, nullable=True)
+
+
+# (scope, the assets column it groups by or None for the overall row)
+_SCOPES = [("all", None), ("category", "category"), ("status", "status")]
+
+
+def _key(row: str, column):
+    return "''" if column is None else f"COALESCE({row}.{column}, '')"
+
+
+def _scope_filter(row: str, column):
+    return "" if column is None else f"WHERE {column} IS {row}.{column}"
+
+
+def _add(row: str, scope: str, column) -> str:
+    # INSERT .. SELECT .. WHERE so the NULL value guard can live inside the statement
+    return f"""
+        INSERT INTO asset_value_stats (scope, key, count, total, min_value, max_value)
+        SELECT '{scope}', {_key(row, column)}, 1, {row}.value, {row}.value, {row}.value WHERE {row}.value IS NOT NULL
+        ON CONFLICT (scope, key) DO UPDATE SET
+            count = count + 1,
+            total = total + excluded.total,
+            min_value = CASE WHEN count = 0 OR excluded.min_value < min_value THEN excluded.min_value ELSE min_value END,
+            max_value = CASE WHEN count = 0 OR excluded.max_value > max_value THEN excluded.max_value ELSE max_value END;
+    """
+
+
+def _remove(row: str, scope: str, column) -> str:
+    # runs AFTER the row is gone (or moved), so the sub selects only see what's left in that scope
+    return f"""
+        UPDATE asset_value_stats SET
+            count = count - 1,
+            total = CASE WHEN count = 1 THEN 0.0 ELSE total - {row}.value END,
+            min_value = CASE
+                WHEN count = 1 THEN NULL
+                WHEN {row}.value <= min_value THEN (SELECT MIN(value) FROM assets {_scope_filter(row, column)})
+                ELSE min_value END,
+            max_value = CASE
+                WHEN count = 1 THEN NULL
+                WHEN {row}.value >= max_value THEN (SELECT MAX(value) FROM assets {_scope_filter(row, column)})
+                ELSE max_value END
+        WHERE scope = '{scope}' AND key = {_key(row, column)} AND {row}.value IS NOT NULL;
+    """
+
+
+_CREATE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS asset_stats_after_insert AFTER INSERT ON assets BEGIN
+        {"".join(_add("new", scope, column) for scope, column in _SCOPES)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS asset_stats_after_delete AFTER DELETE ON assets BEGIN
+        {"".join(_remove("old", scope, column) for scope, column in _SCOPES)}
+    END
+    """,
+    # an update is just "remove the old row, add the new one"
+    f"""
+    CREATE TRIGGER IF NOT EXISTS asset_stats_after_update AFTER UPDATE OF value, category, status ON assets BEGIN
+        {"".join(_remove("old", scope, column) for scope, column in _SCOPES)}
+        {"".join(_add("new", scope, column) for scope, column in _SCOPES)}
+    END
+    """,
+]
+
+
+def _backfill(conn):
+    conn.execute(text("DELETE FROM asset_value_stats"))
+    for scope, column in _SCOPES:
+        key = "''" if column is None else f"COALESCE({column}, '')"
+        group_by = "" if column is None else f"GROUP BY {key}"
+        conn.execute(text(f"""
+            INSERT INTO asset_value_stats (scope, key, count, total, min_value, max_value)
+            SELECT '{scope}', {key}, COUNT(value), COALESCE(SUM(value), 0.0), MIN(value), MAX(value)
+            FROM assets WHERE value IS NOT NULL {group_by}
+        """))
+
+
+def create_value_stats(conn):
+    "create the triggers (the table itself comes from create_all) and fill the stats if they were never computed"
+
+    for trigger in _CREATE_TRIGGERS:
+        conn.execute(text(trigger))
+
+    if conn.execute(text("SELECT 1 FROM asset_value_stats LIMIT 1")).first() is None:
+        _backfill(conn)
+
+
+def ensure_value_stats(engine):
+    with engine.begin() as conn:
+        create_value_stats(conn)
+
+
+def rebuild_value_stats(engine):
+    "recompute every stats row from scratch"
+    with engine.begin() as conn:
+        _backfill(conn)
+
+
+if __name__ == "__main__":
+
+    from backend.src.core.database import engine, init_db
+
+    if sys.argv[1:] != ["rebuild"]:
+        print("usage: python -m backend.src.models.asset_stats rebuild")
+        sys.exit(1)
+
+    init_db()
+    rebuild_value_stats(engine)
+    print("Asset value statistics rebuilt.")
@@ -0,0 +1,52 @@
+from sqlalchemy import Column , Integer , String , select , text
+
+from backend.src.core.database import get_db_base
+
+
+base = get_db_base()
+
+
+"""
+    a single row counter that goes up on every write to the assets table
+
+    like the FTS index and the value stats it's bumped by SQLite triggers, so every writer (sync / async
+    service, bulk import, a manual sqlite3 session...) moves it and nobody can forget to. the API uses it
+    to build the ETag / Last-Modified of the asset responses (see utils/etag.py): same version -> same
+    data -> 304 without running the real query.
+"""
+
+
+class AssetDataVersion(base):
+
+    __tablename__ = "asset_data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    # ISO 8601 UTC of the last write, what Last-Modified is built from
+    updated_at = Column(String, nullable=False)
+
+
+VERSION_QUERY = select(AssetDataVersion.version, AssetDataVersion.updated_at).where(AssetDataVersion.id == 1)
+
+_NOW = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+_BUMP = f"UPDATE asset_data_version SET version = version + 1, updated_at = {_NOW} WHERE id = 1;"
+
+_CREATE_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS asset_version_after_{event} AFTER {event.upper()} ON assets BEGIN {_BUMP} END"
+    for event in ("insert", "update", "delete")
+]
+
+
+def create_data_version(conn):
+    "the counter row + its triggers (the table itself comes from create_all)"
+
+    conn.execute(text(f"INSERT OR IGNORE INTO asset_data_version (id, version, updated_at) VALUES (1, 0, {_NOW})"))
+
+    for trigger in _CREATE_TRIGGERS:
+        conn.execute(text(trigger))
+
+
+def ensure_data_version(engine):
+    with engine.begin() as conn:
+        create_data_version(conn)
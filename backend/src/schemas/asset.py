@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -36,7 +36,38 @@ class AssetResponse(AssetBase):
         from_attributes = True
 
 
+# schema for a page of the cursor pagination [GET /assets/page]
+class AssetPage(BaseModel):
+    items: List[AssetResponse]
+    next_cursor: Optional[str] = Field(None, description="pass it back as ?cursor= to get the next page, null on the last page")
+    has_more: bool
 
 
+# schema for the value statistics [GET /assets/stats]
+class AssetStats(BaseModel):
+    scope: str = Field(..., description="all, category or status")
+    key: str = Field(..., description="the category / status the stats are for, empty for all")
+    count: int
+    total: float
+    mean: float
+    min_value: float
+    max_value: float
 
 
+# schemas for the bulk import report [POST /assets/import]
+class AssetImportError(BaseModel):
+    line: Optional[int] = Field(None, description="line of the rejected record in the uploaded file, null when the whole batch failed")
+    error: str
+
+
+class AssetImportBatch(BaseModel):
+    batch: int
+    inserted: int
+    failed: int
+    errors: List[AssetImportError]
+
+
+class AssetImportReport(BaseModel):
+    inserted: int
+    failed: int
+    batches: List[AssetImportBatch]
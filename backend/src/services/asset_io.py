@@ -0,0 +1,195 @@
+import csv
+import io
+import json
+import uuid
+from datetime import date , datetime , timezone
+
+from pydantic import ValidationError
+
+from backend.src.models.asset import Asset
+from backend.src.schemas.asset import AssetCreate
+
+
+"""
+    streaming bulk import / export helpers shared by the sync and the async asset routes
+
+    import: the request body is read chunk by chunk, cut into lines (NDJSON) or records (CSV), validated
+    against AssetCreate IMPORT_BATCH_SIZE records at a time and every batch goes to the DB as a single
+    executemany in its own transaction, so memory stays bounded by the batch and one bad batch doesn't
+    throw away the ones before it. every batch gets its own entry in the report (what got in + which lines
+    were rejected and why).
+
+    export: the rows come out of a server side cursor (yield_per) as plain column tuples and get encoded
+    one batch at a time, so exporting the whole table costs the same memory as exporting 1000 rows.
+"""
+
+FORMATS = ("ndjson", "csv")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+IMPORT_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+
+# what an export row is made of, AssetCreate ignores the extra id so an export can be imported back
+EXPORT_COLUMNS = (Asset.id, Asset.name, Asset.category, Asset.value, Asset.quantity, Asset.status, Asset.purchase_date)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+def detect_format(format: str = None, content_type: str = None) -> str:
+    "an explicit ?format= wins, then the Content-Type, NDJSON otherwise"
+    if format:
+        return format
+    if content_type and "csv" in content_type.lower():
+        return "csv"
+    return "ndjson"
+
+
+# ---------------------------------------------------------------- import
+
+async def _iter_lines(chunks):
+    "bytes chunks -> (line number, line) with the newline kept (the CSV parser needs it for quoted multi line fields)"
+    buffer = b""
+    number = 0
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            number += 1
+            yield number, (line + b"\n").decode("utf-8-sig" if number == 1 else "utf-8", errors="replace")
+
+    if buffer:
+        yield number + 1, buffer.decode("utf-8-sig" if number == 0 else "utf-8", errors="replace")
+
+
+async def _iter_ndjson(lines):
+    async for number, line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "expected a JSON object"
+            continue
+        yield number, record, None
+
+
+async def _iter_csv(lines):
+    header = None
+    pending, first = "", None
+
+    async for number, line in lines:
+        pending += line
+        first = first or number
+
+        # a quoted field can span lines, wait until the quotes are balanced
+        if pending.count('"') % 2:
+            continue
+
+        record, pending, start, first = pending, "", first, None
+        if not record.strip():
+            continue
+
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        if len(values) != len(header):
+            yield start, None, f"expected {len(header)} columns, got {len(values)}"
+            continue
+
+        # empty cells are missing values (purchase_date mostly) and not empty strings
+        yield start, {name: value for name, value in zip(header, values) if value != ""}, None
+
+    if pending.strip():
+        yield first, None, "unterminated quoted field"
+
+
+async def iter_import_batches(chunks, format: str, batch_size: int = IMPORT_BATCH_SIZE):
+    "the raw body chunks -> batches of (line number, record or None, parse error or None)"
+    lines = _iter_lines(chunks)
+    records = _iter_csv(lines) if format == "csv" else _iter_ndjson(lines)
+
+    batch = []
+    async for item in records:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors())
+
+
+def validate_batch(batch):
+    """
+        returns (rows ready for an executemany insert, [{"line", "error"}] of the rejected records)
+        the rows get their id / created_at here the same way AssetService.create_asset does it
+    """
+    rows, errors = [], []
+
+    for number, record, error in batch:
+        if error is not None:
+            errors.append({"line": number, "error": error})
+            continue
+        try:
+            asset = AssetCreate.model_validate(record)
+        except ValidationError as e:
+            errors.append({"line": number, "error": _describe(e)})
+            continue
+
+        rows.append({**asset.model_dump(), "id": str(uuid.uuid4()), "created_at": datetime.now(timezone.utc)})
+
+    return rows, errors
+
+
+def new_import_report():
+    return {"inserted": 0, "failed": 0, "batches": []}
+
+
+def add_batch_to_report(report, rows, inserted, errors, db_error=None):
+    "records one batch, if the insert itself failed every row of the batch counts as failed"
+    failed = len(errors)
+
+    if db_error is not None:
+        failed, inserted = failed + len(rows), 0
+        errors = errors + [{"line": None, "error": f"batch rolled back: {db_error}"}]
+
+    report["inserted"] += inserted
+    report["failed"] += failed
+    report["batches"].append({"batch": len(report["batches"]) + 1, "inserted": inserted, "failed": failed, "errors": errors})
+    return report
+
+
+# ---------------------------------------------------------------- export
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def export_header(format: str) -> str:
+    if format != "csv":
+        return ""
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerow(EXPORT_FIELDS)
+    return out.getvalue()
+
+
+def encode_rows(rows, format: str) -> str:
+    "one batch of export rows (column tuples) -> one chunk of the response body"
+    if format == "csv":
+        out = io.StringIO()
+        csv.writer(out, lineterminator="\n").writerows([_plain(value) for value in row] for row in rows)
+        return out.getvalue()
+
+    return "".join(json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row)))) + "\n" for row in rows)
+
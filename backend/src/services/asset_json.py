@@ -0,0 +1,54 @@
+import json
+from datetime import date , datetime , timezone
+
+from fastapi import Response
+
+from backend.src.models.asset import Asset
+from backend.src.schemas.asset import AssetResponse
+
+try:
+    # optional, the same bytes come out of the stdlib json (just slower)
+    import orjson
+except ImportError:
+    orjson = None
+
+
+"""
+    ORM free JSON for the asset list / search responses (LEDGER_FAST_JSON)
+
+    the slow part of a 100+ rows response isn't SQLite, it's building an Asset object per row (identity
+    map, instance state), then an AssetResponse per row (validation) and then serializing those. here the
+    service selects ROW_COLUMNS as plain tuples (as_rows=True), they get zipped with the field names and
+    encoded straight to bytes with orjson into a raw Response.
+
+    ROW_COLUMNS are the AssetResponse fields in the same order, so the body is the JSON the response_model
+    would have produced and the routes keep their response_model, i.e. the OpenAPI schema doesn't change.
+"""
+
+ROW_FIELDS = list(AssetResponse.model_fields)
+ROW_COLUMNS = tuple(getattr(Asset, name) for name in ROW_FIELDS)
+
+
+def as_dicts(rows) -> list:
+    "ROW_COLUMNS tuples -> AssetResponse shaped dicts (extra trailing columns like a page cursor are ignored)"
+    return [dict(zip(ROW_FIELDS, row)) for row in rows]
+
+
+def _default(value):
+    # what orjson does by itself, pydantic writes UTC as Z too
+    if isinstance(value, datetime) and value.tzinfo is not None and value.utcoffset() == timezone.utc.utcoffset(None):
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+def response(content, headers: dict = None) -> Response:
+    "an already JSON-able body as a raw application/json Response, FastAPI doesn't validate / re-encode it"
+    return Response(content=dumps(content), media_type="application/json", headers=headers)
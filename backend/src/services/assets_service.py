@@ -1,17 +1,27 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_ , asc , desc , func
+from sqlalchemy import or_ , asc , desc , func , insert , select
+from sqlalchemy.exc import OperationalError
 import uuid
 from datetime import datetime , timezone
 
 from backend.src.models.asset import Asset
+from backend.src.models.asset_stats import AssetValueStats
+from backend.src.models.asset_version import VERSION_QUERY
 from backend.src.schemas.asset import AssetCreate, AssetUpdate
+from backend.src.services import search
+from backend.src.services.asset_json import ROW_COLUMNS
+from backend.src.services.asset_io import EXPORT_BATCH_SIZE, EXPORT_COLUMNS
+from backend.src.services.cache import snapshot
+from backend.src.services.pagination import CURSOR_COLUMN, PAGE_ORDER, after_cursor, encode_cursor
 
 
 class AssetService:
     
-    def __init__(self, db: Session, logger):
+    def __init__(self, db: Session, logger, cache = None):
         self.db = db
         self.logger = logger
+        # optional read-through cache for get_asset_by_id (see services/cache.py), None -> always the DB
+        self.cache = cache
 
     def create_asset(self, asset: AssetCreate):
 
@@ -45,8 +55,24 @@ class AssetService:
             return None, str(e)
 
 
-    def get_asset_by_id(self, asset_id):
-        "retrieving an a single asset from the DB"
+    def get_asset_by_id(self, asset_id, cached = True, data_version = None):
+        """
+            retrieving an a single asset from the DB (or the cache)
+            a cache hit is a detached Asset built from the snapshot so it's only good for reading,
+            update / delete pass cached=False to get the real row bound to the session
+            data_version: the (version, updated_at) the caller already read (the route does for the ETag),
+            looked up here otherwise, a cache entry is only trusted while it's still the current one
+        """
+
+        if cached and self.cache is not None and data_version is None:
+            data_version, _ = self.get_data_version()
+
+        if cached:
+            hit = self._cache_get(asset_id, data_version)
+            if hit is not None:
+                self.logger.info("retrieving an Asset record from the cache")
+                return Asset(**hit), None
+
         try:
             asset = self.db.query(Asset).filter(Asset.id == asset_id).first()
 
@@ -54,18 +80,65 @@ class AssetService:
                 self.logger.warning(f"Asset with ID {asset_id} not found")
                 return None, "Asset not found"
             
+            if cached:
+                self._cache_set(asset_id, asset, data_version)
+
             self.logger.info("retrieving an Asset record from the DB")
             return asset, None
         except Exception as e:
             self.logger.error(f"DB Error: {e}")
             return None, str(e)
-        
 
-    def get_all_assets(self, skip = 0, limit = 100):
 
-        "retrieving all the assets in the DB"
+    # the cache is only ever an optimization, if it's down (redis...) we just go to the DB.
+    # an entry carries the data version it was read at and only comes back while it's still the current one,
+    # so a write (from any worker) is all the invalidation there is, nothing to drop by id.
+    # no version (data version table missing) -> no caching at all
+    def _cache_get(self, asset_id, data_version):
+        if self.cache is None or data_version is None:
+            return None
+        try:
+            return self.cache.get(asset_id, tuple(data_version))
+        except Exception as e:
+            self.logger.warning(f"asset cache unavailable: {e}")
+            return None
+
+    def _cache_set(self, asset_id, asset, data_version):
+        if self.cache is None or data_version is None:
+            return
+        try:
+            self.cache.set(asset_id, snapshot(asset), tuple(data_version))
+        except Exception as e:
+            self.logger.warning(f"asset cache unavailable: {e}")
+
+    def get_data_version(self):
+
+        """
+            (version, updated_at) of the assets table, both move on every write (see models/asset_version.py)
+            read it BEFORE the data it's going to tag
+        """
         try:
-            assets = self.db.query(Asset).offset(skip).limit(limit).all()
+            row = (self.db.execute(VERSION_QUERY)).first()
+
+            if row is None:
+                self.logger.warning("the assets data version isn't initialized (init_db not run?)")
+                return None, "Data version not found"
+
+            return (row.version, row.updated_at), None
+        except Exception as e:
+            self.logger.error(f"DB Error: {e}")
+            return None, str(e)
+
+
+    def get_all_assets(self, skip = 0, limit = 100, as_rows = False):
+
+        """
+            retrieving all the assets in the DB
+            as_rows=True -> plain ROW_COLUMNS tuples instead of Asset objects (see services/asset_json.py)
+        """
+        try:
+            query = self.db.query(*ROW_COLUMNS) if as_rows else self.db.query(Asset)
+            assets = query.offset(skip).limit(limit).all()
 
             if not assets:
                 self.logger.warning("No Assets found in the DB")
@@ -79,10 +152,80 @@ class AssetService:
             return None, str(e)
         
 
+    def get_assets_page(self, cursor = None, limit = 100, as_rows = False):
+
+        """
+            retrieving one page of assets with keyset (cursor) pagination, unlike get_all_assets
+            the cost of a page doesn't grow with how deep it is.
+            returns (assets, next_cursor) where next_cursor is None on the last page
+            (as_rows=True -> the assets are ROW_COLUMNS tuples, the cursor column trailing)
+        """
+        try:
+            query = self.db.query(*ROW_COLUMNS, CURSOR_COLUMN) if as_rows else self.db.query(Asset, CURSOR_COLUMN)
+
+            if cursor:
+                query = query.filter(after_cursor(cursor))
+
+        except ValueError as e:
+            self.logger.warning(f"Got an invalid cursor: {cursor}")
+            return None, str(e)
+
+        try:
+            # one extra row tells us if there's a next page without a COUNT(*)
+            rows = query.order_by(*PAGE_ORDER).limit(limit + 1).all()
+
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            next_cursor = None
+            if has_more:
+                last = rows[-1]
+                next_cursor = encode_cursor(last.cursor_created_at, last.id if as_rows else last[0].id)
+
+            self.logger.info("retrieving a page of Assets from the DB")
+            return (rows if as_rows else [asset for asset, _ in rows], next_cursor), None
+
+        except Exception as e:
+            self.logger.error(f"DB Error: {e}")
+            return None, str(e)
+
+
+    def bulk_create_assets(self, rows: list):
+
+        """
+            insert a batch of already validated asset rows (see asset_io.validate_batch) in one transaction,
+            it's a single executemany so no ORM objects / commit / refresh per row like create_asset
+        """
+
+        try:
+            self.db.execute(insert(Asset), rows)
+            self.db.commit()
+            self.logger.info(f"Bulk inserted {len(rows)} assets")
+            return len(rows), None
+
+        except Exception as e:
+            self.logger.error(f"couldn't bulk insert {len(rows)} assets ... error: {e}")
+            self.db.rollback()
+            return None, str(e)
+
+
+    def iter_asset_rows(self, batch_size = EXPORT_BATCH_SIZE):
+
+        """
+            every asset as plain column tuples (EXPORT_COLUMNS), batch_size rows at a time from a server side
+            cursor so the whole table is never in memory, it's a generator so errors are raised not returned
+        """
+
+        query = select(*EXPORT_COLUMNS).order_by(*PAGE_ORDER).execution_options(yield_per=batch_size)
+
+        for rows in self.db.execute(query).partitions():
+            yield rows
+
+
     def update_asset(self, asset_update : AssetUpdate ,asset_id):
 
-        # get the the asset to update
-        db_asset, error = self.get_asset_by_id(asset_id)
+        # get the the asset to update (the real row, not a cached copy)
+        db_asset, error = self.get_asset_by_id(asset_id, cached=False)
 
         # check if we actually got somehting
         if error:
@@ -109,7 +252,7 @@ class AssetService:
     def delete_asset(self, asset_id):
 
         # 1st let's get the asset record
-        asset, error = self.get_asset_by_id(asset_id)
+        asset, error = self.get_asset_by_id(asset_id, cached=False)
 
         if error:
             return False, error
@@ -126,32 +269,71 @@ class AssetService:
             self.db.rollback()
             return False, str(e)
         
-    def search_asset(self , query : str):
-        "a method to search for asset by its name or category"
+    def search_asset(self , query : str, limit = 100, as_rows = False):
+        """
+            a method to search for asset by its name or category
+            goes through the FTS5 trigram index (ranked, typo tolerant) and only falls back to
+            a LIKE scan for queries too short for the index (or if the index isn't there)
+            as_rows=True -> plain ROW_COLUMNS tuples instead of Asset objects
+        """
 
         try:
-            result = self.db.query(Asset).filter(
-                or_(
-                    Asset.name.ilike(f"%{query}%"),
-                    Asset.category.ilike(f"%{query}%")
-                )
-            ).all()
+            result = self._full_text_search(query, limit, as_rows)
+
+            if result is None:
+                result = (self.db.query(*ROW_COLUMNS) if as_rows else self.db.query(Asset)).filter(
+                    or_(
+                        Asset.name.ilike(f"%{query}%"),
+                        Asset.category.ilike(f"%{query}%")
+                    )
+                ).limit(limit).all()
 
             if not result:
                 self.logger.warning("No Assets found in the DB")
                 return [] , None
             
-            self.logger.info(f"query : {query} returned smth {result}")
+            self.logger.info("query : %s returned %d assets", query, len(result))
             return result , None
         except Exception as e:
             self.logger.error(f"DB error while querying it {e}")
             return None , str(e)
+
+    def _full_text_search(self, query : str, limit, as_rows = False):
+        "ranked search through the index, None means the index can't answer this one"
+
+        if not search.can_use_index(query):
+            return None
+
+        columns = ROW_COLUMNS if as_rows else None
+
+        def fetch(statement, params):
+            result = self.db.execute(statement, params)
+            return result.all() if as_rows else result.scalars().all()
+
+        try:
+            result = fetch(*search.phrase_statement(query, limit, columns))
+
+            if not result:
+                result = search.keep_similar(query, fetch(*search.fuzzy_statement(query, limit, columns)), limit)
+
+            return result
+
+        except OperationalError as e:
+            # no assets_fts table (old SQLite without FTS5 / DB created elsewhere)
+            self.logger.warning(f"full text search unavailable, falling back to LIKE: {e}")
+            self.db.rollback()
+            return None
         
     
-    def get_max_value(self):
+    def get_max_value(self, category = None):
 
         try:
-            asset = self.db.query(Asset).order_by(Asset.value.desc()).first()
+            query = self.db.query(Asset)
+            if category is not None:
+                query = query.filter(Asset.category == category)
+
+            # ix_assets_value / ix_assets_category_value make this an index seek
+            asset = query.order_by(Asset.value.desc()).first()
 
             if asset is None:
                 self.logger.warning(f"Couldn't find max value for any asset")
@@ -163,10 +345,14 @@ class AssetService:
             self.logger.error(f"DB Error: {e}")
             return None, str(e)
         
-    def get_min_value(self):
+    def get_min_value(self, category = None):
 
         try:
-            asset = self.db.query(Asset).order_by(Asset.value.asc()).first()
+            query = self.db.query(Asset)
+            if category is not None:
+                query = query.filter(Asset.category == category)
+
+            asset = query.order_by(Asset.value.asc()).first()
 
             if asset is None:
                 self.logger.warning(f"Couldn't find min value for any asset")
@@ -178,22 +364,64 @@ class AssetService:
             self.logger.error(f"DB Error: {e}")
             return None, str(e)
         
-    def get_asset_values_mean(self):
+    def get_asset_values_mean(self, category = None):
+
+        stats, error = self.get_value_statistics(category=category)
+
+        if error:
+            self.logger.warning(f"Couldn't find the avg value for the assets")
+            return None, error
+
+        self.logger.info("retrieving the mean value of the assets")
+        return stats["mean"], None
+
+    def get_value_statistics(self, category = None, status = None):
+
+        """
+            count / total / mean / min / max of the asset values, for everything or for one category (or status).
+            it's read from the asset_value_stats table the triggers keep up to date so it's a primary key
+            lookup whatever the size of the assets table
+        """
+
+        if category is not None:
+            scope, key = "category", category
+        elif status is not None:
+            scope, key = "status", status
+        else:
+            scope, key = "all", ""
 
         try:
-            result = self.db.query(func.avg(Asset.value)).scalar()
+            stats = self.db.get(AssetValueStats, (scope, key))
 
-            if result is None:
-                self.logger.warning(f"Couldn't find the avg value for the assets")
+            if stats is None or not stats.count:
+                self.logger.warning(f"No asset values to compute statistics for ({scope}={key})")
                 return None, "Asset not found"
-            
-            self.logger.info("retrieving the mean value of the assets")
-            return round(result, 2), None if result else 0.0 , None
+
+            self.logger.info("retrieving the asset value statistics")
+            return {
+                "scope": scope,
+                "key": key,
+                "count": stats.count,
+                "total": round(stats.total, 2),
+                "mean": round(stats.total / stats.count, 2),
+                "min_value": stats.min_value,
+                "max_value": stats.max_value,
+            }, None
         except Exception as e:
             self.logger.error(f"DB Error: {e}")
             return None, str(e)
 
-        
+    def get_categories(self):
 
+        "every category that currently has assets, straight from the stats table (no scan of assets)"
 
+        try:
+            rows = self.db.query(AssetValueStats.key).filter(
+                AssetValueStats.scope == "category", AssetValueStats.count > 0
+            ).all()
 
+            self.logger.info("retrieving the asset categories")
+            return [key for key, in rows], None
+        except Exception as e:
+            self.logger.error(f"DB Error: {e}")
+            return None, str(e)
@@ -0,0 +1,388 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select , or_ , func , insert
+from sqlalchemy.exc import OperationalError
+import uuid
+from datetime import datetime , timezone
+
+from backend.src.models.asset import Asset
+from backend.src.models.asset_stats import AssetValueStats
+from backend.src.models.asset_version import VERSION_QUERY
+from backend.src.schemas.asset import AssetCreate, AssetUpdate
+from backend.src.services import search
+from backend.src.services.asset_json import ROW_COLUMNS
+from backend.src.services.asset_io import EXPORT_BATCH_SIZE, EXPORT_COLUMNS
+from backend.src.services.cache import snapshot
+from backend.src.services.pagination import CURSOR_COLUMN, PAGE_ORDER, after_cursor, encode_cursor
+
+
+class AsyncAssetService:
+
+    """
+        the async twin of AssetService, same methods and the same (result, error) return style
+        but every DB call is awaited on an AsyncSession so the event loop is never blocked
+    """
+
+    def __init__(self, db: AsyncSession, logger, cache = None):
+        self.db = db
+        self.logger = logger
+        # same read-through cache as AssetService (the in-memory one never blocks, a redis one does
+        # a quick network round trip on the loop)
+        self.cache = cache
+
+    async def create_asset(self, asset: AssetCreate):
+
+        try:
+
+            asset = Asset(
+                id = str(uuid.uuid4()),
+                name = asset.name,
+                category=asset.category,
+                value=asset.value,
+                quantity=asset.quantity,
+                status=asset.status,
+                purchase_date=asset.purchase_date,
+                created_at=datetime.now(timezone.utc)
+            )
+
+            self.db.add(asset)
+            await self.db.commit()
+            await self.db.refresh(asset)
+            self.logger.info("Logged an asset record to the DB")
+            return asset, None
+
+        except Exception as e:
+            self.logger.error(f"couldn't log the asset to the DB ... error: {e}")
+            await self.db.rollback()
+            return None, str(e)
+
+
+    async def get_asset_by_id(self, asset_id, cached = True, data_version = None):
+        "retrieving an a single asset from the DB (or the cache), see AssetService.get_asset_by_id"
+
+        if cached and self.cache is not None and data_version is None:
+            data_version, _ = await self.get_data_version()
+
+        if cached:
+            hit = self._cache_get(asset_id, data_version)
+            if hit is not None:
+                self.logger.info("retrieving an Asset record from the cache")
+                return Asset(**hit), None
+
+        try:
+            asset = await self.db.get(Asset, asset_id)
+
+            if asset is None:
+                self.logger.warning(f"Asset with ID {asset_id} not found")
+                return None, "Asset not found"
+
+            if cached:
+                self._cache_set(asset_id, asset, data_version)
+
+            self.logger.info("retrieving an Asset record from the DB")
+            return asset, None
+        except Exception as e:
+            self.logger.error(f"DB Error: {e}")
+            return None, str(e)
+
+
+    # entries are tagged with their data version, see AssetService._cache_get
+    def _cache_get(self, asset_id, data_version):
+        if self.cache is None or data_version is None:
+            return None
+        try:
+            return self.cache.get(asset_id, tuple(data_version))
+        except Exception as e:
+            self.logger.warning(f"asset cache unavailable: {e}")
+            return None
+
+    def _cache_set(self, asset_id, asset, data_version):
+        if self.cache is None or data_version is None:
+            return
+        try:
+            self.cache.set(asset_id, snapshot(asset), tuple(data_version))
+        except Exception as e:
+            self.logger.warning(f"asset cache unavailable: {e}")
+
+    async def get_data_version(self):
+
+        "(version, updated_at) of the assets table, see AssetService.get_data_version"
+        try:
+            row = (await self.db.execute(VERSION_QUERY)).first()
+
+            if row is None:
+                self.logger.warning("the assets data version isn't initialized (init_db not run?)")
+                return None, "Data version not found"
+
+            return (row.version, row.updated_at), None
+        except Exception as e:
+            self.logger.error(f"DB Error: {e}")
+            return None, str(e)
+
+
+    async def get_all_assets(self, skip = 0, limit = 100, as_rows = False):
+
+        "retrieving all the assets in the DB (as_rows=True -> plain ROW_COLUMNS tuples, see AssetService)"
+        try:
+            result = await self.db.execute((select(*ROW_COLUMNS) if as_rows else select(Asset)).offset(skip).limit(limit))
+            assets = result.all() if as_rows else result.scalars().all()
+
+            if not assets:
+                self.logger.warning("No Assets found in the DB")
+                return [] , None
+
+            self.logger.info("retrieving Assets from the DB")
+            return assets, None
+
+        except Exception as e:
+            self.logger.error(f"DB Error: {e}")
+            return None, str(e)
+
+
+    async def get_assets_page(self, cursor = None, limit = 100, as_rows = False):
+
+        "keyset (cursor) pagination, returns (assets, next_cursor) same as AssetService.get_assets_page"
+        try:
+            query = select(*ROW_COLUMNS, CURSOR_COLUMN) if as_rows else select(Asset, CURSOR_COLUMN)
+
+            if cursor:
+                query = query.filter(after_cursor(cursor))
+
+        except ValueError as e:
+            self.logger.warning(f"Got an invalid cursor: {cursor}")
+            return None, str(e)
+
+        try:
+            rows = (await self.db.execute(query.order_by(*PAGE_ORDER).limit(limit + 1))).all()
+
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            next_cursor = None
+            if has_more:
+                last = rows[-1]
+                next_cursor = encode_cursor(last.cursor_created_at, last.id if as_rows else last[0].id)
+
+            self.logger.info("retrieving a page of Assets from the DB")
+            return (rows if as_rows else [asset for asset, _ in rows], next_cursor), None
+
+        except Exception as e:
+            self.logger.error(f"DB Error: {e}")
+            return None, str(e)
+
+
+    async def bulk_create_assets(self, rows: list):
+
+        "one executemany + one commit for a whole batch of validated rows, see AssetService.bulk_create_assets"
+        try:
+            await self.db.execute(insert(Asset), rows)
+            await self.db.commit()
+            self.logger.info(f"Bulk inserted {len(rows)} assets")
+            return len(rows), None
+
+        except Exception as e:
+            self.logger.error(f"couldn't bulk insert {len(rows)} assets ... error: {e}")
+            await self.db.rollback()
+            return None, str(e)
+
+
+    async def iter_asset_rows(self, batch_size = EXPORT_BATCH_SIZE):
+
+        "async twin of AssetService.iter_asset_rows, streamed through a server side cursor"
+        query = select(*EXPORT_COLUMNS).order_by(*PAGE_ORDER).execution_options(yield_per=batch_size)
+
+        result = await self.db.stream(query)
+        async for rows in result.partitions():
+            yield rows
+
+
+    async def update_asset(self, asset_update : AssetUpdate ,asset_id):
+
+        db_asset, error = await self.get_asset_by_id(asset_id, cached=False)
+
+        if error:
+            return None, error
+
+        try:
+
+            update_data = asset_update.model_dump(exclude_unset=True)
+
+            for key , value in update_data.items():
+                setattr(db_asset , key , value)
+
+            await self.db.commit()
+            await self.db.refresh(db_asset)
+            return db_asset, None
+        except Exception as e:
+            self.logger.error(f"DB Error while updating the DB {e}")
+            await self.db.rollback()
+            return None, str(e)
+
+
+    async def delete_asset(self, asset_id):
+
+        asset, error = await self.get_asset_by_id(asset_id, cached=False)
+
+        if error:
+            return False, error
+
+        try:
+            await self.db.delete(asset)
+            await self.db.commit()
+            return True, None
+
+        except Exception as e:
+            self.logger.error(f"DB Error while deleting asset with id {asset_id}")
+            await self.db.rollback()
+            return False, str(e)
+
+    async def search_asset(self , query : str, limit = 100, as_rows = False):
+        "a method to search for asset by its name or category (FTS5 first, LIKE for too short queries)"
+
+        try:
+            assets = await self._full_text_search(query, limit, as_rows)
+
+            if assets is None:
+                result = await self.db.execute(
+                    (select(*ROW_COLUMNS) if as_rows else select(Asset)).filter(
+                        or_(
+                            Asset.name.ilike(f"%{query}%"),
+                            Asset.category.ilike(f"%{query}%")
+                        )
+                    ).limit(limit)
+                )
+                assets = result.all() if as_rows else result.scalars().all()
+
+            if not assets:
+                self.logger.warning("No Assets found in the DB")
+                return [] , None
+
+            self.logger.info("query : %s returned %d assets", query, len(assets))
+            return assets , None
+        except Exception as e:
+            self.logger.error(f"DB error while querying it {e}")
+            return None , str(e)
+
+    async def _full_text_search(self, query : str, limit, as_rows = False):
+        "ranked search through the index, None means the index can't answer this one"
+
+        if not search.can_use_index(query):
+            return None
+
+        columns = ROW_COLUMNS if as_rows else None
+
+        async def fetch(statement, params):
+            result = await self.db.execute(statement, params)
+            return result.all() if as_rows else result.scalars().all()
+
+        try:
+            assets = await fetch(*search.phrase_statement(query, limit, columns))
+
+            if not assets:
+                candidates = await fetch(*search.fuzzy_statement(query, limit, columns))
+                assets = search.keep_similar(query, candidates, limit)
+
+            return assets
+
+        except OperationalError as e:
+            self.logger.warning(f"full text search unavailable, falling back to LIKE: {e}")
+            await self.db.rollback()
+            return None
+
+
+    async def get_max_value(self, category = None):
+
+        try:
+            query = select(Asset)
+            if category is not None:
+                query = query.filter(Asset.category == category)
+
+            result = await self.db.execute(query.order_by(Asset.value.desc()).limit(1))
+            asset = result.scalars().first()
+
+            if asset is None:
+                self.logger.warning("Couldn't find max value for any asset")
+                return None, "Asset not found"
+
+            self.logger.info("retrieving the max asset")
+            return asset, None
+        except Exception as e:
+            self.logger.error(f"DB Error: {e}")
+            return None, str(e)
+
+    async def get_min_value(self, category = None):
+
+        try:
+            query = select(Asset)
+            if category is not None:
+                query = query.filter(Asset.category == category)
+
+            result = await self.db.execute(query.order_by(Asset.value.asc()).limit(1))
+            asset = result.scalars().first()
+
+            if asset is None:
+                self.logger.warning("Couldn't find min value for any asset")
+                return None, "Asset not found"
+
+            self.logger.info("retrieving the min asset")
+            return asset, None
+        except Exception as e:
+            self.logger.error(f"DB Error: {e}")
+            return None, str(e)
+
+    async def get_asset_values_mean(self, category = None):
+
+        stats, error = await self.get_value_statistics(category=category)
+
+        if error:
+            self.logger.warning("Couldn't find the avg value for the assets")
+            return None, error
+
+        self.logger.info("retrieving the mean value of the assets")
+        return stats["mean"], None
+
+    async def get_value_statistics(self, category = None, status = None):
+
+        "same as AssetService.get_value_statistics, a primary key lookup on asset_value_stats"
+
+        if category is not None:
+            scope, key = "category", category
+        elif status is not None:
+            scope, key = "status", status
+        else:
+            scope, key = "all", ""
+
+        try:
+            stats = await self.db.get(AssetValueStats, (scope, key))
+
+            if stats is None or not stats.count:
+                self.logger.warning(f"No asset values to compute statistics for ({scope}={key})")
+                return None, "Asset not found"
+
+            self.logger.info("retrieving the asset value statistics")
+            return {
+                "scope": scope,
+                "key": key,
+                "count": stats.count,
+                "total": round(stats.total, 2),
+                "mean": round(stats.total / stats.count, 2),
+                "min_value": stats.min_value,
+                "max_value": stats.max_value,
+            }, None
+        except Exception as e:
+            self.logger.error(f"DB Error: {e}")
+            return None, str(e)
+
+    async def get_categories(self):
+
+        "every category that currently has assets, see AssetService.get_categories"
+
+        try:
+            result = await self.db.execute(
+                select(AssetValueStats.key).filter(AssetValueStats.scope == "category", AssetValueStats.count > 0)
+            )
+
+            self.logger.info("retrieving the asset categories")
+            return list(result.scalars().all()), None
+        except Exception as e:
+            self.logger.error(f"DB Error: {e}")
+            return None, str(e)
@@ -0,0 +1,156 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from backend.src.core.settings import SETTINGS
+
+
+"""
+    read-through cache in front of the AssetService reads (just get_asset_by_id for now)
+
+    what gets cached is a plain snapshot of the row ({column: value}) and never the ORM object itself,
+    those belong to the session that loaded them, stored with the assets data version it was read at
+    (models/asset_version.py). get(key, version) only returns it (and only counts a hit) while that's
+    still the version asked for: every write bumps it (the triggers do, whoever writes), so a worker never
+    serves a row another worker changed, an entry from an older version is dropped and counted as a miss.
+
+    the trade-off of a table wide version: a cached read still costs the one row data version lookup
+    (free on GET /assets/{id}, the route reads it for the ETag anyway) and any write, to any asset, makes
+    every entry a miss. what a hit saves is the asset query + the ORM object, so it pays off on read heavy
+    traffic and is close to no cache at all while writes are frequent.
+
+    backends (LEDGER_ASSET_CACHE):
+        memory -> LRUCache, per process, bounded by LEDGER_ASSET_CACHE_SIZE entries
+        redis  -> RedisCache, shared by every worker (needs `pip install redis` + LEDGER_REDIS_URL)
+        off    -> no caching at all
+"""
+
+
+class LRUCache:
+
+    "in-process LRU with a TTL per entry, thread safe since the sync routes run on the threadpool"
+
+    backend = "memory"
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, version=None):
+        "the value under `key`, None when it's missing, expired or was set at another `version`"
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[1] < time.monotonic() or entry[2] != version:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, version=None):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds, version)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        return _stats(self, size=size, max_size=self.max_size)
+
+
+class RedisCache:
+
+    "same interface as LRUCache but shared across workers, the counters are still per process"
+
+    backend = "redis"
+
+    def __init__(self, url: str, ttl_seconds: float = 60.0, prefix: str = "ledger:asset:"):
+        # imported here so redis stays an optional dependency
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, version=None):
+        raw = self._client.get(self.prefix + key)
+        entry = None if raw is None else pickle.loads(raw)
+
+        # an older version is left for the next set() to overwrite, another worker may be about to
+        if entry is None or entry[1] != version:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, value, version=None):
+        self._client.set(self.prefix + key, pickle.dumps((value, version)), px=int(self.ttl_seconds * 1000))
+
+    def delete(self, key):
+        self._client.delete(self.prefix + key)
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+    def stats(self) -> dict:
+        return _stats(self, size=None, max_size=None)
+
+
+def snapshot(row) -> dict:
+    "the column values of an ORM object, what actually goes in the cache"
+    return {column.key: getattr(row, column.key) for column in row.__table__.columns}
+
+
+def _stats(cache, size, max_size) -> dict:
+    lookups = cache.hits + cache.misses
+    return {
+        "backend": cache.backend,
+        "size": size,
+        "max_size": max_size,
+        "ttl_seconds": cache.ttl_seconds,
+        "hits": cache.hits,
+        "misses": cache.misses,
+        "evictions": cache.evictions,
+        "hit_rate": round(cache.hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+@lru_cache(maxsize=None)
+def get_asset_cache():
+    "the cache shared by every AssetService in this process, None when it's switched off"
+
+    backend = SETTINGS['LEDGER_ASSET_CACHE']
+    ttl = SETTINGS['LEDGER_ASSET_CACHE_TTL']
+
+    if backend == "off":
+        return None
+    if backend == "redis":
+        return RedisCache(SETTINGS['LEDGER_REDIS_URL'], ttl_seconds=ttl)
+    if backend == "memory":
+        return LRUCache(max_size=SETTINGS['LEDGER_ASSET_CACHE_SIZE'], ttl_seconds=ttl)
+
+    raise ValueError(f"Unknown LEDGER_ASSET_CACHE backend: {backend!r} (memory, redis or off)")
@@ -0,0 +1,52 @@
+import base64
+import json
+
+from sqlalchemy import String , tuple_ , type_coerce
+
+from backend.src.models.asset import Asset
+
+
+"""
+    keyset (cursor) pagination helpers shared by the sync and the async AssetService
+
+    the pages are sorted by (created_at, id) which is backed by the ix_assets_created_at_id index,
+    so fetching the next page is an index seek no matter how deep we are instead of an OFFSET scan.
+
+    the cursor is just the (created_at, id) of the last row of the previous page, base64'd so clients
+    treat it as opaque. created_at is compared as the raw stored text (type_coerce doesn't emit a CAST
+    so the index is still used) because SQLite keeps both "2025-01-01 10:00:00" (server default) and
+    "2025-01-01 10:00:00.123456" (python side) formats around and re-binding a parsed datetime would
+    not compare equal to the first one.
+"""
+
+# the created_at column as the raw text SQLite stores
+CREATED_AT_KEY = type_coerce(Asset.created_at, String)
+
+PAGE_ORDER = (CREATED_AT_KEY.asc(), Asset.id.asc())
+
+# selected next to the Asset entity to build the next cursor (labeled so it doesn't clash with assets.created_at)
+CURSOR_COLUMN = CREATED_AT_KEY.label("cursor_created_at")
+
+
+def encode_cursor(created_at: str, asset_id: str) -> str:
+    raw = json.dumps([created_at, asset_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str):
+    "returns the (created_at, id) pair, raises ValueError if the cursor was tampered with"
+    try:
+        created_at, asset_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(created_at, str) or not isinstance(asset_id, str):
+        raise ValueError("Invalid cursor")
+
+    return created_at, asset_id
+
+
+def after_cursor(cursor: str):
+    "the WHERE clause for every row after the cursor, (created_at, id) > (?, ?) as a row value comparison"
+    created_at, asset_id = decode_cursor(cursor)
+    return tuple_(CREATED_AT_KEY, Asset.id) > tuple_(created_at, asset_id)
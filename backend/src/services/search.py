@@ -0,0 +1,71 @@
+from sqlalchemy import select , text
+
+from backend.src.models.asset import Asset
+from backend.src.models.asset_search import SEARCH_TABLE
+
+
+"""
+    search helpers shared by the sync and the async AssetService (see models/asset_search.py for the index)
+
+    a search goes like this:
+    1. query shorter than 3 chars -> the trigram index can't help, plain LIKE it is (the caller does that)
+    2. the query as a phrase -> every asset whose name / category contains it, ranked with bm25
+    3. nothing found? -> typo tolerant pass: any asset sharing trigrams with the query, ranked, then only
+       the ones that share at least FUZZY_MIN_SIMILARITY of the query trigrams are kept ("macbok" -> "MacBook")
+"""
+
+MIN_QUERY_LENGTH = 3
+FUZZY_MIN_SIMILARITY = 0.5
+FUZZY_CANDIDATES_FACTOR = 5
+
+_SEARCH_SQL = f"""
+    SELECT {{columns}} FROM {SEARCH_TABLE}
+    JOIN assets ON assets.rowid = {SEARCH_TABLE}.rowid
+    WHERE {SEARCH_TABLE} MATCH :match
+    ORDER BY rank
+    LIMIT :limit
+"""
+
+
+def _trigrams(value: str) -> set:
+    value = value.lower()
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+def _quote(term: str) -> str:
+    # an FTS5 string literal, so the user can't inject FTS query syntax
+    return '"' + term.replace('"', '""') + '"'
+
+
+def can_use_index(query: str) -> bool:
+    return len(query.strip()) >= MIN_QUERY_LENGTH
+
+
+def _statement(columns):
+    # Asset objects, or plain rows of just `columns` (no ORM objects at all) when they're given
+    if columns is None:
+        return select(Asset).from_statement(text(_SEARCH_SQL.format(columns="assets.*")))
+    names = ", ".join(f"assets.{column.key}" for column in columns)
+    return select(*columns).from_statement(text(_SEARCH_SQL.format(columns=names)))
+
+
+def phrase_statement(query: str, limit: int, columns = None):
+    "every asset containing the query (case insensitive), best match first"
+    return _statement(columns), {"match": _quote(query.strip()), "limit": limit}
+
+
+def fuzzy_statement(query: str, limit: int, columns = None):
+    "candidates sharing any trigram with the query, has to go through keep_similar() afterwards"
+    match = " OR ".join(_quote(trigram) for trigram in sorted(_trigrams(query.strip())))
+    return _statement(columns), {"match": match, "limit": limit * FUZZY_CANDIDATES_FACTOR}
+
+
+def keep_similar(query: str, assets: list, limit: int) -> list:
+    "drop the fuzzy candidates that only share a trigram or two with the query (Asset objects or rows)"
+    wanted = _trigrams(query.strip())
+
+    def similarity(asset):
+        found = _trigrams(asset.name or "") | _trigrams(asset.category or "")
+        return len(wanted & found) / len(wanted)
+
+    return [asset for asset in assets if similarity(asset) >= FUZZY_MIN_SIMILARITY][:limit]
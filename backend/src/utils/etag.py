@@ -0,0 +1,99 @@
+import hashlib
+from datetime import datetime , timedelta , timezone
+from email.utils import format_datetime , parsedate_to_datetime
+
+from fastapi import Request , Response , status
+
+
+"""
+    conditional GET helpers for the asset routes
+
+    the validators come from the assets data version (models/asset_version.py) and never from the
+    response body, so answering a 304 costs one primary key lookup: no asset query, no AssetResponse
+    serialization. the version is table wide so any write changes every ETag, that's the price of
+    never having to hash the payload.
+
+    the version has to be read BEFORE the data, a write that lands in between then gives new data under
+    the old ETag which only means one extra 200 on the next poll, never a stale 304.
+
+    Last-Modified / If-Modified-Since only go down to the second, so two writes in the same second would
+    share one. Last-Modified is only handed out once the second of the last write is over: any write after
+    that lands in a later second, i.e. gets a later Last-Modified and a 200 (rounding it up wouldn't help,
+    a write at .1 and another at .7 still round to the same second). until then it's ETag only.
+"""
+
+
+def for_version(data_version, *parts):
+    "validators from a service get_data_version() result, None when there's no version to go by"
+    version, error = data_version
+    if error:
+        return None
+    return validators(*version, *parts)
+
+
+def validators(version: int, updated_at: str, *parts) -> dict:
+    """
+        ETag / Last-Modified headers for one response, `parts` is whatever else picks the body
+        (the route, the asset id, skip / limit...) so two different responses never share an ETag
+    """
+    # updated_at goes in too so a recreated / restored DB (version back to an old number) can't match
+    key = hashlib.blake2b(repr((updated_at, *parts)).encode(), digest_size=6).hexdigest()
+
+    headers = {
+        "ETag": f'W/"{version}-{key}"',
+        # cache it but ask us every time, otherwise browsers guess a freshness from Last-Modified
+        "Cache-Control": "no-cache",
+    }
+
+    modified = _parse(updated_at)
+    if datetime.now(timezone.utc) >= modified.replace(microsecond=0) + timedelta(seconds=1):
+        headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+
+    return headers
+
+
+def is_not_modified(request: Request, headers: dict, wildcard: bool = True) -> bool:
+    """
+        RFC 9110: If-None-Match wins, If-Modified-Since only counts when there's no If-None-Match
+        `If-None-Match: *` matches whenever the resource exists, pass wildcard=False when that isn't known
+        yet (the check runs before the lookup), `*` then just never matches -> a 200 or a 404
+    """
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, headers["ETag"], wildcard)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    # no Last-Modified yet (the second of the last write isn't over) -> nothing to compare it with
+    if if_modified_since is not None and "Last-Modified" in headers:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates are to the second
+        return parsedate_to_datetime(headers["Last-Modified"]) <= since
+
+    return False
+
+
+def not_modified_response(headers: dict) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def _etag_matches(if_none_match: str, etag: str, wildcard: bool = True) -> bool:
+    # weak comparison, W/"x" and "x" are the same thing for a GET
+    if if_none_match.strip() == "*":
+        return wildcard
+    wanted = _opaque(etag)
+    return any(_opaque(candidate) == wanted for candidate in if_none_match.split(","))
+
+
+def _opaque(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _parse(updated_at: str) -> datetime:
+    return datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
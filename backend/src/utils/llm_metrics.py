@@ -0,0 +1,47 @@
+import threading
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from backend.src.utils.metrics import LLM_ERRORS, LLM_LATENCY, LLM_TOKENS, LLM_TOOL_CALLS
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+
+    "latency / tokens / errors / requested tool calls of one model client (set as the client's callbacks)"
+
+    def __init__(self, agent: str):
+        self.agent = agent
+        self._starts = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        with self._lock:
+            self._starts[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self.on_chat_model_start(serialized, prompts, run_id=run_id)
+
+    def _elapsed(self, run_id):
+        with self._lock:
+            start = self._starts.pop(run_id, None)
+        return None if start is None else time.perf_counter() - start
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        elapsed = self._elapsed(run_id)
+        if elapsed is not None:
+            LLM_LATENCY.observe(elapsed, agent=self.agent)
+
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                if usage:
+                    LLM_TOKENS.inc(usage.get("input_tokens", 0), agent=self.agent, type="input")
+                    LLM_TOKENS.inc(usage.get("output_tokens", 0), agent=self.agent, type="output")
+                for tool_call in getattr(message, "tool_calls", None) or []:
+                    LLM_TOOL_CALLS.inc(agent=self.agent, tool=tool_call["name"])
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._elapsed(run_id)
+        LLM_ERRORS.inc(agent=self.agent)
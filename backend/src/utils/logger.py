@@ -1,39 +1,214 @@
+import atexit
+import contextvars
+import copy
+import datetime
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import re
 import uuid
-import datetime
+from itertools import islice
+
+from backend.src.core.settings import SETTINGS
+
+
+"""
+    the app logger
+
+    the request path never touches the disk anymore: the logger only has a QueueHandler that drops
+    the record on an in-memory queue, a QueueListener thread formats it and writes it to the log file.
+    the file is rotated by size (LEDGER_LOG_MAX_BYTES) or time (LEDGER_LOG_ROTATE_WHEN) and only the
+    last LEDGER_LOG_BACKUPS files are kept, records are JSON lines (LEDGER_LOG_FORMAT=text for the old look)
+    carrying the id of the request they were logged in (RequestIdMiddleware, X-Request-ID header).
+
+    for anything big (query results, tool outputs...) log `payload(value)` with %s instead of an f-string:
+    it's only turned into text if the record is actually emitted, and then only the first few items /
+    characters are, so the cost of a log line doesn't grow with the size of the result.
+"""
 
 # Global singleton to store the logger instance
 _logger_instance = None
 _session_id = None
+_listener = None
+
+_request_id = contextvars.ContextVar("request_id", default="-")
+
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+
+def get_request_id() -> str:
+    return _request_id.get()
+
+
+class payload:
+
+    "a lazy, bounded view of a (possibly huge) value for log messages: logger.info('got %s', payload(rows))"
+
+    def __init__(self, value, max_items: int = 3, max_chars: int = 300):
+        self.value = value
+        self.max_items = max_items
+        self.max_chars = max_chars
+
+    def __str__(self):
+        value = self.value
+
+        if isinstance(value, (str, bytes)):
+            text = repr(value[:self.max_chars])
+            return text if len(value) <= self.max_chars else f"{text}... ({len(value)} chars)"
+
+        if isinstance(value, dict):
+            items = ", ".join(f"{k!r}: {v!r}" for k, v in islice(value.items(), self.max_items))
+            text = f"{{{items}{', ...' if len(value) > self.max_items else ''}}}"
+        elif isinstance(value, (list, tuple, set)):
+            items = ", ".join(repr(item) for item in islice(value, self.max_items))
+            text = f"{len(value)} items [{items}{', ...' if len(value) > self.max_items else ''}]"
+        else:
+            text = repr(value)
+
+        return text if len(text) <= self.max_chars else text[:self.max_chars] + "..."
+
+    __repr__ = __str__
+
+
+class _RequestIdFilter(logging.Filter):
+    # runs in the thread that logs (the listener thread doesn't have the request context)
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+
+    "one JSON object per line"
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # already rendered before the record was queued (see _QueueHandler)
+            entry["exc"] = record.exc_text
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+
+    """
+        the stdlib one renders the whole record (traceback included) into the message and drops exc_info
+        before queueing it, so the listener's formatter never knows there was an exception. here the
+        traceback is rendered in the caller's thread (the traceback objects don't outlive it) but kept
+        apart in exc_text, which both formatters write out
+    """
+
+    def prepare(self, record):
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        return record
+
+
+def _formatter(fmt: str) -> logging.Formatter:
+    if fmt == "json":
+        return JsonFormatter()
+    if fmt == "text":
+        return logging.Formatter('%(asctime)s - %(levelname)s - [%(name)s] [%(request_id)s] - %(message)s')
+    raise ValueError(f"Unknown LEDGER_LOG_FORMAT: {fmt!r} (one of json, text)")
+
+
+def _file_handler(path: str) -> logging.Handler:
+    "rotates by time when LEDGER_LOG_ROTATE_WHEN is set (midnight, H, ...), by size otherwise"
+
+    if SETTINGS['LEDGER_LOG_ROTATE_WHEN']:
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=SETTINGS['LEDGER_LOG_ROTATE_WHEN'], backupCount=SETTINGS['LEDGER_LOG_BACKUPS'],
+            encoding="utf-8", delay=True, utc=True
+        )
+
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=SETTINGS['LEDGER_LOG_MAX_BYTES'], backupCount=SETTINGS['LEDGER_LOG_BACKUPS'],
+        encoding="utf-8", delay=True
+    )
+
+
+def create_queue_logger(name: str, handler: logging.Handler, fmt: str = "json", level=logging.INFO):
+    "(logger, started listener): the logger only enqueues, the listener thread formats + writes through `handler`"
+
+    handler.setFormatter(_formatter(fmt))
+
+    records = queue.SimpleQueue()
+    queue_handler = _QueueHandler(records)
+    queue_handler.addFilter(_RequestIdFilter())
+
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    listener.start()
+
+    return logger, listener
+
 
 def get_session_logger():
-    global _logger_instance, _session_id
+    global _logger_instance, _session_id, _listener
 
     # If logger already exists, return it
     if _logger_instance:
         return _logger_instance
-    
-    # unique Id for every session 
+
+    # unique Id for every session (process), it's the logger name in every record
     _session_id = str(uuid.uuid4())
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    
-    
-    log_dir = "backend/logs"
-    os.makedirs(log_dir, exist_ok=True)
-    
-    # merging the 2 paths together
-    log_filename = os.path.join(log_dir, f"{timestamp}_{_session_id}.log")
-
-    logger = logging.getLogger(_session_id)
-    logger.setLevel(logging.INFO)
-    file_handler = logging.FileHandler(log_filename)
-    
-    # just some normal formatting
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - [%(name)s] - %(message)s')
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
-    _logger_instance = logger
-
-    return _logger_instance
\ No newline at end of file
+
+    path = SETTINGS['LEDGER_LOG_FILE']
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    _logger_instance, _listener = create_queue_logger(
+        _session_id, _file_handler(path), fmt=SETTINGS['LEDGER_LOG_FORMAT'], level=SETTINGS['LEDGER_LOG_LEVEL']
+    )
+
+    # flush whatever is still queued when the process exits
+    atexit.register(_listener.stop)
+
+    return _logger_instance
+
+
+class RequestIdMiddleware:
+
+    "tags everything logged while serving a request with its id (X-Request-ID from the client or a new one) and echoes it back"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope.get("headers") or []).get(b"x-request-id", b"").decode("latin-1")
+        request_id = incoming if _VALID_REQUEST_ID.fullmatch(incoming) else uuid.uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode())]
+            await send(message)
+
+        token = _request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _request_id.reset(token)
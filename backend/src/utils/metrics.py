@@ -0,0 +1,218 @@
+import bisect
+import threading
+import time
+
+from sqlalchemy import event
+
+
+"""
+    Prometheus metrics, served as text on GET /metrics
+
+    a tiny in-house registry (counters, gauges, histograms with labels) instead of prometheus_client,
+    recording a value is a dict lookup + an add under a lock so it stays off the hot path's radar.
+    what gets measured:
+        - every HTTP route: latency histogram + status counts, plus in-flight requests per method (MetricsMiddleware)
+        - every SQL statement per engine and kind (SELECT / INSERT ...): timings + counts (instrument_engine)
+        - every LLM call per agent: latency, tokens, errors and the tools the model asked for (LLMMetricsHandler,
+          in utils/llm_metrics.py so a CRUD-only worker never imports LangChain for it)
+        - the shared LLM rate limiter: queue wait per priority, rejections, queue depth (agents/rate_limiter.py)
+
+    the values are per process, with several workers scrape each of them (or sum them on the Prometheus side)
+"""
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SQL_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict):
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, key)} {_number(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # [count per bucket (+Inf last), sum]
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = f'le="{_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter("ledger_http_requests_total", "HTTP requests served", ("method", "route", "status")))
+HTTP_LATENCY = REGISTRY.register(Histogram("ledger_http_request_duration_seconds", "HTTP request latency", ("method", "route")))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge("ledger_http_requests_in_flight", "HTTP requests being served right now", ("method",)))
+
+SQL_LATENCY = REGISTRY.register(Histogram("ledger_db_statement_duration_seconds", "SQL statement execution time", ("engine", "operation"), SQL_BUCKETS))
+SQL_ERRORS = REGISTRY.register(Counter("ledger_db_errors_total", "SQL statements that raised", ("engine",)))
+
+LLM_LATENCY = REGISTRY.register(Histogram("ledger_llm_call_duration_seconds", "LLM call latency (rate limiter wait included, see ledger_llm_rate_limiter_wait_seconds)", ("agent",)))
+LLM_TOKENS = REGISTRY.register(Counter("ledger_llm_tokens_total", "LLM tokens", ("agent", "type")))
+LLM_ERRORS = REGISTRY.register(Counter("ledger_llm_errors_total", "LLM calls that failed", ("agent",)))
+LLM_TOOL_CALLS = REGISTRY.register(Counter("ledger_llm_tool_calls_total", "tool calls requested by the model", ("agent", "tool")))
+
+LIMITER_WAIT = REGISTRY.register(Histogram("ledger_llm_rate_limiter_wait_seconds", "time an LLM call waited for a rate limiter token", ("priority",)))
+LIMITER_REJECTED = REGISTRY.register(Counter("ledger_llm_rate_limiter_rejected_total", "questions answered 429 because the LLM queue was over budget"))
+LIMITER_QUEUED = REGISTRY.register(Gauge("ledger_llm_rate_limiter_queued", "LLM calls waiting for a rate limiter token"))
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def _route_of(scope) -> str:
+    "the route template (/assets/{asset_id}) so the label doesn't explode with every id, once routing is done"
+
+    # FastAPI's router puts the matched route (a partial match too, i.e. a 405) in the scope it shares with us
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+
+    "latency / in flight / status per route for every HTTP request"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = "500"
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        # the route is only known after routing, so in flight is counted per method
+        HTTP_IN_FLIGHT.inc(method=method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = _route_of(scope)
+            HTTP_LATENCY.observe(time.perf_counter() - start, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
+            HTTP_IN_FLIGHT.dec(method=method)
+
+
+def instrument_engine(engine, name: str):
+    "time every statement of `engine` (a sync Engine, pass async_engine.sync_engine)"
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("ledger_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["ledger_query_start"].pop()
+        operation = statement.lstrip()[:6].upper()
+        if operation not in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+            operation = "OTHER"
+        SQL_LATENCY.observe(elapsed, engine=name, operation=operation)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        starts = context.connection.info.get("ledger_query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+        SQL_ERRORS.inc(engine=name)
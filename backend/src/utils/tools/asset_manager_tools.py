@@ -2,6 +2,7 @@ from langchain_core.tools import tool
 from langsmith import traceable
 
 from backend.src.agents.db_manager import DBManager
+from backend.src.agents.answer_cache import cached_answer
 from backend.src.utils.logger import get_session_logger
 
 
@@ -35,6 +36,11 @@ def ask_db_manager(query:str):
 
 @traceable
 def run_query(query):
+    # a question already answered on the same data costs no LLM call at all (see agents/answer_cache.py)
+    return cached_answer(query, _ask_db_manager)
+
+
+def _ask_db_manager(query):
     db_manager = DBManager()
     result = db_manager.run_query(query)
-    return result
\ No newline at end of file
+    return result
@@ -1,17 +1,201 @@
 from langchain_core.tools import tool
-from typing import Literal
+from typing import Literal , Optional
 from langsmith import traceable
-
-from backend.src.core.database import get_db
+from contextlib import contextmanager
+from functools import lru_cache , wraps
+import contextvars
+import inspect
+import json
+import threading
+
+from sqlalchemy import text
+
+from backend.src.core.database import ReadSessionLocal
+from backend.src.core.settings import SETTINGS
+from backend.src.services import asset_json
 from backend.src.services.assets_service import AssetService
-from backend.src.utils.logger import get_session_logger
+from backend.src.services.cache import LRUCache
+from backend.src.utils.logger import get_session_logger, payload
 from backend.src.schemas.asset import AssetResponse
 
 
-db = next(get_db())
+"""
+    no session lives longer than a tool call: every call takes a fresh one from the read pool and closes it
+    when it returns, so there's no identity map growing with every row ever loaded, no stale objects after a
+    write through the REST API and concurrent agent runs each get their own connection.
+
+    with LEDGER_TOOL_SNAPSHOT=true (wal profile) every tool call of one agent run (see tool_snapshot) reads
+    through the same read transaction instead, i.e. the same snapshot of the DB, whatever gets written meanwhile.
+"""
+
+# where the tool sessions come from (the read only pool with the wal profile)
+ToolSessionLocal = ReadSessionLocal
+
+_snapshot = contextvars.ContextVar("ledger_tool_snapshot", default=None)
+_call_session = contextvars.ContextVar("ledger_tool_session", default=None)
+
+
+@contextmanager
+def tool_session():
+    "the run's snapshot session when there's one, a short lived one otherwise"
+
+    snapshot = _snapshot.get()
+    if snapshot is not None:
+        session, lock = snapshot
+        # the model can ask for several tools at once and they run in parallel, a Session isn't thread safe
+        with lock:
+            yield session
+        return
+
+    with ToolSessionLocal() as session:
+        yield session
+
+
+@contextmanager
+def tool_snapshot():
+    "every tool call made inside this block (nested agents / tool threads included) reads the same DB snapshot"
+
+    # a read transaction held for a whole agent run would block the writers with the rollback journal,
+    # only WAL readers are free. nested runs (the DBManager inside ask_db_manager) keep the outer snapshot
+    if not SETTINGS['LEDGER_TOOL_SNAPSHOT'] or SETTINGS['LEDGER_SQLITE_PROFILE'] != "wal" or _snapshot.get() is not None:
+        yield
+        return
+
+    session = ToolSessionLocal()
+    try:
+        # pysqlite never BEGINs before a SELECT by itself, the snapshot starts with the first read after BEGIN
+        connection = session.connection()
+        connection.exec_driver_sql("BEGIN")
+        connection.execute(text("SELECT count(*) FROM sqlite_master"))
+
+        _snapshot.set((session, threading.Lock()))
+        try:
+            yield
+        finally:
+            # not reset(): an async generator can be closed from another context than the one it started in
+            _snapshot.set(None)
+    finally:
+        session.close()
+
+
+def _db():
+    "the session of the tool call running right now (see scoped)"
+
+    session = _call_session.get()
+    if session is None:
+        raise RuntimeError("the DB tools only get a session inside a @scoped call")
+    return session
+
+
+def scoped(func):
+    "goes between @tool and @memoized, the whole call (cache lookup included) runs on one tool_session()"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with tool_session() as session:
+            token = _call_session.set(session)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _call_session.reset(token)
+
+    return wrapper
+
+
+"""
+    the tool results are memoized per (tool, args, assets data version) and what's kept is the final JSON
+    string the LLM gets, so a repeated call (in the same run or a later one) skips the DB query AND the
+    AssetResponse serialization. any write to assets bumps the data version so nothing stale is ever served.
+"""
+
+
+@lru_cache(maxsize=None)
+def get_tool_cache():
+    "the process wide tool results cache, None when LEDGER_TOOL_CACHE_SIZE=0"
+
+    if SETTINGS['LEDGER_TOOL_CACHE_SIZE'] <= 0:
+        return None
+
+    return LRUCache(max_size=SETTINGS['LEDGER_TOOL_CACHE_SIZE'], ttl_seconds=SETTINGS['LEDGER_TOOL_CACHE_TTL'])
+
+
+class _DontCache:
+    "wraps a tool result that must not be memoized (a DB error...), the LLM still gets the value"
+
+    def __init__(self, value):
+        self.value = value
+
+
+# a list (shared, not copied, with the tool threads of the run) every _DontCache result gets recorded in
+_failures = contextvars.ContextVar("ledger_tool_failures", default=None)
+
+
+@contextmanager
+def tool_failures():
+    """
+        yields the list of the DB tool calls made inside this block that failed, so whatever gets built
+        from their results (the DBManager answer, see agents/answer_cache.py) isn't memoized either
+    """
+    failures = []
+    token = _failures.set(failures)
+    try:
+        yield failures
+    finally:
+        _failures.reset(token)
+
+
+def _uncached(result: _DontCache) -> str:
+    failures = _failures.get()
+    if failures is not None:
+        failures.append(result.value)
+    return _to_json(result.value)
+
+
+def _to_json(result) -> str:
+    # what langchain would turn the result into anyway, plain messages stay as they are
+    return result if isinstance(result, str) else asset_json.dumps(result).decode()
+
+
+def memoized(func):
+    "goes right above the function (under @scoped), @tool still sees the real signature / docstring through wraps"
+
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        cache = get_tool_cache()
+        data_version, error = AssetService(_db(), get_session_logger()).get_data_version() if cache else (None, None)
+
+        if cache is None or error:
+            result = func(*args, **kwargs)
+            return _uncached(result) if isinstance(result, _DontCache) else _to_json(result)
+
+        version, updated_at = data_version
+        key = f"{func.__name__}:{version}:{updated_at}:{json.dumps(bound.arguments, sort_keys=True, default=str)}"
+
+        output = cache.get(key)
+        if output is not None:
+            return output
+
+        result = func(*args, **kwargs)
+
+        if isinstance(result, _DontCache):
+            return _uncached(result)
+
+        output = _to_json(result)
+        cache.set(key, output)
+        return output
+
+    return wrapper
+
 
 # tools used by the DB manager
 @tool
+@scoped
+@memoized
 def search_assets_by_name_or_category(query:str):
     "" """
     An AI Tool to help the agent search the DB 
@@ -23,82 +207,98 @@ def search_assets_by_name_or_category(query:str):
     """""
     
     logger = get_session_logger()
-    asset_service = AssetService(db,logger)
+    asset_service = AssetService(_db(),logger)
 
     logger.info("The agent used search_assets tool")
 
-    result , error = asset_service.search_asset(query)
+    fast = SETTINGS['LEDGER_FAST_JSON']
+    result , error = asset_service.search_asset(query, as_rows=fast)
 
     if error is None and len(result) == 0:
         return "No Assets found"
     
     elif result is None:
-        return "error with the DB, couldn't retrieve any data"
+        return _DontCache("error with the DB, couldn't retrieve any data")
     else:
-        asset = [AssetResponse.model_validate(asset).model_dump(mode='json') for asset in result]
-        logger.info(f"tool about to return {asset}") 
+        asset = asset_json.as_dicts(result) if fast else [AssetResponse.model_validate(asset).model_dump(mode='json') for asset in result]
+        logger.info("tool about to return %s", payload(asset))
         return asset
     
 
 @tool
+@scoped
+@memoized
 def get_all_assets():
     "a tool to help the agent get all the assets from the db"
 
     logger = get_session_logger()
-    asset_service = AssetService(db,logger)
+    asset_service = AssetService(_db(),logger)
 
     logger.info("Agent used the get all assets tool")
 
-    result , error = asset_service.get_all_assets()
+    fast = SETTINGS['LEDGER_FAST_JSON']
+    result , error = asset_service.get_all_assets(as_rows=fast)
 
     if error:
         logger.error("get all assets tools failed to retrieve anyting")
-        return "No assets found in the DB"
+        return _DontCache("No assets found in the DB")
     
-    logger.info(f"tool call succeeded and got {result}")
-    return [AssetResponse.model_validate(asset).model_dump(mode='json') for asset in result]
+    logger.info("tool call succeeded and got %s", payload(result))
+    return asset_json.as_dicts(result) if fast else [AssetResponse.model_validate(asset).model_dump(mode='json') for asset in result]
 
 
 
 @tool
-def get_asset_value_statistics(metric: Literal["max", "min", "mean"]):
+@scoped
+@memoized
+def get_asset_value_statistics(metric: Literal["max", "min", "mean", "total", "count"], category: Optional[str] = None):
     """
-    Get statistics over asset values.
+    Get statistics over asset values, for all the assets or only the ones in `category`.
 
     metric:
-    - "max"  -> most valuable asset
-    - "min"  -> least valuable asset
-    - "mean" -> average asset value
+    - "max"   -> most valuable asset
+    - "min"   -> least valuable asset
+    - "mean"  -> average asset value
+    - "total" -> sum of all the asset values
+    - "count" -> number of assets that have a value
     """
 
     logger = get_session_logger()
-    asset_service = AssetService(db, logger)
+    asset_service = AssetService(_db(), logger)
 
-    logger.info(f"Agent requested asset value statistics: metric={metric}")
+    logger.info(f"Agent requested asset value statistics: metric={metric} category={category}")
 
     metric = metric.lower()
 
     if metric == "max":
-        result, error = asset_service.get_max_value()
+        result, error = asset_service.get_max_value(category=category)
 
     elif metric == "min":
-        result, error = asset_service.get_min_value()
+        result, error = asset_service.get_min_value(category=category)
 
     elif metric == "mean":
-        result, error = asset_service.get_asset_values_mean()
+        result, error = asset_service.get_asset_values_mean(category=category)
+
+    elif metric in ["total", "count"]:
+        # both come straight out of the pre-aggregated stats row
+        stats, error = asset_service.get_value_statistics(category=category)
+        result = stats[metric] if stats else None
 
     else:
         # damn we recieved invalid input (hallucinations from the llm)
         logger.error(f"Invalid metric received: {metric}")
         return {
-            "error": "Invalid metric. Allowed values are: max, min, mean."
+            "error": "Invalid metric. Allowed values are: max, min, mean, total, count."
         }
 
+    if error and "not found" in error.lower():
+        result, error = None, None
+
     if error:
         logger.error("Database error while computing asset statistics")
-        return {
+        return _DontCache({
             "error": "Database error while retrieving asset statistics."
-        }
+        })
 
     if result is None:
         logger.info("No asset records found in database")
@@ -115,6 +315,7 @@ def get_asset_value_statistics(metric: Literal["max", "min", "mean"]):
 
     return {
         "metric": metric,
+        "category": category,
         "result": serialized_result
     }
 
@@ -0,0 +1,62 @@
+import os
+import unittest
+from unittest.mock import patch
+
+# the agents import the clients which need the keys to exist (no model is ever called here)
+for var in ("CEREBRAS_API_KEY", "LANGSMITH_API_KEY", "LANGSMITH_PROJECT"):
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("LANGSMITH_TRACING", "false")
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langgraph.checkpoint.memory import InMemorySaver
+
+from backend.src.agents import asset_manager, registry
+from backend.src.agents.asset_manager import AssetManager
+
+
+class ToolCallingFakeModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+class TestAgentModes(unittest.TestCase):
+    def setUp(self):
+        registry.clear_compiled_agents()
+        self.patches = [
+            patch.object(asset_manager, "get_asset_manager_client", return_value=ToolCallingFakeModel(messages=iter([]))),
+            patch.object(asset_manager, "get_session_checkpointer", return_value=InMemorySaver()),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        registry.clear_compiled_agents()
+
+    def test_two_agent_mode_goes_through_the_db_manager(self):
+        manager = AssetManager(mode="two_agent")
+
+        self.assertEqual([tool.name for tool in manager.tools], ["ask_db_manager"])
+        self.assertIn("You do NOT access databases directly", manager.sys_prompt)
+
+    def test_single_mode_gets_the_db_tools(self):
+        # Act
+        manager = AssetManager(mode="single")
+
+        # Assert
+        self.assertEqual(
+            [tool.name for tool in manager.tools],
+            ["search_assets_by_name_or_category", "get_all_assets", "get_asset_value_statistics"]
+        )
+        self.assertNotIn("ask_db_manager", manager.sys_prompt)
+        self.assertNotIn("You do NOT access databases directly", manager.sys_prompt)
+        self.assertIsNot(manager.agent, AssetManager(mode="two_agent").agent)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            AssetManager(mode="swarm")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langgraph.checkpoint.memory import InMemorySaver
+
+from backend.src.agents import registry
+
+
+class TestAgentRegistry(unittest.TestCase):
+    def setUp(self):
+        registry.clear_compiled_agents()
+        self.llm = GenericFakeChatModel(messages=iter([]))
+
+    def tearDown(self):
+        registry.clear_compiled_agents()
+
+    def test_same_config_returns_same_graph(self):
+        # Act
+        first = registry.get_compiled_agent(self.llm, "prompt", [])
+        second = registry.get_compiled_agent(self.llm, "prompt", [])
+
+        # Assert
+        self.assertIs(first, second)
+
+    def test_different_prompt_compiles_a_new_graph(self):
+        # Act
+        first = registry.get_compiled_agent(self.llm, "prompt", [])
+        second = registry.get_compiled_agent(self.llm, "another prompt", [])
+
+        # Assert
+        self.assertIsNot(first, second)
+
+    def test_different_checkpointer_compiles_a_new_graph(self):
+        # Arrange
+        first_store, second_store = InMemorySaver(), InMemorySaver()
+
+        # Act
+        first = registry.get_compiled_agent(self.llm, "prompt", [], checkpointer=first_store)
+        second = registry.get_compiled_agent(self.llm, "prompt", [], checkpointer=second_store)
+
+        # Assert
+        self.assertIsNot(first, second)
+        self.assertIs(first.checkpointer, first_store)
+        self.assertIs(second.checkpointer, second_store)
+        self.assertIs(registry.get_compiled_agent(self.llm, "prompt", [], checkpointer=first_store), first)
+
+    def test_concurrent_callers_compile_once(self):
+        # Arrange
+        with patch.object(registry, "create_agent", wraps=registry.create_agent) as create_agent:
+
+            # Act
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                agents = list(pool.map(lambda _: registry.get_compiled_agent(self.llm, "prompt", []), range(32)))
+
+        # Assert
+        create_agent.assert_called_once()
+        self.assertTrue(all(agent is agents[0] for agent in agents))
+
+
+if __name__ == '__main__':
+    unittest.main()
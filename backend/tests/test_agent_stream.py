@@ -0,0 +1,126 @@
+import asyncio
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+# the agents import the clients which need the keys to exist (the model here is the scripted fake)
+for var in ("CEREBRAS_API_KEY", "LANGSMITH_API_KEY", "LANGSMITH_PROJECT"):
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("LANGSMITH_TRACING", "false")
+
+from langchain_core.tools import tool
+from langgraph.checkpoint.memory import InMemorySaver
+
+from backend.src.agents import asset_manager, registry
+from backend.src.agents.asset_manager import AssetManager, StopWhenCancelled
+from backend.src.agents.fake_llm import ScriptedChatModel
+from backend.src.core.settings import SETTINGS
+
+
+@tool
+def get_asset_value_statistics(metric: str, category: str = None):
+    "value statistics of the assets"
+    if metric == "mean":
+        raise RuntimeError("disk I/O error")
+    return {"metric": metric, "result": 42}
+
+
+async def _collect(stream):
+    return [event async for event in stream]
+
+
+class TestAstreamQuery(unittest.TestCase):
+    def setUp(self):
+        self.checkpointer = InMemorySaver()
+        self.logger = MagicMock()
+        self.patches = [
+            patch.dict(SETTINGS, {"LEDGER_FAST_PATH": False, "LEDGER_TOOL_SNAPSHOT": False}),
+            patch.object(asset_manager, "DB_TOOLS", [get_asset_value_statistics]),
+            patch.object(asset_manager, "get_asset_manager_client", return_value=ScriptedChatModel()),
+            patch.object(asset_manager, "get_session_checkpointer", return_value=self.checkpointer),
+            patch.object(asset_manager, "get_session_logger", return_value=self.logger),
+            patch.object(asset_manager, "StopWhenCancelled", side_effect=StopWhenCancelled),
+        ]
+        for p in self.patches:
+            p.start()
+        # the graph is compiled around the stub tool, nobody else may get it
+        registry.clear_compiled_agents()
+        self.manager = AssetManager(mode="single")
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        registry.clear_compiled_agents()
+
+    def _stop_event(self):
+        return asset_manager.StopWhenCancelled.call_args.args[0]
+
+    def test_events_in_order_answer_last(self):
+        # Act
+        events = asyncio.run(_collect(self.manager.astream_query("What's my most expensive asset?")))
+
+        # Assert
+        self.assertEqual([event["type"] for event in events], ["tool_start", "tool_end", "token", "answer"])
+        self.assertEqual(events[0]["tool"], "get_asset_value_statistics")
+        self.assertEqual(events[1]["tool"], "get_asset_value_statistics")
+        self.assertEqual(events[2]["content"], events[3]["answer"])
+        self.assertIn('"result": 42', events[3]["answer"])
+        self.assertTrue(self._stop_event().is_set())
+
+    def test_stateless_thread_is_deleted(self):
+        # Act
+        asyncio.run(_collect(self.manager.astream_query("What's my most expensive asset?")))
+        asyncio.run(_collect(self.manager.astream_query("What's my cheapest asset?", session_id="kept")))
+
+        # Assert
+        self.assertEqual({thread_id for thread_id, checkpoints in self.checkpointer.storage.items() if checkpoints}, {"kept"})
+
+    def test_closing_the_generator_sets_stop(self):
+        async def first_then_close():
+            stream = self.manager.astream_query("What's my most expensive asset?")
+            first = await stream.__anext__()
+            await stream.aclose()
+            return first
+
+        # Act
+        first = asyncio.run(first_then_close())
+
+        # Assert
+        self.assertEqual(first["type"], "tool_start")
+        self.assertTrue(self._stop_event().is_set())
+        self.assertFalse(any(self.checkpointer.storage.values()))
+
+    def test_failure_is_logged_and_sent_as_an_error_frame(self):
+        # Act
+        events = asyncio.run(_collect(self.manager.astream_query("What's the average value of my assets?")))
+
+        # Assert
+        self.assertEqual(events[-1]["type"], "error")
+        self.assertEqual(events[-1]["status"], 500)
+        self.assertNotIn("answer", [event["type"] for event in events])
+        self.logger.exception.assert_called_once()
+
+    def test_failed_run_query_is_logged_and_raised(self):
+        # Act
+        with self.assertRaises(RuntimeError):
+            self.manager.run_query("What's the average value of my assets?")
+
+        # Assert
+        self.logger.exception.assert_called_once()
+        self.assertFalse(any(self.checkpointer.storage.values()))
+
+    def test_failing_to_remember_a_fast_path_answer_is_logged(self):
+        # Arrange
+        with patch.object(asset_manager, "try_fast_path", return_value="You have 3 asset records."), \
+                patch.object(type(self.manager.agent), "update_state", side_effect=RuntimeError("disk I/O error")):
+
+            # Act
+            answer = self.manager.run_query("How many assets do I have?", session_id="kept")
+
+        # Assert
+        self.assertEqual(answer, "You have 3 asset records.")
+        self.assertTrue(self.logger.warning.call_args.kwargs["exc_info"])
+
+
+if __name__ == '__main__':
+    unittest.main()
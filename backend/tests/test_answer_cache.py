@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.agents.answer_cache import cached_answer, normalize_query
+from backend.src.services.assets_service import AssetService
+from backend.src.services.cache import LRUCache
+from backend.src.utils.tools import db_manager_tools
+
+
+class TestAnswerCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUCache(max_size=10, ttl_seconds=60)
+        self.version = (1, "2025-01-01T00:00:00.000Z")
+        self.run = MagicMock(return_value="Your most expensive asset is the MacBook")
+
+    def _ask(self, query):
+        return cached_answer(query, self.run, cache=self.cache, data_version=lambda: self.version)
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query("  What's my MOST   expensive asset?? "), "what's my most expensive asset")
+
+    def test_repeated_question_runs_once(self):
+        # Act
+        first = self._ask("What's my most expensive asset?")
+        second = self._ask("what's my most expensive asset")
+
+        # Assert
+        self.assertEqual(first, second)
+        self.run.assert_called_once()
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_a_write_invalidates(self):
+        # Arrange
+        self._ask("total value of my assets")
+
+        # Act
+        self.version = (2, "2025-01-01T00:00:05.000Z")
+        self._ask("total value of my assets")
+
+        # Assert
+        self.assertEqual(self.run.call_count, 2)
+
+    def test_failed_answers_are_not_cached(self):
+        # Arrange
+        self.run.return_value = None
+
+        # Act
+        self._ask("total value")
+        self._ask("total value")
+
+        # Assert
+        self.assertEqual(self.run.call_count, 2)
+
+    def test_answers_built_on_a_failed_tool_are_not_cached(self):
+        # Arrange (the DBManager calls a DB tool that hits a DB error and reports it)
+        engine = create_engine("sqlite://")
+
+        def run(query):
+            output = db_manager_tools.get_all_assets.invoke({})
+            return f"Sorry: {output}"
+
+        self.run.side_effect = run
+
+        # Act
+        with patch.object(db_manager_tools, "ToolSessionLocal", sessionmaker(bind=engine)), \
+             patch.object(db_manager_tools, "get_tool_cache", return_value=None), \
+             patch.object(db_manager_tools, "get_session_logger", return_value=MagicMock()), \
+             patch.object(AssetService, "get_all_assets", return_value=(None, "disk I/O error")):
+            first = self._ask("list my assets")
+            self._ask("list my assets")
+
+        # Assert
+        self.assertIn("No assets found in the DB", first)
+        self.assertEqual(self.run.call_count, 2)
+        engine.dispose()
+
+    def test_no_data_version_no_caching(self):
+        # Act
+        cached_answer("total value", self.run, cache=self.cache, data_version=lambda: None)
+        cached_answer("total value", self.run, cache=self.cache, data_version=lambda: None)
+
+        # Assert
+        self.assertEqual(self.run.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.src.core.database import get_db_base
+from backend.src.models import asset  # noqa: F401 (registers the assets table)
+from backend.src.models.asset_version import ensure_data_version
+from backend.src.services.assets_service import AssetService
+from backend.src.services.cache import LRUCache
+from backend.src.schemas.asset import AssetCreate, AssetUpdate
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_hits_and_misses_are_counted(self):
+        # Arrange
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        cache.set("a", 1)
+
+        # Act
+        cache.get("a")
+        cache.get("b")
+
+        # Assert
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.stats()["hit_rate"], 0.5)
+
+    def test_least_recently_used_is_evicted(self):
+        # Arrange
+        cache = LRUCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        # Act
+        cache.set("c", 3)
+
+        # Assert
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_other_version_is_a_miss_and_dropped(self):
+        # Arrange
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        cache.set("a", 1, version=(1, "t1"))
+
+        # Act
+        stale = cache.get("a", version=(2, "t2"))
+
+        # Assert
+        self.assertIsNone(stale)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_entries_expire(self):
+        # Arrange
+        cache = LRUCache(max_size=10, ttl_seconds=5)
+        with patch("backend.src.services.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+
+        # Act
+        with patch("backend.src.services.cache.time.monotonic", return_value=106.0):
+            value = cache.get("a")
+
+        # Assert
+        self.assertIsNone(value)
+        self.assertEqual(cache.stats()["size"], 0)
+
+
+class TestAssetServiceCache(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        get_db_base().metadata.create_all(bind=self.engine)
+        ensure_data_version(self.engine)
+
+        self.db = sessionmaker(bind=self.engine)()
+        self.cache = LRUCache()
+        self.service = AssetService(self.db, MagicMock(), self.cache)
+
+        self.asset, _ = self.service.create_asset(
+            AssetCreate(name="Laptop", category="Electronics", value=1000.0, quantity=1.0, status="Active")
+        )
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_second_read_does_not_query_the_asset(self):
+        # Arrange
+        self.service.get_asset_by_id(self.asset.id)
+
+        # Act (only the data version lookup may still hit the DB)
+        with patch.object(self.db, "query", side_effect=AssertionError("queried the asset")):
+            cached, error = self.service.get_asset_by_id(self.asset.id)
+
+        # Assert
+        self.assertIsNone(error)
+        self.assertEqual(cached.name, "Laptop")
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_update_invalidates(self):
+        # Arrange
+        self.service.get_asset_by_id(self.asset.id)
+
+        # Act
+        self.service.update_asset(AssetUpdate(name="Renamed"), self.asset.id)
+        fetched, _ = self.service.get_asset_by_id(self.asset.id)
+
+        # Assert
+        self.assertEqual(fetched.name, "Renamed")
+
+    def test_delete_invalidates(self):
+        # Arrange
+        self.service.get_asset_by_id(self.asset.id)
+
+        # Act
+        self.service.delete_asset(self.asset.id)
+        fetched, error = self.service.get_asset_by_id(self.asset.id)
+
+        # Assert
+        self.assertIsNone(fetched)
+        self.assertEqual(error, "Asset not found")
+
+    def test_write_in_another_worker_is_seen(self):
+        # Arrange (two workers, each with its own in-memory cache, on the same DB)
+        other_db = sessionmaker(bind=self.engine)()
+        other = AssetService(other_db, MagicMock(), LRUCache())
+        self.service.get_asset_by_id(self.asset.id)
+        other.get_asset_by_id(self.asset.id)
+
+        # Act
+        other.update_asset(AssetUpdate(name="Renamed"), self.asset.id)
+        # the next request of the first worker, a fresh session but the same cache
+        with sessionmaker(bind=self.engine)() as db:
+            fetched, _ = AssetService(db, MagicMock(), self.cache).get_asset_by_id(self.asset.id)
+
+        # Assert
+        self.assertEqual(fetched.name, "Renamed")
+        other_db.close()
+
+    def test_hits_after_an_unrelated_write_are_counted_once(self):
+        # Arrange
+        self.service.get_asset_by_id(self.asset.id)
+        self.service.get_asset_by_id(self.asset.id)
+        self.service.create_asset(AssetCreate(name="Desk", category="Furniture", value=300.0, quantity=1.0, status="Active"))
+
+        # Act (the first one goes to the DB, the 4 others are real hits)
+        for _ in range(5):
+            self.service.get_asset_by_id(self.asset.id)
+
+        # Assert
+        self.assertEqual((self.cache.hits, self.cache.misses), (5, 2))
+
+    def test_no_data_version_means_no_caching(self):
+        # Arrange
+        self.db.execute(text("DELETE FROM asset_data_version"))
+
+        # Act
+        self.service.get_asset_by_id(self.asset.id)
+        self.service.get_asset_by_id(self.asset.id)
+
+        # Assert
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_broken_cache_falls_back_to_the_db(self):
+        # Arrange
+        broken = MagicMock()
+        broken.get.side_effect = ConnectionError("redis is down")
+        service = AssetService(self.db, MagicMock(), broken)
+
+        # Act
+        fetched, error = service.get_asset_by_id(self.asset.id)
+
+        # Assert
+        self.assertIsNone(error)
+        self.assertEqual(fetched.name, "Laptop")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.src.core.database import get_db_base
+from backend.src.models import asset  # noqa: F401 (registers the assets table)
+from backend.src.services import asset_io
+from backend.src.services.assets_service import AssetService
+
+
+async def _chunks(body: bytes, size: int = 7):
+    # the body cut at arbitrary places like a real upload
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+async def _batches(body: bytes, format: str, batch_size: int = 2):
+    return [batch async for batch in asset_io.iter_import_batches(_chunks(body), format, batch_size)]
+
+
+def _record(name, value=10.0):
+    return {"name": name, "category": "Electronics", "value": value, "quantity": 1, "status": "Active"}
+
+
+class TestAssetImportParsing(unittest.IsolatedAsyncioTestCase):
+    async def test_ndjson_batches_and_line_numbers(self):
+        # Arrange
+        body = "\n".join(json.dumps(_record(f"Asset {i}")) for i in range(5)).encode()
+
+        # Act
+        batches = await _batches(body, "ndjson")
+
+        # Assert
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual([number for batch in batches for number, _, _ in batch], [1, 2, 3, 4, 5])
+
+    async def test_invalid_records_are_reported_with_their_line(self):
+        # Arrange
+        body = "\n".join([json.dumps(_record("Good")), "{oops", json.dumps(_record("Negative", -5))]).encode()
+
+        # Act
+        rows, errors = asset_io.validate_batch((await _batches(body, "ndjson", batch_size=10))[0])
+
+        # Assert
+        self.assertEqual([row["name"] for row in rows], ["Good"])
+        self.assertEqual([error["line"] for error in errors], [2, 3])
+        self.assertIn("value", errors[1]["error"])
+
+    async def test_csv_with_quoted_multiline_field(self):
+        # Arrange
+        body = b'\xef\xbb\xbfname,category,value,quantity,status,purchase_date\n"Desk, ""XL""\nwide",Furniture,5,1,Active,\nChair,Furniture,7,1,Active,2024-01-02\n'
+
+        # Act
+        rows, errors = asset_io.validate_batch((await _batches(body, "csv", batch_size=10))[0])
+
+        # Assert
+        self.assertEqual(errors, [])
+        self.assertEqual([row["name"] for row in rows], ['Desk, "XL"\nwide', "Chair"])
+        self.assertIsNone(rows[0]["purchase_date"])
+
+    def test_failed_insert_fails_the_whole_batch(self):
+        # Act
+        report = asset_io.add_batch_to_report(asset_io.new_import_report(), [{}, {}], 0, [{"line": 3, "error": "bad"}], "disk I/O error")
+
+        # Assert
+        self.assertEqual((report["inserted"], report["failed"]), (0, 3))
+        self.assertEqual(report["batches"][0]["errors"][-1]["line"], None)
+
+
+class TestAssetBulkService(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        get_db_base().metadata.create_all(bind=self.engine)
+
+        self.db = sessionmaker(bind=self.engine)()
+        self.service = AssetService(self.db, MagicMock())
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_bulk_insert_then_export_round_trip(self):
+        # Arrange
+        batch = [(i + 1, _record(f"Asset {i}", i + 1.0), None) for i in range(5)]
+        rows, _ = asset_io.validate_batch(batch)
+
+        # Act
+        inserted, error = self.service.bulk_create_assets(rows)
+        exported = "".join(asset_io.encode_rows(part, "ndjson") for part in self.service.iter_asset_rows(batch_size=2))
+
+        # Assert
+        self.assertIsNone(error)
+        self.assertEqual(inserted, 5)
+        self.assertEqual(sorted(json.loads(line)["name"] for line in exported.splitlines()), [f"Asset {i}" for i in range(5)])
+
+    def test_bulk_insert_rolls_back_on_error(self):
+        # Arrange (the same id twice violates the primary key)
+        rows, _ = asset_io.validate_batch([(1, _record("A"), None), (2, _record("B"), None)])
+        rows[1]["id"] = rows[0]["id"]
+
+        # Act
+        inserted, error = self.service.bulk_create_assets(rows)
+
+        # Assert
+        self.assertIsNone(inserted)
+        self.assertIsNotNone(error)
+        self.assertEqual(self.service.get_all_assets()[0], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
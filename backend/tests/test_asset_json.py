@@ -0,0 +1,109 @@
+import json
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.src.api.v1 import assets
+from backend.src.core.database import get_db_base, get_read_db
+from backend.src.core.settings import SETTINGS
+from backend.src.models.asset_search import ensure_search_index
+from backend.src.models.asset_version import ensure_data_version
+from backend.src.services import asset_json
+from backend.src.services.assets_service import AssetService
+from backend.src.schemas.asset import AssetCreate, AssetResponse
+
+
+class TestAssetJson(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        get_db_base().metadata.create_all(bind=self.engine)
+        ensure_search_index(self.engine)
+        ensure_data_version(self.engine)
+
+        self.db = sessionmaker(bind=self.engine)()
+        self.service = AssetService(self.db, MagicMock())
+
+        for i, (name, category) in enumerate([("MacBook Pro M3", "Electronics"), ("Herman Miller Chair", "Furniture"),
+                                              ("Dell UltraSharp Monitor", "Electronics"), ("Café Table", "Furniture")]):
+            purchase_date = datetime(2024, 1, i + 1, 10, 30, 0, 123456) if i % 2 else None
+            self.service.create_asset(AssetCreate(name=name, category=category, value=100.5 * (i + 1), quantity=1.0,
+                                                  status="Active", purchase_date=purchase_date))
+
+        app = FastAPI()
+        app.include_router(assets.router, prefix="/assets")
+        app.dependency_overrides[get_read_db] = lambda: self.db
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+        self.db.close()
+        self.engine.dispose()
+
+    def _get(self, url, fast):
+        with patch.dict(SETTINGS, {"LEDGER_FAST_JSON": fast}):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_list_body_is_the_response_model_one(self):
+        # Act
+        fast = self._get("/assets/", True)
+        slow = self._get("/assets/", False)
+
+        # Assert
+        self.assertEqual(fast.json(), slow.json())
+        self.assertEqual(fast.headers["content-type"], "application/json")
+        self.assertEqual(fast.headers["etag"], slow.headers["etag"])
+
+    def test_pages_match_and_chain(self):
+        # Act
+        fast = self._get("/assets/page?limit=3", True).json()
+        slow = self._get("/assets/page?limit=3", False).json()
+        last = self._get(f"/assets/page?limit=3&cursor={fast['next_cursor']}", True).json()
+
+        # Assert
+        self.assertEqual(fast, slow)
+        self.assertTrue(fast["has_more"])
+        self.assertEqual([asset["name"] for asset in last["items"]], ["Café Table"])
+        self.assertFalse(last["has_more"])
+
+    def test_openapi_schema_unchanged(self):
+        # Act
+        schema = self.client.get("/openapi.json").json()
+        body = schema["paths"]["/assets/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+
+        # Assert
+        self.assertEqual(body["items"]["$ref"], "#/components/schemas/AssetResponse")
+
+    def test_search_rows_match_the_orm_search(self):
+        for query in ["macbook", "macbok", "ch"]:
+            # Act
+            rows, error = self.service.search_asset(query, as_rows=True)
+            objects, _ = self.service.search_asset(query)
+
+            # Assert
+            self.assertIsNone(error)
+            self.assertEqual(json.loads(asset_json.dumps(asset_json.as_dicts(rows))),
+                             [AssetResponse.model_validate(asset).model_dump(mode="json") for asset in objects])
+
+    def test_stdlib_fallback_gives_the_same_bytes(self):
+        # Arrange
+        rows, _ = self.service.get_all_assets(as_rows=True)
+        content = asset_json.as_dicts(rows)
+
+        # Act
+        fast = asset_json.dumps(content)
+        with patch.object(asset_json, "orjson", None):
+            fallback = asset_json.dumps(content)
+
+        # Assert
+        self.assertEqual(fast, fallback)
+
+
+if __name__ == "__main__":
+    unittest.main()
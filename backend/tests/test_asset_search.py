@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.src.core.database import get_db_base
+from backend.src.models.asset_search import ensure_search_index, rebuild_search_index
+from backend.src.services.assets_service import AssetService
+from backend.src.schemas.asset import AssetCreate, AssetUpdate
+
+
+class TestAssetSearch(unittest.TestCase):
+    def setUp(self):
+        # a real in-memory SQLite, the FTS index + triggers are what's being tested here
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        get_db_base().metadata.create_all(bind=self.engine)
+        self.assertTrue(ensure_search_index(self.engine))
+
+        self.db = sessionmaker(bind=self.engine)()
+        self.service = AssetService(self.db, MagicMock())
+
+        for name, category in [("MacBook Pro M3", "Electronics"), ("Herman Miller Chair", "Furniture"),
+                               ("Dell UltraSharp Monitor", "Electronics")]:
+            self.service.create_asset(AssetCreate(name=name, category=category, value=100.0, quantity=1.0, status="Active"))
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def _names(self, query):
+        result, error = self.service.search_asset(query)
+        self.assertIsNone(error)
+        return [asset.name for asset in result]
+
+    def test_substring_is_case_insensitive(self):
+        self.assertEqual(self._names("macbook"), ["MacBook Pro M3"])
+
+    def test_matches_category(self):
+        self.assertEqual(sorted(self._names("electro")), ["Dell UltraSharp Monitor", "MacBook Pro M3"])
+
+    def test_typo_tolerant(self):
+        self.assertEqual(self._names("macbok"), ["MacBook Pro M3"])
+
+    def test_unrelated_query_finds_nothing(self):
+        self.assertEqual(self._names("zzzzzz"), [])
+
+    def test_short_query_falls_back_to_like(self):
+        self.assertIn("Herman Miller Chair", self._names("ch"))
+
+    def test_index_follows_updates_and_deletes(self):
+        # Arrange
+        chair = self.service.search_asset("herman")[0][0]
+
+        # Act
+        self.service.update_asset(AssetUpdate(name="Aeron Chair"), chair.id)
+        renamed = self._names("aeron")
+        self.service.delete_asset(chair.id)
+
+        # Assert
+        self.assertEqual(renamed, ["Aeron Chair"])
+        self.assertEqual(self._names("herman"), [])
+        self.assertEqual(self._names("aeron"), [])
+
+    def test_rebuild_keeps_results(self):
+        # Act
+        rebuild_search_index(self.engine)
+
+        # Assert
+        self.assertEqual(self._names("monitor"), ["Dell UltraSharp Monitor"])
+
+    def test_query_uses_the_index(self):
+        # Act
+        plan = self.db.execute(text("EXPLAIN QUERY PLAN SELECT rowid FROM assets_fts WHERE assets_fts MATCH 'mac'")).fetchall()
+
+        # Assert
+        self.assertIn("VIRTUAL TABLE INDEX", " ".join(str(row) for row in plan))
+
+
+if __name__ == '__main__':
+    unittest.main()
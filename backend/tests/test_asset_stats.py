@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.src.core.database import get_db_base
+from backend.src.models import asset  # noqa: F401 (registers the assets table)
+from backend.src.models.asset_stats import ensure_value_stats, rebuild_value_stats
+from backend.src.services.assets_service import AssetService
+from backend.src.schemas.asset import AssetCreate, AssetUpdate
+
+
+class TestAssetValueStats(unittest.TestCase):
+    def setUp(self):
+        # a real in-memory SQLite, the stats triggers are what's being tested here
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        get_db_base().metadata.create_all(bind=self.engine)
+        ensure_value_stats(self.engine)
+
+        self.db = sessionmaker(bind=self.engine)()
+        self.service = AssetService(self.db, MagicMock())
+
+        self.ids = {}
+        for name, category, value in [("Laptop", "Electronics", 1000.0), ("Monitor", "Electronics", 300.0),
+                                      ("Chair", "Furniture", 200.0)]:
+            created, _ = self.service.create_asset(AssetCreate(name=name, category=category, value=value, quantity=1.0, status="Active"))
+            self.ids[name] = created.id
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def _stats(self, **scope):
+        stats, error = self.service.get_value_statistics(**scope)
+        self.assertIsNone(error)
+        return stats["count"], stats["total"], stats["min_value"], stats["max_value"]
+
+    def _stats_table(self):
+        return self.db.execute(text("SELECT * FROM asset_value_stats WHERE count > 0 ORDER BY scope, key")).fetchall()
+
+    def test_overall_and_per_scope(self):
+        self.assertEqual(self._stats(), (3, 1500.0, 200.0, 1000.0))
+        self.assertEqual(self._stats(category="Electronics"), (2, 1300.0, 300.0, 1000.0))
+        self.assertEqual(self._stats(status="Active"), (3, 1500.0, 200.0, 1000.0))
+
+    def test_mean(self):
+        # Act
+        mean, error = self.service.get_asset_values_mean()
+
+        # Assert
+        self.assertIsNone(error)
+        self.assertEqual(mean, 500.0)
+
+    def test_update_moves_the_value_between_scopes(self):
+        # Act
+        self.service.update_asset(AssetUpdate(category="Furniture", value=50.0), self.ids["Laptop"])
+
+        # Assert
+        self.assertEqual(self._stats(), (3, 550.0, 50.0, 300.0))
+        self.assertEqual(self._stats(category="Electronics"), (1, 300.0, 300.0, 300.0))
+        self.assertEqual(self._stats(category="Furniture"), (2, 250.0, 50.0, 200.0))
+
+    def test_deleting_the_max_looks_up_the_next_one(self):
+        # Act
+        self.service.delete_asset(self.ids["Laptop"])
+
+        # Assert
+        self.assertEqual(self._stats(), (2, 500.0, 200.0, 300.0))
+
+    def test_empty_scope_is_not_found(self):
+        # Act
+        self.service.delete_asset(self.ids["Chair"])
+        stats, error = self.service.get_value_statistics(category="Furniture")
+
+        # Assert
+        self.assertIsNone(stats)
+        self.assertEqual(error, "Asset not found")
+
+    def test_incremental_matches_a_rebuild(self):
+        # Arrange
+        self.service.update_asset(AssetUpdate(value=10.0), self.ids["Monitor"])
+        self.service.delete_asset(self.ids["Chair"])
+        incremental = self._stats_table()
+
+        # Act
+        rebuild_value_stats(self.engine)
+
+        # Assert
+        self.assertEqual(self._stats_table(), incremental)
+
+    def test_max_uses_the_value_index(self):
+        # Act
+        plan = self.db.execute(text("EXPLAIN QUERY PLAN SELECT * FROM assets ORDER BY value DESC LIMIT 1")).fetchall()
+
+        # Assert
+        self.assertIn("ix_assets_value", " ".join(str(row) for row in plan))
+
+
+if __name__ == '__main__':
+    unittest.main()
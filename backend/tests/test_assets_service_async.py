@@ -0,0 +1,134 @@
+import unittest
+from unittest.mock import MagicMock
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from backend.src.core.database import get_db_base
+from backend.src.services.assets_service_async import AsyncAssetService
+from backend.src.schemas.asset import AssetCreate, AssetUpdate
+from backend.src.models.asset import Asset
+from backend.src.models.asset_stats import create_value_stats
+
+
+class TestAsyncAssetService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # a throwaway in-memory DB per test
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(get_db_base().metadata.create_all)
+            await conn.run_sync(create_value_stats)
+
+        self.session = async_sessionmaker(bind=self.engine, expire_on_commit=False)()
+        self.mock_logger = MagicMock()
+        self.service = AsyncAssetService(self.session, self.mock_logger)
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.engine.dispose()
+
+    def _asset(self, name="Test Asset", value=100.0):
+        return AssetCreate(name=name, category="Electronics", value=value, quantity=1.0, status="Active")
+
+    async def test_create_and_get_asset(self):
+        # Act
+        created, error = await self.service.create_asset(self._asset())
+        fetched, fetch_error = await self.service.get_asset_by_id(created.id)
+
+        # Assert
+        self.assertIsNone(error)
+        self.assertIsNone(fetch_error)
+        self.assertEqual(fetched.name, "Test Asset")
+
+    async def test_get_asset_by_id_not_found(self):
+        # Act
+        asset, error = await self.service.get_asset_by_id("missing-id")
+
+        # Assert
+        self.assertIsNone(asset)
+        self.assertEqual(error, "Asset not found")
+        self.mock_logger.warning.assert_called()
+
+    async def test_update_and_delete_asset(self):
+        # Arrange
+        created, _ = await self.service.create_asset(self._asset())
+
+        # Act
+        updated, update_error = await self.service.update_asset(AssetUpdate(name="Renamed"), created.id)
+        deleted, delete_error = await self.service.delete_asset(created.id)
+
+        # Assert
+        self.assertIsNone(update_error)
+        self.assertEqual(updated.name, "Renamed")
+        self.assertTrue(deleted)
+        self.assertIsNone(delete_error)
+        self.assertEqual((await self.service.get_asset_by_id(created.id))[1], "Asset not found")
+
+    async def test_value_statistics(self):
+        # Arrange
+        await self.service.create_asset(self._asset("Cheap", 10.0))
+        await self.service.create_asset(self._asset("Pricey", 30.0))
+
+        # Act
+        max_asset, _ = await self.service.get_max_value()
+        min_asset, _ = await self.service.get_min_value()
+        mean, _ = await self.service.get_asset_values_mean()
+
+        # Assert
+        self.assertEqual(max_asset.name, "Pricey")
+        self.assertEqual(min_asset.name, "Cheap")
+        self.assertEqual(mean, 20.0)
+
+    async def test_value_statistics_per_category(self):
+        # Arrange
+        await self.service.create_asset(self._asset("Laptop", 10.0))
+        await self.service.create_asset(AssetCreate(name="Desk", category="Furniture", value=50.0, quantity=1.0, status="Active"))
+
+        # Act
+        stats, error = await self.service.get_value_statistics(category="Furniture")
+        missing, missing_error = await self.service.get_value_statistics(category="Nope")
+
+        # Assert
+        self.assertIsNone(error)
+        self.assertEqual((stats["count"], stats["total"], stats["min_value"], stats["max_value"]), (1, 50.0, 50.0, 50.0))
+        self.assertIsNone(missing)
+        self.assertEqual(missing_error, "Asset not found")
+
+    async def test_search_asset(self):
+        # Arrange
+        await self.service.create_asset(self._asset("MacBook Pro"))
+
+        # Act
+        result, error = await self.service.search_asset("macbook")
+
+        # Assert
+        self.assertIsNone(error)
+        self.assertEqual(len(result), 1)
+        self.assertIsInstance(result[0], Asset)
+
+    async def test_cursor_pagination_walks_every_asset_once(self):
+        # Arrange
+        for i in range(7):
+            await self.service.create_asset(self._asset(f"Asset {i}"))
+
+        # Act
+        seen, cursor = [], None
+        while True:
+            (assets, cursor), error = await self.service.get_assets_page(cursor, limit=3)
+            self.assertIsNone(error)
+            seen.extend(asset.name for asset in assets)
+            if cursor is None:
+                break
+
+        # Assert
+        self.assertEqual(seen, [f"Asset {i}" for i in range(7)])
+
+    async def test_cursor_pagination_invalid_cursor(self):
+        # Act
+        page, error = await self.service.get_assets_page("not-a-cursor")
+
+        # Assert
+        self.assertIsNone(page)
+        self.assertEqual(error, "Invalid cursor")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+# the agents import the clients which need the keys to exist (no model is ever called here)
+for var in ("CEREBRAS_API_KEY", "LANGSMITH_API_KEY", "LANGSMITH_PROJECT"):
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("LANGSMITH_TRACING", "false")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.src.agents.rate_limiter import RateLimitExceeded
+from backend.src.api.v1 import sockets
+
+
+class TestChatSocket(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(sockets.router, prefix="/ws")
+        self.client = TestClient(app)
+
+        self.asset_manager = MagicMock()
+        self.logger = MagicMock()
+        self.patches = [
+            patch.object(sockets, "AssetManager", return_value=self.asset_manager),
+            patch.object(sockets, "get_session_logger", return_value=self.logger),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_over_budget_is_an_error_frame_and_the_socket_stays_open(self):
+        # Arrange
+        calls = []
+
+        async def astream_query(question, session_id=None):
+            calls.append(question)
+            if len(calls) == 1:
+                raise RateLimitExceeded(12)
+            yield {"type": "answer", "answer": "Your MacBook is worth 2500", "sources": []}
+
+        self.asset_manager.astream_query = astream_query
+
+        # Act
+        with self.client.websocket_connect("/ws/chat") as socket:
+            socket.send_text("how much is my MacBook worth")
+            rejected = socket.receive_json()
+            socket.send_text("how much is my MacBook worth")
+            answered = socket.receive_json()
+
+        # Assert
+        self.assertEqual((rejected["type"], rejected["status"], rejected["retry_after"]), ("error", 429, 12))
+        self.assertEqual(answered["type"], "answer")
+
+    def test_failure_is_an_error_frame_without_the_exception_text(self):
+        # Arrange
+        async def astream_query(question, session_id=None):
+            raise RuntimeError("disk I/O error at /srv/ledger/assets.db")
+            yield
+
+        self.asset_manager.astream_query = astream_query
+
+        # Act
+        with self.client.websocket_connect("/ws/chat") as socket:
+            socket.send_text("explain my portfolio")
+            frame = socket.receive_json()
+
+        # Assert
+        self.assertEqual(frame["type"], "error")
+        self.assertEqual(frame["status"], 500)
+        self.assertNotIn("disk I/O", frame["message"])
+        self.logger.exception.assert_called_once()
+
+    def test_stream_is_closed_when_the_send_fails(self):
+        # Arrange
+        happened = []
+        self.logger.warning.side_effect = lambda message, *args: happened.append(message)
+
+        async def astream_query(question, session_id=None):
+            try:
+                yield {"type": "token", "content": "Your"}
+                yield {"type": "answer", "answer": "Your MacBook", "sources": []}
+            finally:
+                happened.append("agent run stopped")
+
+        self.asset_manager.astream_query = astream_query
+
+        # Act
+        with patch.object(sockets.WebSocket, "send_json", side_effect=sockets.WebSocketDisconnect()):
+            with self.client.websocket_connect("/ws/chat") as socket:
+                socket.send_text("how much is my MacBook worth")
+
+        # Assert (stopped by the handler itself, not later by the GC)
+        self.assertEqual(happened, ["agent run stopped", "Socket Client disconnected"])
+
+
+if __name__ == '__main__':
+    unittest.main()
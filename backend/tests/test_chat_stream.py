@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+# the agents import the clients which need the keys to exist (no model is ever called here)
+for var in ("CEREBRAS_API_KEY", "LANGSMITH_API_KEY", "LANGSMITH_PROJECT"):
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("LANGSMITH_TRACING", "false")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+
+from backend.src.agents.asset_manager import QueryCancelled, StopWhenCancelled
+from backend.src.agents.rate_limiter import RateLimitExceeded
+from backend.src.api.v1 import chat
+
+
+def _events(body: str):
+    "the (event, data) pairs of an SSE body"
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n") if not line.startswith("retry"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestQueryStream(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(chat.router, prefix="/agent")
+        self.client = TestClient(app)
+
+        self.asset_manager = MagicMock()
+        self.limiter = MagicMock()
+        self.limiter.retry_after.return_value = None
+        self.patches = [
+            patch.object(chat, "AssetManager", return_value=self.asset_manager),
+            patch.object(chat, "get_llm_rate_limiter", return_value=self.limiter),
+            patch.object(chat, "get_session_logger", return_value=MagicMock()),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_streams_the_agent_events(self):
+        # Arrange
+        async def astream_query(question, session_id=None):
+            yield {"type": "tool_start", "tool": "ask_db_manager"}
+            yield {"type": "tool_end", "tool": "ask_db_manager"}
+            yield {"type": "token", "content": "Your MacBook\nis worth 2500"}
+            yield {"type": "answer", "answer": "Your MacBook\nis worth 2500", "sources": []}
+
+        self.asset_manager.astream_query = astream_query
+
+        # Act
+        response = self.client.post("/agent/query/stream", json={"question": "how much is my MacBook worth"})
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = _events(response.text)
+        self.assertEqual([event for event, _ in events], ["tool_start", "tool_end", "token", "answer"])
+        self.assertEqual(events[-1][1]["answer"], "Your MacBook\nis worth 2500")
+
+    def test_over_budget_is_a_429_before_the_stream(self):
+        # Arrange
+        self.limiter.retry_after.return_value = 12.0
+
+        # Act
+        response = self.client.post("/agent/query/stream", json={"question": "explain my portfolio"})
+
+        # Assert
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["retry-after"], "12")
+        self.assertFalse(response.headers["content-type"].startswith("text/event-stream"))
+
+    def test_over_budget_once_streaming_is_an_error_event(self):
+        # Arrange
+        async def astream_query(question, session_id=None):
+            raise RateLimitExceeded(12)
+            yield
+
+        self.asset_manager.astream_query = astream_query
+
+        # Act
+        response = self.client.post("/agent/query/stream", json={"question": "explain my portfolio"})
+
+        # Assert
+        self.assertIn("retry: 12000", response.text)
+        self.assertEqual(_events(response.text), [("error", {"type": "error", "status": 429, "retry_after": 12})])
+
+
+class TestStopWhenCancelled(unittest.TestCase):
+    def test_model_calls_fail_once_stopped(self):
+        # Arrange
+        stop = threading.Event()
+        llm = GenericFakeChatModel(messages=iter(["first", "second"]), disable_streaming=True)
+        config = {"callbacks": [StopWhenCancelled(stop)]}
+
+        # Act
+        first = llm.invoke("hi", config=config)
+        stop.set()
+
+        # Assert
+        self.assertEqual(first.content, "first")
+        with self.assertRaises(QueryCancelled):
+            llm.invoke("hi", config=config)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from backend.src.api.v1 import assets
+from backend.src.core.database import get_db_base, get_read_db
+from backend.src.models import asset  # noqa: F401 (registers the assets table)
+from backend.src.models.asset_version import ensure_data_version
+from backend.src.services.assets_service import AssetService
+from backend.src.schemas.asset import AssetCreate, AssetUpdate
+from backend.src.utils import etag
+
+
+def _request(**headers):
+    return Request({"type": "http", "headers": [(k.replace("_", "-").lower().encode(), v.encode()) for k, v in headers.items()]})
+
+
+class TestDataVersion(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        get_db_base().metadata.create_all(bind=self.engine)
+        ensure_data_version(self.engine)
+
+        self.db = sessionmaker(bind=self.engine)()
+        self.service = AssetService(self.db, MagicMock())
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def _version(self):
+        (version, _), error = self.service.get_data_version()
+        self.assertIsNone(error)
+        return version
+
+    def test_every_write_bumps_the_version(self):
+        # Act
+        versions = [self._version()]
+        created, _ = self.service.create_asset(AssetCreate(name="Laptop", category="Electronics", value=1.0, quantity=1.0, status="Active"))
+        versions.append(self._version())
+        self.service.update_asset(AssetUpdate(name="Renamed"), created.id)
+        versions.append(self._version())
+        self.service.delete_asset(created.id)
+        versions.append(self._version())
+
+        # Assert
+        self.assertEqual(versions, [0, 1, 2, 3])
+
+
+class TestConditionalGet(unittest.TestCase):
+    def setUp(self):
+        self.headers = etag.validators(7, "2025-01-02T10:00:00.500Z", "list", 0, 100)
+
+    def test_same_version_same_etag(self):
+        self.assertEqual(self.headers, etag.validators(7, "2025-01-02T10:00:00.500Z", "list", 0, 100))
+
+    def test_parts_and_version_change_the_etag(self):
+        self.assertNotEqual(self.headers["ETag"], etag.validators(7, "2025-01-02T10:00:00.500Z", "list", 0, 50)["ETag"])
+        self.assertNotEqual(self.headers["ETag"], etag.validators(8, "2025-01-02T10:00:01.000Z", "list", 0, 100)["ETag"])
+
+    def test_if_none_match(self):
+        self.assertTrue(etag.is_not_modified(_request(if_none_match=self.headers["ETag"]), self.headers))
+        self.assertTrue(etag.is_not_modified(_request(if_none_match=f'"other", {self.headers["ETag"][2:]}'), self.headers))
+        self.assertFalse(etag.is_not_modified(_request(if_none_match='W/"0-abc"'), self.headers))
+
+    def test_wildcard(self):
+        self.assertTrue(etag.is_not_modified(_request(if_none_match="*"), self.headers))
+        self.assertFalse(etag.is_not_modified(_request(if_none_match="*"), self.headers, wildcard=False))
+
+    def test_if_modified_since_is_ignored_when_if_none_match_is_sent(self):
+        request = _request(if_none_match='W/"0-abc"', if_modified_since=self.headers["Last-Modified"])
+        self.assertFalse(etag.is_not_modified(request, self.headers))
+
+    def test_if_modified_since(self):
+        self.assertTrue(etag.is_not_modified(_request(if_modified_since="Thu, 02 Jan 2025 10:00:00 GMT"), self.headers))
+        self.assertFalse(etag.is_not_modified(_request(if_modified_since="Thu, 02 Jan 2025 09:59:59 GMT"), self.headers))
+        self.assertFalse(etag.is_not_modified(_request(if_modified_since="yesterday"), self.headers))
+
+
+    def test_no_last_modified_while_the_second_of_the_write_lasts(self):
+        # Arrange (a write at .1 handed out, another one at .7 of the same second would share its Last-Modified)
+        now = datetime.now(timezone.utc)
+        headers = etag.validators(8, now.isoformat().replace("+00:00", "Z"), "list", 0, 100)
+
+        # Act
+        not_modified = etag.is_not_modified(_request(if_modified_since=format_datetime(now + timedelta(seconds=5), usegmt=True)), headers)
+
+        # Assert
+        self.assertNotIn("Last-Modified", headers)
+        self.assertIn("ETag", headers)
+        self.assertFalse(not_modified)
+
+
+class TestAssetRouteConditionalGet(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        get_db_base().metadata.create_all(bind=self.engine)
+        ensure_data_version(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+
+        app = FastAPI()
+        app.include_router(assets.router, prefix="/assets")
+        app.dependency_overrides[get_read_db] = lambda: self.db
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+        self.db.close()
+        self.engine.dispose()
+
+    def test_wildcard_on_a_missing_asset_is_a_404(self):
+        # Act
+        response = self.client.get("/assets/does-not-exist", headers={"If-None-Match": "*"})
+
+        # Assert
+        self.assertEqual(response.status_code, 404)
+
+    def test_etag_of_an_existing_asset_is_a_304(self):
+        # Arrange
+        created, _ = AssetService(self.db, MagicMock()).create_asset(
+            AssetCreate(name="Laptop", category="Electronics", value=1.0, quantity=1.0, status="Active"))
+        first = self.client.get(f"/assets/{created.id}")
+
+        # Act
+        again = self.client.get(f"/assets/{created.id}", headers={"If-None-Match": first.headers["etag"]})
+
+        # Assert
+        self.assertEqual(again.status_code, 304)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import unittest
+
+from langchain.agents import create_agent
+from langchain_core.messages import HumanMessage
+from langchain_core.tools import tool
+
+from backend.src.agents.fake_llm import ScriptedChatModel, load_script
+
+
+calls = []
+
+
+@tool
+def get_asset_value_statistics(metric: str, category: str = None):
+    "value statistics of the assets"
+    calls.append((metric, category))
+    return {"metric": metric, "result": 42}
+
+
+@tool
+def ask_db_manager(query: str):
+    "ask the DB manager"
+    calls.append(query)
+    return "the DB manager says 42"
+
+
+class TestScriptedChatModel(unittest.TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_replays_the_tool_call_then_answers(self):
+        # Arrange
+        agent = create_agent(model=ScriptedChatModel(), tools=[get_asset_value_statistics])
+
+        # Act
+        result = agent.invoke({"messages": [{"role": "user", "content": "What's my most expensive asset?"}]})
+
+        # Assert
+        self.assertEqual(calls, [("max", None)])
+        self.assertEqual(result["messages"][-1].content, 'Here is what I found: {"metric": "max", "result": 42}')
+
+    def test_only_rules_with_bound_tools_match(self):
+        # Arrange
+        agent = create_agent(model=ScriptedChatModel(), tools=[ask_db_manager])
+
+        # Act
+        result = agent.invoke({"messages": [{"role": "user", "content": "What's my most expensive asset?"}]})
+
+        # Assert
+        self.assertEqual(calls, ["What's my most expensive asset?"])
+        self.assertEqual(result["messages"][-1].content, "the DB manager says 42")
+
+    def test_steps_and_regex_groups(self):
+        # Arrange
+        script = [{"match": r"compare (?P<a>\w+) and (?P<b>\w+)", "steps": [
+            {"tool": "get_asset_value_statistics", "args": {"metric": "max", "category": "{a}"}},
+            {"tool": "get_asset_value_statistics", "args": {"metric": "max", "category": "{b}"}},
+        ], "answer": "done"}]
+        agent = create_agent(model=ScriptedChatModel(script=script), tools=[get_asset_value_statistics])
+
+        # Act
+        result = agent.invoke({"messages": [{"role": "user", "content": "compare Electronics and Furniture"}]})
+
+        # Assert
+        self.assertEqual(calls, [("max", "Electronics"), ("max", "Furniture")])
+        self.assertEqual(result["messages"][-1].content, "done")
+
+    def test_usage_metadata(self):
+        message = ScriptedChatModel().invoke([HumanMessage(content="hello")])
+
+        self.assertGreater(message.usage_metadata["output_tokens"], 0)
+
+
+class TestLoadScript(unittest.TestCase):
+    def test_default_and_invalid(self):
+        # Arrange
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"match": "not a list"}, f)
+
+        # Act / Assert
+        try:
+            self.assertTrue(load_script(""))
+            with self.assertRaises(ValueError):
+                load_script(f.name)
+        finally:
+            os.remove(f.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.src.agents import fast_path
+from backend.src.core import database
+from backend.src.core.database import get_db_base
+from backend.src.models import asset  # noqa: F401 (registers the assets table)
+from backend.src.models.asset_stats import ensure_value_stats
+from backend.src.services.assets_service import AssetService
+from backend.src.schemas.asset import AssetCreate
+
+
+class TestFastPathMatching(unittest.TestCase):
+    def test_intents(self):
+        cases = {
+            "What's my most expensive asset?": "max",
+            "which is the cheapest item": "min",
+            "average value of my assets": "mean",
+            "How much are all my assets worth?": "total",
+            "how many assets do I have": "count",
+            "number of electronics": "count",
+        }
+
+        for query, intent in cases.items():
+            self.assertEqual(fast_path.match_intent(query)[0], intent, query)
+
+    def test_no_match(self):
+        self.assertIsNone(fast_path.match_intent("hello there"))
+        self.assertIsNone(fast_path.match_intent("sell my most expensive asset"))
+
+    def test_resolve_scope(self):
+        categories = ["Electronics", "Office Supplies"]
+
+        self.assertEqual(fast_path.resolve_scope(" asset", categories), fast_path.ALL)
+        self.assertEqual(fast_path.resolve_scope(" in my electronic", categories), "Electronics")
+        self.assertEqual(fast_path.resolve_scope(" office supplies assets", categories), "Office Supplies")
+        # not a category we know -> not sure -> agents
+        self.assertIsNone(fast_path.resolve_scope(" macbook", categories))
+
+
+class TestFastPathAnswers(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        get_db_base().metadata.create_all(bind=self.engine)
+        ensure_value_stats(self.engine)
+        self.sessions = sessionmaker(bind=self.engine)
+
+        self.patches = [
+            patch.object(database, "ReadSessionLocal", self.sessions),
+            patch.object(fast_path, "get_session_logger", return_value=MagicMock()),
+            patch.object(fast_path, "FAST_PATH_STATS", fast_path.FastPathStats()),
+            patch.dict(fast_path.SETTINGS, {"LEDGER_FAST_PATH": True}),
+        ]
+        for p in self.patches:
+            p.start()
+
+        self.db = self.sessions()
+        self.service = AssetService(self.db, MagicMock())
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.db.close()
+        self.engine.dispose()
+
+    def _create(self, name, category, value):
+        self.service.create_asset(AssetCreate(name=name, category=category, value=value, quantity=1.0, status="Active"))
+
+    def test_answers(self):
+        # Arrange
+        self._create("MacBook Pro", "Electronics", 2500.0)
+        self._create("Dell Monitor", "Electronics", 300.0)
+        self._create("Desk", "Furniture", 1200.0)
+
+        # Act / Assert
+        self.assertEqual(fast_path.try_fast_path("what's my most expensive asset?"),
+                         "Your most valuable asset is MacBook Pro (Electronics), worth 2,500.00.")
+        self.assertEqual(fast_path.try_fast_path("cheapest furniture"),
+                         "Your least valuable asset in Furniture is Desk (Furniture), worth 1,200.00.")
+        self.assertEqual(fast_path.try_fast_path("total value of my electronics"),
+                         "Your 2 assets in Electronics are worth 2,800.00 in total.")
+        self.assertEqual(fast_path.try_fast_path("How many assets do I have?"), "You have 3 asset records.")
+
+    def test_agent_runs_saved_follow_the_mode(self):
+        # Arrange
+        self._create("MacBook Pro", "Electronics", 2500.0)
+
+        # Act
+        fast_path.try_fast_path("How many assets do I have?", "two_agent")
+        fast_path.try_fast_path("How many assets do I have?", "single")
+        with patch.dict(fast_path.SETTINGS, {"LEDGER_AGENT_MODE": "single"}):
+            fast_path.try_fast_path("How many assets do I have?")
+
+        # Assert
+        self.assertEqual(fast_path.FAST_PATH_STATS.stats()["agent_runs_saved"], 2 + 1 + 1)
+
+    def test_empty_ledger(self):
+        self.assertEqual(fast_path.try_fast_path("average value"), "You don't have any assets recorded yet.")
+
+    def test_falls_back(self):
+        # Arrange
+        self._create("MacBook Pro", "Electronics", 2500.0)
+
+        # Act
+        unknown_category = fast_path.try_fast_path("how many laptops do I have")
+        not_a_stat = fast_path.try_fast_path("how much is my MacBook worth")
+
+        # Assert
+        self.assertIsNone(unknown_category)
+        self.assertIsNone(not_a_stat)
+        self.assertEqual(fast_path.FAST_PATH_STATS.stats()["fell_back"], 2)
+
+    def test_db_error_falls_back(self):
+        # Arrange
+        with patch.object(AssetService, "get_categories", side_effect=RuntimeError("disk I/O error")):
+
+            # Act
+            answer = fast_path.try_fast_path("how many assets do I have")
+
+        # Assert
+        self.assertIsNone(answer)
+
+    def test_switched_off(self):
+        with patch.dict(fast_path.SETTINGS, {"LEDGER_FAST_PATH": False}):
+            self.assertIsNone(fast_path.try_fast_path("how many assets do I have"))
+
+
+if __name__ == '__main__':
+    unittest.main()
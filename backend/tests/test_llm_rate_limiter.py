@@ -0,0 +1,185 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from backend.src.agents.rate_limiter import PriorityRateLimiter, SQLiteTokenBucket, llm_priority
+
+
+class TestSQLiteTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "limiter.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_burst_then_wait(self):
+        # Arrange
+        bucket = SQLiteTokenBucket(self.path, rate_per_second=1.0, capacity=2)
+
+        # Act
+        waits = [bucket.try_acquire() for _ in range(3)]
+
+        # Assert
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertGreater(waits[2], 0.5)
+
+    def test_buckets_on_the_same_file_share_the_budget(self):
+        # Arrange (two workers)
+        first = SQLiteTokenBucket(self.path, rate_per_second=0.1, capacity=1)
+        second = SQLiteTokenBucket(self.path, rate_per_second=0.1, capacity=1)
+
+        # Act
+        taken = first.try_acquire()
+        other = second.try_acquire()
+
+        # Assert
+        self.assertEqual(taken, 0.0)
+        self.assertGreater(other, 0.0)
+
+
+class TestPriorityRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        bucket = SQLiteTokenBucket(os.path.join(self.tmp.name, "limiter.db"), rate_per_second=20.0, capacity=1)
+        self.limiter = PriorityRateLimiter(bucket, max_queue=4, max_queue_wait=10)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_interactive_goes_before_background(self):
+        # Arrange
+        self.limiter.acquire()  # empty the bucket so everybody below has to queue
+        order = []
+
+        def call(priority, name):
+            with llm_priority(priority):
+                self.limiter.acquire()
+            order.append(name)
+
+        threads = [threading.Thread(target=call, args=("background", f"background-{i}")) for i in range(3)]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        time.sleep(0.01)
+        interactive = threading.Thread(target=call, args=("interactive", "interactive"))
+        interactive.start()
+        for thread in threads + [interactive]:
+            thread.join()
+
+        # Assert (the first background call may already have had its token)
+        self.assertIn(order.index("interactive"), (0, 1))
+        self.assertEqual(self.limiter.stats()["acquired_by_priority"], {"interactive": 2, "background": 3})
+
+    def test_async_waiters_queue_without_threads(self):
+        # Arrange
+        self.limiter.acquire()
+        order = []
+
+        async def call(priority, name):
+            with llm_priority(priority):
+                await self.limiter.aacquire()
+            order.append(name)
+
+        async def main():
+            background = [asyncio.create_task(call("background", f"background-{i}")) for i in range(8)]
+            await asyncio.sleep(0.01)
+            threads = threading.active_count()
+            interactive = asyncio.create_task(call("interactive", "interactive"))
+            await asyncio.gather(*background, interactive)
+            return threads
+
+        threads_before = threading.active_count()
+
+        # Act
+        threads_while_waiting = asyncio.run(main())
+
+        # Assert (the head of the queue may be on a thread for its SQLite transaction, nobody else)
+        self.assertLessEqual(threads_while_waiting - threads_before, 1)
+        self.assertIn(order.index("interactive"), (0, 1))
+        self.assertEqual(self.limiter.stats()["queued"], 0)
+
+    def test_a_locked_bucket_file_stalls_neither_the_loop_nor_the_queue(self):
+        # Arrange (another process holding the bucket's write lock for a while)
+        def locked_try_acquire():
+            time.sleep(0.3)
+            return 0.0
+
+        self.limiter.bucket.try_acquire = locked_try_acquire
+        ticks = []
+
+        async def ticker():
+            while len(ticks) < 100:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        async def main():
+            acquiring = asyncio.create_task(self.limiter.aacquire())
+            ticking = asyncio.create_task(ticker())
+            await asyncio.sleep(0.05)
+            # the queue lock is free too while the head waits on SQLite
+            started = time.perf_counter()
+            self.limiter.stats()
+            stats_took = time.perf_counter() - started
+            await acquiring
+            ticking.cancel()
+            return stats_took
+
+        # Act
+        stats_took = asyncio.run(main())
+
+        # Assert
+        self.assertGreater(len(ticks), 10)
+        self.assertLess(stats_took, 0.1)
+
+    def test_cancelled_async_waiter_leaves_the_queue(self):
+        # Arrange
+        self.limiter.acquire()
+
+        async def main():
+            waiter = asyncio.create_task(self.limiter.aacquire())
+            await asyncio.sleep(0.01)
+            queued = self.limiter.stats()["queued"]
+            waiter.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+            return queued
+
+        # Act
+        queued = asyncio.run(main())
+
+        # Assert
+        self.assertEqual(queued, 1)
+        self.assertEqual(self.limiter.stats()["queued"], 0)
+        self.assertTrue(self.limiter.acquire())
+
+    def test_non_blocking(self):
+        self.assertTrue(self.limiter.acquire(blocking=False))
+        self.assertFalse(self.limiter.acquire(blocking=False))
+        self.assertEqual(self.limiter.stats()["queued"], 0)
+
+    def test_retry_after_when_over_budget(self):
+        # Arrange
+        self.assertIsNone(self.limiter.retry_after())
+        self.limiter.max_queue_wait = 0.01
+        self.limiter.acquire()
+
+        # Act
+        retry_after = self.limiter.retry_after()
+
+        # Assert
+        self.assertGreaterEqual(retry_after, 1)
+        self.assertEqual(self.limiter.stats()["rejected"], 1)
+
+    def test_unknown_priority(self):
+        with self.assertRaises(ValueError):
+            with llm_priority("vip"):
+                pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import json
+import logging
+import logging.handlers
+import os
+import tempfile
+import unittest
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.src.utils import logger as app_logger
+from backend.src.utils.logger import RequestIdMiddleware, create_queue_logger, payload
+
+
+class TestPayload(unittest.TestCase):
+    def test_big_list_is_truncated(self):
+        # Arrange
+        rows = [{"name": f"Asset {i}", "value": i} for i in range(100_000)]
+
+        # Act
+        text = str(payload(rows))
+
+        # Assert
+        self.assertTrue(text.startswith("100000 items [{'name': 'Asset 0'"))
+        self.assertLessEqual(len(text), 303)
+
+    def test_long_string(self):
+        text = str(payload("x" * 10_000, max_chars=10))
+
+        self.assertEqual(text, "'xxxxxxxxxx'... (10000 chars)")
+
+    def test_not_rendered_when_the_level_is_off(self):
+        # Arrange
+        class Exploding:
+            def __repr__(self):
+                raise AssertionError("rendered")
+
+        logger = logging.getLogger(f"test-{uuid.uuid4()}")
+        logger.setLevel(logging.WARNING)
+
+        # Act / Assert (no AssertionError)
+        logger.info("got %s", payload(Exploding()))
+
+
+class TestQueueLogger(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ledger.log")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _lines(self):
+        with open(self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_json_records_with_the_request_id(self):
+        # Arrange
+        logger, listener = create_queue_logger(f"test-{uuid.uuid4()}", logging.FileHandler(self.path))
+        token = app_logger._request_id.set("req-42")
+
+        # Act
+        try:
+            logger.info("tool about to return %s", payload([1, 2, 3, 4]))
+        finally:
+            app_logger._request_id.reset(token)
+        listener.stop()
+
+        # Assert
+        record = self._lines()[0]
+        self.assertEqual(record["request_id"], "req-42")
+        self.assertEqual(record["message"], "tool about to return 4 items [1, 2, 3, ...]")
+        self.assertEqual(record["level"], "INFO")
+
+    def test_exception_keeps_its_traceback(self):
+        # Arrange
+        handler = logging.FileHandler(self.path)
+        logger, listener = create_queue_logger(f"test-{uuid.uuid4()}", handler)
+
+        # Act
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("the streamed agent run failed")
+        listener.stop()
+        handler.close()
+
+        # Assert
+        record = self._lines()[0]
+        self.assertEqual(record["message"], "the streamed agent run failed")
+        self.assertIn("Traceback", record["exc"])
+        self.assertIn("ZeroDivisionError", record["exc"])
+
+    def test_text_format_keeps_the_traceback_too(self):
+        # Arrange
+        handler = logging.FileHandler(self.path)
+        logger, listener = create_queue_logger(f"test-{uuid.uuid4()}", handler, fmt="text")
+
+        # Act
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("the streamed agent run failed")
+        listener.stop()
+        handler.close()
+
+        # Assert
+        with open(self.path, encoding="utf-8") as f:
+            text = f.read()
+        self.assertEqual(text.count("ZeroDivisionError"), 1)
+        self.assertIn("the streamed agent run failed\nTraceback", text)
+
+    def test_rotation_keeps_the_backups(self):
+        # Arrange
+        handler = logging.handlers.RotatingFileHandler(self.path, maxBytes=500, backupCount=2)
+        logger, listener = create_queue_logger(f"test-{uuid.uuid4()}", handler)
+
+        # Act
+        for i in range(100):
+            logger.info("line %d", i)
+        listener.stop()
+        handler.close()
+
+        # Assert
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["ledger.log", "ledger.log.1", "ledger.log.2"])
+
+
+class TestRequestIdMiddleware(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.add_middleware(RequestIdMiddleware)
+
+        @app.get("/whoami")
+        def whoami():
+            return app_logger.get_request_id()
+
+        self.client = TestClient(app)
+
+    def test_echoes_the_client_id(self):
+        response = self.client.get("/whoami", headers={"X-Request-ID": "abc-123"})
+
+        self.assertEqual(response.json(), "abc-123")
+        self.assertEqual(response.headers["x-request-id"], "abc-123")
+
+    def test_generates_one_for_missing_or_invalid_ids(self):
+        response = self.client.get("/whoami", headers={"X-Request-ID": "bad id\nwith newline"})
+
+        self.assertEqual(len(response.json()), 32)
+        self.assertEqual(response.headers["x-request-id"], response.json())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from backend.src.utils.llm_metrics import LLMMetricsHandler
+from backend.src.utils.metrics import (
+    Counter, Histogram, LLM_TOKENS, LLM_TOOL_CALLS, MetricsMiddleware, HTTP_REQUESTS, SQL_LATENCY, instrument_engine,
+)
+
+
+def _value(metric, **labels):
+    return metric._values.get(metric._key(labels))
+
+
+class TestMetricTypes(unittest.TestCase):
+    def test_counter_render(self):
+        # Arrange
+        counter = Counter("test_total", "a test counter", ("route",))
+
+        # Act
+        counter.inc(route="/assets/")
+        counter.inc(2, route="/assets/")
+
+        # Assert
+        self.assertEqual(counter.render()[-1], 'test_total{route="/assets/"} 3')
+
+    def test_histogram_buckets_are_cumulative(self):
+        # Arrange
+        histogram = Histogram("test_seconds", "a test histogram", buckets=(0.1, 1.0))
+
+        # Act
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value)
+
+        # Assert
+        self.assertEqual(histogram.render()[2:], [
+            'test_seconds_bucket{le="0.1"} 1',
+            'test_seconds_bucket{le="1.0"} 2',
+            'test_seconds_bucket{le="+Inf"} 3',
+            'test_seconds_sum 5.55',
+            'test_seconds_count 3',
+        ])
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_routes_are_labelled_by_template(self):
+        # Arrange
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/things/{thing_id}")
+        def thing(thing_id: str):
+            return thing_id
+
+        client = TestClient(app)
+        before = _value(HTTP_REQUESTS, method="GET", route="/things/{thing_id}", status="200") or 0
+
+        # Act
+        client.get("/things/1")
+        client.get("/things/2")
+
+        # Assert
+        self.assertEqual(_value(HTTP_REQUESTS, method="GET", route="/things/{thing_id}", status="200"), before + 2)
+
+    def test_unknown_paths_and_wrong_methods(self):
+        # Arrange
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        def item(item_id: str):
+            return item_id
+
+        client = TestClient(app)
+        before_404 = _value(HTTP_REQUESTS, method="GET", route="unmatched", status="404") or 0
+        before_405 = _value(HTTP_REQUESTS, method="DELETE", route="/items/{item_id}", status="405") or 0
+
+        # Act
+        client.get("/nowhere/1")
+        client.delete("/items/1")
+
+        # Assert
+        self.assertEqual(_value(HTTP_REQUESTS, method="GET", route="unmatched", status="404"), before_404 + 1)
+        self.assertEqual(_value(HTTP_REQUESTS, method="DELETE", route="/items/{item_id}", status="405"), before_405 + 1)
+
+    def test_sql_statements_are_timed(self):
+        # Arrange
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        instrument_engine(engine, "test")
+
+        # Act
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        # Assert
+        counts, _ = _value(SQL_LATENCY, engine="test", operation="SELECT")
+        self.assertEqual(sum(counts), 1)
+
+    def test_llm_tokens_and_tool_calls(self):
+        # Arrange
+        message = AIMessage(content="", tool_calls=[{"name": "ask_db_manager", "args": {}, "id": "1"}],
+                            usage_metadata={"input_tokens": 100, "output_tokens": 7, "total_tokens": 107})
+        llm = GenericFakeChatModel(messages=iter([message]), disable_streaming=True, callbacks=[LLMMetricsHandler("test_agent")])
+
+        # Act
+        llm.invoke("what's my most expensive asset")
+
+        # Assert
+        self.assertEqual(_value(LLM_TOKENS, agent="test_agent", type="input"), 100)
+        self.assertEqual(_value(LLM_TOKENS, agent="test_agent", type="output"), 7)
+        self.assertEqual(_value(LLM_TOOL_CALLS, agent="test_agent", tool="ask_db_manager"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from typing import TypedDict, Annotated
+import operator
+
+from langgraph.graph import StateGraph, START, END
+
+from backend.src.agents.memory import SessionCheckpointer
+
+
+class State(TypedDict):
+    turns: Annotated[list, operator.add]
+
+
+def _graph(checkpointer):
+    # a one node graph is enough to exercise the checkpointer like the agents do
+    builder = StateGraph(State)
+    builder.add_node("echo", lambda state: {"turns": ["reply"]})
+    builder.add_edge(START, "echo")
+    builder.add_edge("echo", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+class TestSessionCheckpointer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "checkpoints.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _checkpointer(self, **overrides):
+        options = dict(path=self.path, ttl_seconds=3600, max_sessions=100, cache_size=10)
+        options.update(overrides)
+        return SessionCheckpointer(**options)
+
+    def _run(self, graph, session_id, text):
+        config = {"configurable": {"thread_id": session_id}}
+        return graph.invoke({"turns": [text]}, config=config)["turns"]
+
+    def test_conversation_is_kept_per_session(self):
+        # Arrange
+        graph = _graph(self._checkpointer())
+
+        # Act
+        self._run(graph, "a", "hi")
+        turns_a = self._run(graph, "a", "again")
+        turns_b = self._run(graph, "b", "hi")
+
+        # Assert
+        self.assertEqual(turns_a, ["hi", "reply", "again", "reply"])
+        self.assertEqual(turns_b, ["hi", "reply"])
+
+    def test_conversation_survives_a_restart(self):
+        # Arrange
+        self._run(_graph(self._checkpointer()), "a", "hi")
+
+        # Act
+        turns = self._run(_graph(self._checkpointer()), "a", "again")
+
+        # Assert
+        self.assertEqual(turns, ["hi", "reply", "again", "reply"])
+
+    def test_only_latest_checkpoint_is_stored(self):
+        # Arrange
+        graph = _graph(self._checkpointer())
+
+        # Act
+        for text in ("one", "two", "three"):
+            self._run(graph, "a", text)
+
+        # Assert
+        count = sqlite3.connect(self.path).execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_evict_drops_oldest_sessions_over_the_limit(self):
+        # Arrange
+        checkpointer = self._checkpointer(max_sessions=2)
+        graph = _graph(checkpointer)
+        for session_id in ("a", "b", "c"):
+            self._run(graph, session_id, "hi")
+
+        # Act
+        evicted = checkpointer.evict()
+
+        # Assert
+        self.assertEqual(evicted, 1)
+        self.assertIsNone(checkpointer.get_tuple({"configurable": {"thread_id": "a"}}))
+        self.assertIsNotNone(checkpointer.get_tuple({"configurable": {"thread_id": "c"}}))
+
+    def test_evict_drops_expired_sessions(self):
+        # Arrange
+        checkpointer = self._checkpointer(ttl_seconds=-1)
+        self._run(_graph(checkpointer), "a", "hi")
+
+        # Act
+        evicted = checkpointer.evict()
+
+        # Assert
+        self.assertEqual(evicted, 1)
+
+    def test_cached_tuple_is_not_shared_with_the_caller(self):
+        # Arrange
+        checkpointer = self._checkpointer()
+        self._run(_graph(checkpointer), "a", "hi")
+        config = {"configurable": {"thread_id": "a"}}
+
+        # Act (what a run does to the checkpoint it loaded, before anything is saved)
+        loaded = checkpointer.get_tuple(config)
+        loaded.checkpoint["channel_values"]["turns"].append("unsaved")
+        loaded.checkpoint["channel_values"]["extra"] = "unsaved"
+        loaded.checkpoint["versions_seen"].clear()
+        loaded.metadata["step"] = 99
+        again = checkpointer.get_tuple(config)
+
+        # Assert (the second read is served by the LRU, same checkpoint id)
+        self.assertEqual(again.checkpoint["id"], loaded.checkpoint["id"])
+        self.assertEqual(again.checkpoint["channel_values"]["turns"], ["hi", "reply"])
+        self.assertNotIn("extra", again.checkpoint["channel_values"])
+        self.assertTrue(again.checkpoint["versions_seen"])
+        self.assertNotEqual(again.metadata["step"], 99)
+
+
+if __name__ == '__main__':
+    unittest.main()
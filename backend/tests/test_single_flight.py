@@ -0,0 +1,81 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.src.agents.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.flights = SingleFlight()
+        self.release = threading.Event()
+        self.runs = 0
+
+    def _slow_answer(self):
+        self.runs += 1
+        self.release.wait(timeout=5)
+        return "Your most expensive asset is the MacBook"
+
+    def _wait_for_waiters(self, count):
+        # everybody but the leader has joined the flight
+        while self.flights.stats()["coalesced"] < count:
+            threading.Event().wait(0.001)
+
+    def test_concurrent_identical_calls_share_one_run(self):
+        # Arrange
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(self.flights.do, "key", self._slow_answer) for _ in range(8)]
+
+            # Act
+            self._wait_for_waiters(7)
+            self.release.set()
+            answers = [future.result() for future in futures]
+
+        # Assert
+        self.assertEqual(self.runs, 1)
+        self.assertEqual(set(answers), {"Your most expensive asset is the MacBook"})
+        self.assertEqual(self.flights.stats(), {"in_flight": 0, "executions": 1, "coalesced": 7})
+
+    def test_different_keys_run_separately(self):
+        # Arrange
+        self.release.set()
+
+        # Act
+        self.flights.do("a", self._slow_answer)
+        self.flights.do("b", self._slow_answer)
+
+        # Assert
+        self.assertEqual(self.runs, 2)
+
+    def test_finished_flight_is_not_reused(self):
+        # Arrange
+        self.release.set()
+        self.flights.do("key", self._slow_answer)
+
+        # Act
+        self.flights.do("key", self._slow_answer)
+
+        # Assert
+        self.assertEqual(self.runs, 2)
+
+    def test_waiters_get_the_leaders_exception(self):
+        # Arrange
+        def failing():
+            self.release.wait(timeout=5)
+            raise RuntimeError("model down")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(self.flights.do, "key", failing) for _ in range(3)]
+
+            # Act
+            self._wait_for_waiters(2)
+            self.release.set()
+
+            # Assert
+            for future in futures:
+                with self.assertRaises(RuntimeError):
+                    future.result()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import threading
+import unittest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from backend.src.core.database import get_db_base, get_engine
+from backend.src.models import asset  # noqa: F401 (registers the assets table)
+
+
+class TestWalProfile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "assets.db")
+
+        self.writer = get_engine(path=path, profile="wal")
+        get_db_base().metadata.create_all(bind=self.writer)
+        self.reader = get_engine(read_only=True, path=path, profile="wal")
+
+    def tearDown(self):
+        self.writer.dispose()
+        self.reader.dispose()
+        self.tmp.cleanup()
+
+    def test_pragmas(self):
+        with self.writer.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            # 1 -> NORMAL
+            self.assertEqual(conn.execute(text("PRAGMA synchronous")).scalar(), 1)
+            self.assertGreater(conn.execute(text("PRAGMA busy_timeout")).scalar(), 0)
+
+    def test_readers_cannot_write(self):
+        with self.reader.connect() as conn:
+            with self.assertRaises(OperationalError):
+                conn.execute(text("INSERT INTO assets (id, name) VALUES ('x', 'x')"))
+
+    def test_concurrent_writes_are_serialized(self):
+        # Arrange
+        errors = []
+
+        def write(n):
+            try:
+                for i in range(20):
+                    with self.writer.begin() as conn:
+                        conn.execute(text("INSERT INTO assets (id, name) VALUES (:id, 'x')"), {"id": f"{n}-{i}"})
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(errors, [])
+        with self.reader.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT COUNT(*) FROM assets")).scalar(), 80)
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            get_engine(profile="turbo")
+
+
+if __name__ == '__main__':
+    unittest.main()
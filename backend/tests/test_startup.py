@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+
+def _import_app(**env):
+    "(route paths, agent packages imported) of backend.main imported in a fresh process"
+
+    code = (
+        "import json, sys\n"
+        "from backend.main import app\n"
+        "stack = {'langchain', 'langchain_core', 'langgraph', 'langsmith', 'langchain_cerebras'}\n"
+        "print(json.dumps([[r.path for r in app.routes], sorted({m.split('.')[0] for m in sys.modules} & stack)]))\n"
+    )
+    # no LLM keys at all, importing the app must not need them
+    clean_env = {k: v for k, v in os.environ.items() if k not in ("CEREBRAS_API_KEY", "LANGSMITH_API_KEY")}
+    result = subprocess.run([sys.executable, "-c", code], env={**clean_env, **env}, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestLazyStartup(unittest.TestCase):
+    def test_crud_only_worker_never_imports_the_agent_stack(self):
+        # Act
+        routes, agent_stack = _import_app(LEDGER_AGENTS="false")
+
+        # Assert
+        self.assertIn("/assets/", routes)
+        self.assertNotIn("/agent/query", routes)
+        self.assertEqual(agent_stack, [])
+
+    def test_agent_routes_without_the_llm_keys(self):
+        routes, _ = _import_app(LEDGER_AGENTS="true")
+
+        self.assertIn("/agent/query", routes)
+        self.assertIn("/ws/chat", routes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.src.core.database import get_db_base
+from backend.src.models import asset  # noqa: F401 (registers the assets table)
+from backend.src.models.asset_version import ensure_data_version
+from backend.src.services.assets_service import AssetService
+from backend.src.services.cache import LRUCache
+from backend.src.schemas.asset import AssetCreate
+from backend.src.utils.tools import db_manager_tools
+
+
+class TestToolCache(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        get_db_base().metadata.create_all(bind=self.engine)
+        ensure_data_version(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+
+        self.cache = LRUCache()
+        self.patches = [
+            patch.object(db_manager_tools, "ToolSessionLocal", sessionmaker(bind=self.engine)),
+            patch.object(db_manager_tools, "get_tool_cache", return_value=self.cache),
+            patch.object(db_manager_tools, "get_session_logger", return_value=MagicMock()),
+        ]
+        for p in self.patches:
+            p.start()
+
+        self.service = AssetService(self.db, MagicMock())
+        self._create("MacBook Pro", 2500.0)
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.db.close()
+        self.engine.dispose()
+
+    def _create(self, name, value):
+        self.service.create_asset(AssetCreate(name=name, category="Electronics", value=value, quantity=1.0, status="Active"))
+
+    def test_repeated_call_skips_the_db(self):
+        # Arrange
+        with patch.object(AssetService, "search_asset", wraps=self.service.search_asset) as search:
+
+            # Act
+            first = db_manager_tools.search_assets_by_name_or_category.invoke({"query": "macbook"})
+            second = db_manager_tools.search_assets_by_name_or_category.invoke({"query": "macbook"})
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertEqual(json.loads(first)[0]["name"], "MacBook Pro")
+        self.assertEqual(search.call_count, 1)
+
+    def test_arguments_are_part_of_the_key(self):
+        # Act
+        everything = db_manager_tools.get_asset_value_statistics.invoke({"metric": "count"})
+        other = db_manager_tools.get_asset_value_statistics.invoke({"metric": "max"})
+
+        # Assert
+        self.assertNotEqual(everything, other)
+        self.assertEqual(self.cache.stats()["size"], 2)
+
+    def test_a_write_invalidates(self):
+        # Arrange
+        db_manager_tools.get_all_assets.invoke({})
+
+        # Act
+        self._create("Dell Monitor", 300.0)
+        result = json.loads(db_manager_tools.get_all_assets.invoke({}))
+
+        # Assert
+        self.assertEqual(len(result), 2)
+
+    def test_db_errors_are_not_cached(self):
+        # Arrange
+        with patch.object(AssetService, "get_all_assets", return_value=(None, "disk I/O error")):
+
+            # Act
+            result = db_manager_tools.get_all_assets.invoke({})
+
+        # Assert
+        self.assertEqual(result, "No assets found in the DB")
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
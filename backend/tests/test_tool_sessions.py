@@ -0,0 +1,109 @@
+import contextvars
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.core.database import get_db_base, get_engine
+from backend.src.core.settings import SETTINGS
+from backend.src.models import asset  # noqa: F401 (registers the assets table)
+from backend.src.models.asset_version import ensure_data_version
+from backend.src.schemas.asset import AssetCreate, AssetUpdate
+from backend.src.services.assets_service import AssetService
+from backend.src.utils.tools import db_manager_tools
+
+
+class TestToolSessions(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "assets.db")
+
+        # the wal profile like in prod: a writer connection for the "REST API" and a read only pool for the tools
+        self.writer = get_engine(path=path, profile="wal")
+        self.reader = get_engine(read_only=True, path=path, profile="wal")
+        get_db_base().metadata.create_all(bind=self.writer)
+        ensure_data_version(self.writer)
+
+        self.sessions = []
+        factory = sessionmaker(bind=self.reader)
+
+        def tracked_session():
+            session = factory()
+            self.sessions.append(session)
+            return session
+
+        self.patches = [
+            patch.object(db_manager_tools, "ToolSessionLocal", tracked_session),
+            patch.object(db_manager_tools, "get_tool_cache", return_value=None),
+            patch.object(db_manager_tools, "get_session_logger", return_value=MagicMock()),
+            patch.dict(SETTINGS, {"LEDGER_TOOL_SNAPSHOT": True, "LEDGER_SQLITE_PROFILE": "wal"}),
+        ]
+        for p in self.patches:
+            p.start()
+
+        self.api = sessionmaker(bind=self.writer)()
+        self.service = AssetService(self.api, MagicMock())
+        self.asset, _ = self.service.create_asset(AssetCreate(name="MacBook Pro", category="Electronics", value=2500.0, quantity=1.0, status="Active"))
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.api.close()
+        self.writer.dispose()
+        self.reader.dispose()
+        self.tmp.cleanup()
+
+    def _max_value(self):
+        return json.loads(db_manager_tools.get_asset_value_statistics.invoke({"metric": "max"}))["result"]["value"]
+
+    def test_every_call_gets_its_own_short_lived_session(self):
+        # Act
+        for _ in range(3):
+            db_manager_tools.get_all_assets.invoke({})
+
+        # Assert
+        self.assertEqual(len(self.sessions), 3)
+        self.assertTrue(all(len(session.identity_map) == 0 for session in self.sessions))
+
+    def test_writes_from_the_api_are_seen_right_away(self):
+        # Arrange
+        self.assertEqual(self._max_value(), 2500.0)
+
+        # Act
+        self.service.update_asset(AssetUpdate(value=3100.0), self.asset.id)
+
+        # Assert
+        self.assertEqual(self._max_value(), 3100.0)
+
+    def test_one_snapshot_for_the_whole_run(self):
+        # Act
+        with db_manager_tools.tool_snapshot():
+            before = self._max_value()
+            self.service.update_asset(AssetUpdate(value=3100.0), self.asset.id)
+            # a tool thread of the same run (langchain copies the context into them)
+            seen = []
+            context = contextvars.copy_context()
+            thread = threading.Thread(target=lambda: seen.append(context.run(self._max_value)))
+            thread.start()
+            thread.join()
+        after = self._max_value()
+
+        # Assert
+        self.assertEqual((before, seen[0], after), (2500.0, 2500.0, 3100.0))
+        self.assertEqual(len(self.sessions), 2)
+
+    def test_no_snapshot_with_the_rollback_journal(self):
+        with patch.dict(SETTINGS, {"LEDGER_SQLITE_PROFILE": "default"}):
+            with db_manager_tools.tool_snapshot():
+                self.service.update_asset(AssetUpdate(value=3100.0), self.asset.id)
+                value = self._max_value()
+
+        self.assertEqual(value, 3100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
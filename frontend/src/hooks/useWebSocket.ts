@@ -4,17 +4,28 @@ import { ChatMessage } from "@/types/asset";
 const API_BASE = import.meta.env.VITE_API_BASE_URL || "http://127.0.0.1:8000";
 const WS_URL = `${API_BASE.replace(/^http/, "ws")}/ws/chat`;
 
+// one conversation per browser tab, it survives reconnects (and backend restarts)
+function getSessionId(): string {
+  let sessionId = sessionStorage.getItem("ledger-session-id");
+  if (!sessionId) {
+    sessionId = crypto.randomUUID();
+    sessionStorage.setItem("ledger-session-id", sessionId);
+  }
+  return sessionId;
+}
+
 export function useWebSocket() {
   const [messages, setMessages] = useState<ChatMessage[]>([]);
   const [isConnected, setIsConnected] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
   const wsRef = useRef<WebSocket | null>(null);
   const streamingIntervalRef = useRef<ReturnType<typeof setInterval> | null>(null);
+  const streamingMessageIdRef = useRef<string | null>(null);
 
   const connect = useCallback(() => {
     if (wsRef.current?.readyState === WebSocket.OPEN) return;
 
-    const ws = new WebSocket(WS_URL);
+    const ws = new WebSocket(`${WS_URL}?session_id=${getSessionId()}`);
 
     ws.onopen = () => {
       setIsConnected(true);
@@ -24,10 +35,12 @@ export function useWebSocket() {
     ws.onmessage = (event) => {
       let content = "";
       let sources: string[] = [];
+      let type = "answer";
 
       try {
         const data = JSON.parse(event.data);
-        content = data.answer || data.message || "No response";
+        type = data.type || "answer";
+        content = data.answer || data.content || data.message || "";
         // Clean up any escaped newlines that might have been sent as literal characters
         content = content.replace(/\\n/g, '\n');
         sources = data.sources || [];
@@ -35,7 +48,47 @@ export function useWebSocket() {
         content = event.data;
       }
 
+      // partial tokens are appended to the message being streamed right now
+      if (type === "token") {
+        setIsLoading(false);
+        if (!streamingMessageIdRef.current) {
+          const messageId = crypto.randomUUID();
+          streamingMessageIdRef.current = messageId;
+          setMessages((prev) => [
+            ...prev,
+            { id: messageId, role: "assistant", content, sources: [], timestamp: new Date() },
+          ]);
+        } else {
+          const messageId = streamingMessageIdRef.current;
+          setMessages((prev) =>
+            prev.map((msg) => (msg.id === messageId ? { ...msg, content: msg.content + content } : msg))
+          );
+        }
+        return;
+      }
+
+      // the agent is calling a tool, whatever it said before that isn't the answer
+      if (type === "tool_start" || type === "tool_end") {
+        const messageId = streamingMessageIdRef.current;
+        if (messageId) {
+          setMessages((prev) => prev.map((msg) => (msg.id === messageId ? { ...msg, content: "" } : msg)));
+        }
+        return;
+      }
+
+      content = content || "No response";
       setIsLoading(false);
+
+      // the final answer replaces whatever got streamed so far
+      if (streamingMessageIdRef.current) {
+        const messageId = streamingMessageIdRef.current;
+        streamingMessageIdRef.current = null;
+        setMessages((prev) =>
+          prev.map((msg) => (msg.id === messageId ? { ...msg, content, sources } : msg))
+        );
+        return;
+      }
+
       const messageId = crypto.randomUUID();
 
       setMessages((prev) => [